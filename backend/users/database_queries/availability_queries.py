@@ -0,0 +1,9 @@
+# backend/users/database_queries/availability_queries.py
+
+from users.database_queries.connection import fn_scalar
+
+
+def rebuild_availability(from_date) -> int:
+    """Recomputes slot_availability_daily from the slot tables; returns the
+    number of doctor/lab days now summarised."""
+    return fn_scalar("s_rebuild_availability", [from_date])
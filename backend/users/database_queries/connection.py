@@ -2,16 +2,20 @@
 import logging
 from django.db import connection
 
+from users.database_queries import request_memo
+
 logger = logging.getLogger(__name__)
 
 
 def execute(sql: str, params=None):
+    request_memo.note_statement(sql)
     with connection.cursor() as cursor:
         cursor.execute(sql, params or [])
         return cursor.rowcount
 
 
 def fetchone(sql: str, params=None):
+    request_memo.note_statement(sql)
     try:
         with connection.cursor() as cursor:
             cursor.execute(sql, params or [])
@@ -26,6 +30,7 @@ def fetchone(sql: str, params=None):
 
 
 def fetchall(sql: str, params=None):
+    request_memo.note_statement(sql)
     try:
         with connection.cursor() as cursor:
             cursor.execute(sql, params or [])
@@ -38,6 +43,7 @@ def fetchall(sql: str, params=None):
 
 
 def fetchscalar(sql: str, params=None):
+    request_memo.note_statement(sql)
     with connection.cursor() as cursor:
         cursor.execute(sql, params or [])
         row = cursor.fetchone()
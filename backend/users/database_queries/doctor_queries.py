@@ -8,13 +8,21 @@ from users.database_queries.connection import (
     fetchall,
     execute,
 )
+from users.database_queries.request_memo import memoize
 
 
+@memoize
 def get_doctor_by_user_id(user_id: str) -> dict | None:
     row = fn_fetchone("d_get_full_doctor_profile", [str(user_id)])
     return dict(row) if row else None
 
 
+@memoize
+def get_doctor_profile_bundle(user_id: str) -> dict | None:
+    row = fn_fetchone("d_get_doctor_profile_bundle", [str(user_id)])
+    return dict(row) if row else None
+
+
 def get_full_doctor_profile(doctor_user_id: str) -> dict:
     result = get_doctor_by_user_id(doctor_user_id)
     if not result:
@@ -38,6 +46,11 @@ def get_verified_active_doctors() -> list:
     ]
 
 
+def get_doctor_directory(today) -> list:
+    """Verified, active doctors joined with their availability summary."""
+    return fn_fetchall("d_list_doctor_directory", [today])
+
+
 def update_doctor(user_id: str, **fields) -> dict:
     if not fields:
         return get_doctor_by_user_id(user_id)
@@ -84,6 +97,7 @@ def get_pending_doctors_count() -> int:
     )
 
 
+@memoize
 def get_doctor_qualifications(doctor_id: str) -> list:
     return fn_fetchall("d_get_qualifications", [str(doctor_id)])
 
@@ -104,6 +118,7 @@ def insert_doctor_qualification(
     )
 
 
+@memoize
 def get_doctor_specializations(doctor_id: str) -> list:
     return fn_fetchall("d_get_specializations", [str(doctor_id)])
 
@@ -124,6 +139,7 @@ def insert_doctor_specialization(
     )
 
 
+@memoize
 def get_schedule_by_doctor(doctor_id: str) -> dict | None:
     return fn_fetchone("d_get_full_schedule", [str(doctor_id)])
 
@@ -143,6 +159,7 @@ def upsert_schedule(
     )
 
 
+@memoize
 def get_working_days(schedule_id: int) -> list:
     return fetchall(
         "SELECT * FROM doctor_working_days WHERE schedule_id=%s ORDER BY day_of_week",
@@ -182,7 +199,9 @@ def insert_working_day(
     )
 
 
-def get_or_create_slot(schedule_id: int, slot_date, start_time, end_time) -> tuple:
+def get_or_create_slot(
+    schedule_id: int, slot_date, start_time, end_time, blocked_exception_id=None
+) -> tuple:
     existing = fetchone(
         "SELECT * FROM appointment_slots WHERE schedule_id=%s AND slot_date=%s AND start_time=%s",
         [schedule_id, slot_date, start_time],
@@ -192,11 +211,19 @@ def get_or_create_slot(schedule_id: int, slot_date, start_time, end_time) -> tup
     row = fetchone(
         """
         INSERT INTO appointment_slots (schedule_id, slot_date, start_time, end_time,
-                                       is_booked, is_blocked, created_at)
-        VALUES (%s, %s, %s, %s, FALSE, FALSE, NOW())
+                                       is_booked, is_blocked, blocked_exception_id,
+                                       created_at)
+        VALUES (%s, %s, %s, %s, FALSE, %s, %s, NOW())
         RETURNING slot_id
         """,
-        [schedule_id, slot_date, start_time, end_time],
+        [
+            schedule_id,
+            slot_date,
+            start_time,
+            end_time,
+            blocked_exception_id is not None,
+            blocked_exception_id,
+        ],
     )
     slot = fetchone(
         "SELECT * FROM appointment_slots WHERE slot_id=%s", [row["slot_id"]]
@@ -204,6 +231,45 @@ def get_or_create_slot(schedule_id: int, slot_date, start_time, end_time) -> tup
     return slot, True
 
 
+def create_schedule_exception(
+    doctor_id: str | None,
+    start_date,
+    end_date,
+    start_time=None,
+    end_time=None,
+    reason: str = None,
+    created_by: str = None,
+) -> dict:
+    """Blocks every free slot the exception covers and returns the exception
+    with ``blocked_slots`` and the booked appointments it ``conflicts`` with."""
+    return fn_fetchone(
+        "d_create_schedule_exception",
+        [
+            str(doctor_id) if doctor_id else None,
+            start_date,
+            end_date,
+            start_time,
+            end_time,
+            reason,
+            str(created_by) if created_by else None,
+        ],
+    )
+
+
+def delete_schedule_exception(exception_id: int, doctor_id: str = None) -> dict | None:
+    return fn_fetchone(
+        "d_delete_schedule_exception",
+        [exception_id, str(doctor_id) if doctor_id else None],
+    )
+
+
+def list_schedule_exceptions(doctor_id: str | None, from_date) -> list:
+    return fn_fetchall(
+        "d_list_schedule_exceptions",
+        [str(doctor_id) if doctor_id else None, from_date],
+    )
+
+
 def get_available_slots(schedule_id: int, today, target_date=None) -> list:
     base = """
         SELECT s.*, ds.doctor_id
@@ -211,6 +277,10 @@ def get_available_slots(schedule_id: int, today, target_date=None) -> list:
         JOIN doctor_schedules ds ON ds.schedule_id = s.schedule_id
         WHERE s.schedule_id=%s AND s.is_booked=FALSE AND s.is_blocked=FALSE
           AND s.slot_date >= %s
+          AND NOT EXISTS (
+              SELECT 1 FROM slot_holds h
+              WHERE h.slot_type='DOCTOR' AND h.slot_id=s.slot_id AND h.expires_at > NOW()
+          )
     """
     params = [schedule_id, today]
     if target_date:
@@ -220,28 +290,10 @@ def get_available_slots(schedule_id: int, today, target_date=None) -> list:
     return fetchall(base, params)
 
 
-def lock_slot_for_update(slot_id: int) -> dict | None:
-    from django.db import connection as dj_conn
-
-    with dj_conn.cursor() as cursor:
-        cursor.execute(
-            """
-            SELECT s.*, ds.doctor_id
-            FROM appointment_slots s
-            JOIN doctor_schedules ds ON ds.schedule_id = s.schedule_id
-            WHERE s.slot_id=%s FOR UPDATE
-            """,
-            [slot_id],
-        )
-        cols = [c[0] for c in cursor.description]
-        row = cursor.fetchone()
-    return dict(zip(cols, row)) if row else None
-
-
-def mark_slot_booked(slot_id: int, booked: bool):
-    execute(
-        "UPDATE appointment_slots SET is_booked=%s WHERE slot_id=%s", [booked, slot_id]
-    )
+def release_slot(slot_id: int) -> bool:
+    """Frees a booked slot, re-blocking it if an exception still covers it.
+    Returns True when the slot is open for booking again."""
+    return bool(fn_scalar("d_release_slot", [slot_id]))
 
 
 
@@ -254,30 +306,30 @@ def slot_exists(slot_id: int) -> bool:
     )
 
 
-def create_appointment(
-    doctor_id: str,
+def book_slot(
     patient_id: str,
     slot_id: int,
     appointment_type: str,
-    status: str,
-    reason: str = "",
+    reason: str,
+    today,
 ) -> dict:
-    fn_scalar(
-        "d_book_appointment",
-        [str(patient_id), str(doctor_id), slot_id, appointment_type, reason],
+    """Books ``slot_id`` and returns the enriched appointment in one call.
+    Raises the database error (SLOT_NOT_FOUND, SLOT_ALREADY_BOOKED,
+    SLOT_BLOCKED, SLOT_IN_PAST) when the slot cannot be taken."""
+    return fn_fetchone(
+        "d_book_slot",
+        [str(patient_id), slot_id, appointment_type, reason, today],
     )
-    return fetchone(
-        """
-        SELECT da.*, d.full_name AS doctor_name, pu.email AS patient_email,
-               s.slot_date, s.start_time, s.end_time
-        FROM doctor_appointments da
-        JOIN doctors d ON d.doctor_id = da.doctor_id
-        JOIN users pu ON pu.user_id = da.patient_id
-        LEFT JOIN appointment_slots s ON s.slot_id = da.slot_id
-        WHERE da.doctor_id=%s AND da.patient_id=%s AND da.slot_id=%s
-        ORDER BY da.created_at DESC LIMIT 1
-        """,
-        [str(doctor_id), str(patient_id), slot_id],
+
+
+def reschedule_appointment(
+    appointment_id: int, new_slot_id: int, user_id: str, today
+) -> dict:
+    """Moves the appointment to ``new_slot_id`` and frees the old slot in one
+    call; returns the enriched appointment."""
+    return fn_fetchone(
+        "d_reschedule_appointment",
+        [appointment_id, new_slot_id, str(user_id), today],
     )
 
 
@@ -339,9 +391,37 @@ def update_appointment(appointment_id: int, **fields) -> dict:
     return get_appointment_by_id(appointment_id)
 
 
-def get_patient_appointments(patient_user_id: str) -> list:
-    return fn_fetchall("d_get_appointments", [None, str(patient_user_id)])
+def get_patient_appointments(patient_user_id: str, since=None) -> list:
+    return fn_fetchall("d_get_appointments", [None, str(patient_user_id), since])
+
+
+def get_doctor_appointments(doctor_id: str, since=None) -> list:
+    return fn_fetchall("d_get_appointments", [str(doctor_id), None, since])
+
+
+def get_doctor_agenda(
+    doctor_id: str,
+    date_from,
+    date_to,
+    after: tuple | None,
+    limit: int,
+    include_cancelled: bool = False,
+) -> list:
+    after_date, after_time, after_id = after or (None, None, None)
+    return fn_fetchall(
+        "d_get_doctor_agenda",
+        [
+            str(doctor_id),
+            date_from,
+            date_to,
+            after_date,
+            after_time,
+            after_id,
+            limit,
+            include_cancelled,
+        ],
+    )
 
 
-def get_doctor_appointments(doctor_id: str) -> list:
-    return fn_fetchall("d_get_appointments", [str(doctor_id), None])
+def get_doctor_agenda_version(doctor_id: str, date_from, date_to) -> dict:
+    return fn_fetchone("d_get_doctor_agenda_version", [str(doctor_id), date_from, date_to])
@@ -3,7 +3,14 @@
 import uuid
 import logging
 
-from users.database_queries.connection import execute, fetchscalar, fn_fetchone, fn_scalar
+from users.database_queries.connection import (
+    execute,
+    fetchscalar,
+    fn_execute,
+    fn_fetchall,
+    fn_fetchone,
+    fn_scalar,
+)
 
 
 def _get_verification_type_id(name: str) -> int:
@@ -66,3 +73,45 @@ def check_password_reset_token_validity(token: str) -> bool:
 def execute_password_reset(token: str, new_password_hashed: str) -> bool:
     return fn_scalar("auth_reset_password", [token, new_password_hashed])
 
+
+
+def enqueue_email(
+    to_email: str,
+    subject: str,
+    text_body: str,
+    html_body: str = None,
+    category: str = None,
+    max_attempts: int = 5,
+) -> int:
+    return fn_scalar(
+        "e_enqueue_email",
+        [to_email, subject, text_body, html_body, category, max_attempts],
+    )
+
+
+def claim_email_batch(worker: str, limit: int = 50, lease_seconds: int = 300) -> list:
+    return fn_fetchall("e_claim_email_batch", [worker, limit, lease_seconds])
+
+
+def mark_email_sent(email_id: int) -> None:
+    fn_execute("e_mark_email_sent", [email_id])
+
+
+def mark_email_failed(email_id: int, error: str, backoff_seconds: int) -> str:
+    return fn_scalar("e_mark_email_failed", [email_id, error, backoff_seconds])
+
+
+def enqueue_email_batch(
+    messages: list[tuple],
+    category: str = None,
+    max_attempts: int = 5,
+) -> list[int]:
+    """``messages`` are (to_email, subject, text_body, html_body) tuples."""
+    if not messages:
+        return []
+    to_emails, subjects, text_bodies, html_bodies = (list(col) for col in zip(*messages))
+    rows = fn_fetchall(
+        "e_enqueue_email_batch",
+        [to_emails, subjects, text_bodies, html_bodies, category, max_attempts],
+    )
+    return [row["email_id"] for row in rows]
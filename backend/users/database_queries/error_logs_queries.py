@@ -1,10 +1,10 @@
 # backend/users/database_queries/error_logs_queries.py
 
 import sys
-import traceback
 import logging
 
 from users.database_queries.connection import fn_fetchone
+from users.middleware.exceptions import RateLimitException
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +17,10 @@ def _should_skip(exception) -> bool:
     if exception is None:
         return False
 
+    # Rate-limit refusals are expected under load and would flood the log.
+    if isinstance(exception, RateLimitException):
+        return True
+
     exc_message   = str(exception)
 
     if any(msg in exc_message for msg in _SKIP_MESSAGES):
@@ -25,29 +29,16 @@ def _should_skip(exception) -> bool:
     return False
 
 
-def _build_description(description=None, exception=None) -> str:
-    if exception is None:
-        _, exc_value, _ = sys.exc_info()
-        if exc_value is not None:
-            exception = exc_value
-
-    if exception is not None:
-        tb_lines = traceback.format_exception(
-            type(exception), exception, exception.__traceback__
-        )
-        return "".join(tb_lines).strip()
-
-    if description:
-        return description.strip()
-
-    return "Unknown error (no exception or description provided)"
-
-
 def log_error_to_db(request=None, description=None, exception=None):
     try:
         if _should_skip(exception):
             return
 
+        if exception is None:
+            _, exc_value, _ = sys.exc_info()
+            if exc_value is not None:
+                exception = exc_value
+
         ref_from = request.path if request else None
 
         created_by = None
@@ -58,20 +49,46 @@ def log_error_to_db(request=None, description=None, exception=None):
                     or getattr(request.user, "id", None)
                 )
 
-        final_description = _build_description(
+        from users.services.error_aggregator import error_aggregator
+
+        error_aggregator.record(
+            ref_from=ref_from,
             description=description,
             exception=exception,
+            created_by=str(created_by) if created_by else None,
         )
-        print(f"\n\nHandle in fn.")
-        print(f"description : {description}")
-        print(f"exception : {exception}")
-
-        fn_fetchone("insert_error_log", [ref_from, final_description, created_by])
 
     except Exception as e:
         logger.error("[log_error_to_db] Failed to persist error log: %s", e, exc_info=True)
 
 
+def upsert_error_log_group(
+    fingerprint,
+    window_start,
+    exception_type,
+    ref_from,
+    description,
+    count,
+    first_seen,
+    last_seen,
+    created_by=None,
+):
+    return fn_fetchone(
+        "upsert_error_log_group",
+        [
+            fingerprint,
+            window_start,
+            exception_type,
+            ref_from,
+            description,
+            count,
+            first_seen,
+            last_seen,
+            created_by,
+        ],
+    )
+
+
 def get_error_logs(created_by=None, ref_from=None, from_date=None, limit=100) -> list:
 
     from django.db import connection
@@ -92,7 +109,7 @@ def get_error_logs(created_by=None, ref_from=None, from_date=None, limit=100) ->
     parts.append("p_limit => %s")
     params.append(limit)
 
-    sql = f"SELECT * FROM get_error_logs({', '.join(parts)})"
+    sql = f"SELECT * FROM get_error_log_groups({', '.join(parts)})"
 
     from users.database_queries.connection import fetchall
     return fetchall(sql, params)
@@ -100,4 +117,4 @@ def get_error_logs(created_by=None, ref_from=None, from_date=None, limit=100) ->
 
 def get_error_log_by_key(error_key: str) -> dict | None:
     from users.database_queries.connection import fn_fetchone
-    return fn_fetchone("get_error_log_by_key", [error_key])
\ No newline at end of file
+    return fn_fetchone("get_error_log_group_by_key", [error_key])
\ No newline at end of file
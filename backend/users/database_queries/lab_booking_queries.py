@@ -1,5 +1,8 @@
 # backend\users\database_queries\lab_booking_queries.py
+from datetime import date
+
 from users.database_queries.connection import fn_fetchone, fn_fetchall, fn_execute
+from users.services import json_codec
 
 
 def create_lab_booking(
@@ -37,6 +40,59 @@ def create_lab_booking(
     )
 
 
+def book_lab_slot(
+    patient_id: str,
+    lab_id: str,
+    slot_id: int,
+    test_id: int,
+    collection_type: str,
+    collection_address,
+    subtotal: float,
+    home_collection_charge: float,
+    discount_amount: float,
+    total_amount: float,
+    notes: str = None,
+    today=None,
+) -> dict:
+    """Reserves a seat (booked_count < capacity) and creates the booking in
+    one call. Raises SLOT_NOT_FOUND / SLOT_WRONG_LAB / SLOT_INACTIVE /
+    SLOT_IN_PAST / SLOT_FULL from the database."""
+    collection_address_json = (
+        json_codec.dumps(collection_address) if collection_address is not None else None
+    )
+    return fn_fetchone(
+        "l_book_lab_slot",
+        [
+            str(patient_id),
+            str(lab_id),
+            slot_id,
+            test_id,
+            collection_type,
+            collection_address_json,
+            subtotal,
+            home_collection_charge,
+            discount_amount,
+            total_amount,
+            notes,
+            today or date.today(),
+        ],
+    )
+
+
+def set_slot_capacity(lab_id: str, slot_id: int, capacity: int) -> dict | None:
+    """Returns None when the slot is not the lab's or already holds more
+    bookings than the new capacity."""
+    from users.database_queries.connection import fetchone
+    return fetchone(
+        """
+        UPDATE lab_test_slots SET capacity=%s, updated_at=NOW()
+        WHERE slot_id=%s AND lab_id=%s AND booked_count <= %s
+        RETURNING *
+        """,
+        [capacity, slot_id, str(lab_id), capacity],
+    )
+
+
 def get_lab_booking(booking_id: str) -> dict:
     return fn_fetchone("l_get_lab_booking", [str(booking_id)])
 
@@ -45,8 +101,8 @@ def list_patient_bookings(patient_id: str) -> list:
     return fn_fetchall("l_list_patient_bookings", [str(patient_id)])
 
 
-def list_lab_bookings(lab_id: str) -> list:
-    return fn_fetchall("l_list_lab_bookings", [str(lab_id)])
+def list_lab_bookings(lab_id: str, since=None) -> list:
+    return fn_fetchall("l_list_lab_bookings", [str(lab_id), since])
 
 
 def cancel_lab_booking(
@@ -60,6 +116,25 @@ def cancel_lab_booking(
     )
 
 
+def reschedule_lab_booking(
+    booking_id: str,
+    new_slot_id: int,
+    patient_id: str = None,
+    lab_id: str = None,
+    today=None,
+) -> dict:
+    return fn_fetchone(
+        "l_reschedule_lab_booking",
+        [
+            str(booking_id),
+            new_slot_id,
+            str(patient_id) if patient_id else None,
+            str(lab_id) if lab_id else None,
+            today or date.today(),
+        ],
+    )
+
+
 def complete_lab_booking(booking_id: str) -> dict:
     return fn_fetchone("l_complete_lab_booking", [str(booking_id)])
 
@@ -67,19 +142,22 @@ def complete_lab_booking(booking_id: str) -> dict:
 def get_available_slots(lab_id: str, today, target_date=None) -> list:
     from users.database_queries.connection import fetchall
     base = """
-        SELECT * FROM lab_test_slots
-        WHERE lab_id=%s AND is_active=TRUE
-          AND slot_date >= %s
+        SELECT s.* FROM lab_test_slots s
+        WHERE s.lab_id=%s AND s.is_active=TRUE
+          AND s.slot_date >= %s
+          AND s.booked_count + h_other_holds('LAB', s.slot_id, NULL) < s.capacity
     """
     params = [str(lab_id), today]
     if target_date:
-        base += " AND slot_date=%s"
+        base += " AND s.slot_date=%s"
         params.append(target_date)
-    base += " ORDER BY slot_date, start_time"
+    base += " ORDER BY s.slot_date, s.start_time"
     return fetchall(base, params)
 
 
-def get_or_create_slot(lab_id: str, slot_date, start_time, end_time) -> tuple:
+def get_or_create_slot(
+    lab_id: str, slot_date, start_time, end_time, capacity: int = 10
+) -> tuple:
     from users.database_queries.connection import fetchone
     existing = fetchone(
         "SELECT * FROM lab_test_slots WHERE lab_id=%s AND slot_date=%s AND start_time=%s",
@@ -91,11 +169,11 @@ def get_or_create_slot(lab_id: str, slot_date, start_time, end_time) -> tuple:
     row = fetchone(
         """
         INSERT INTO lab_test_slots (lab_id, slot_date, start_time, end_time,
-                                   booked_count, is_active, created_at)
-        VALUES (%s, %s, %s, %s, 0, TRUE, NOW())
+                                   booked_count, capacity, is_active, created_at)
+        VALUES (%s, %s, %s, %s, 0, %s, TRUE, NOW())
         RETURNING slot_id
         """,
-        [str(lab_id), slot_date, start_time, end_time],
+        [str(lab_id), slot_date, start_time, end_time, capacity],
     )
     slot = fetchone("SELECT * FROM lab_test_slots WHERE slot_id=%s", [row["slot_id"]])
     return slot, True
@@ -111,8 +189,11 @@ def get_slot_by_id(slot_id: int) -> dict | None:
     return fetchone("SELECT * FROM lab_test_slots WHERE slot_id=%s", [slot_id])
 
 
-def increment_slot_booked_count(slot_id: int) -> None:
-    fn_execute("increment_slot_booked_count", [slot_id])
+def increment_slot_booked_count(slot_id: int, patient_id: str = None) -> None:
+    fn_execute(
+        "increment_slot_booked_count",
+        [slot_id, str(patient_id) if patient_id else None],
+    )
 
 
 def decrement_slot_booked_count(slot_id: int) -> None:
@@ -6,6 +6,7 @@ from users.database_queries.connection import (
     fetchscalar,
     execute,
 )
+from users.database_queries.request_memo import memoize
 
 
 def _normalize_lab(row: dict) -> dict:
@@ -25,6 +26,7 @@ def _normalize_lab(row: dict) -> dict:
     return d
 
 
+@memoize
 def get_lab_by_user_id(user_id: str) -> dict | None:
     row = fn_fetchone("l_get_full_lab_profile", [str(user_id)])
     # print("\nFetched lab row:", row)  # Debug print
@@ -36,6 +38,11 @@ def get_all_labs() -> list:
     return rows
 
 
+def get_lab_directory(today) -> list:
+    """Verified, active labs joined with their availability summary."""
+    return fn_fetchall("l_list_lab_directory", [today])
+
+
 def update_lab(user_id: str, **fields) -> dict:
     if not fields:
         return get_lab_by_user_id(user_id)
@@ -77,6 +84,13 @@ def get_pending_labs_count() -> int:
     )
 
 
+@memoize
+def get_lab_profile_bundle(user_id: str) -> dict | None:
+    row = fn_fetchone("l_get_lab_profile_bundle", [str(user_id)])
+    return _normalize_lab(row) if row else None
+
+
+@memoize
 def get_lab_operating_hours(lab_user_id: str) -> list:
     return fn_fetchall("l_get_operating_hours", [str(lab_user_id)])
 
@@ -6,8 +6,10 @@ from users.database_queries.connection import (
     fetchscalar,
     execute,
 )
+from users.database_queries.request_memo import memoize
 
 
+@memoize
 def get_patient_by_id(patient_id: str) -> dict | None:
     return fn_fetchone("p_get_full_patient_profile", [str(patient_id)])
 
@@ -45,3 +47,13 @@ def update_patient(patient_id: str, **fields) -> dict:
     return new_patient_data
 
 get_full_patient_profile = get_patient_by_id
+
+
+def get_patient_timeline(
+    patient_id: str, after: tuple | None, limit: int, kinds: list | None = None
+) -> list:
+    after_time, after_kind, after_id = after or (None, None, None)
+    return fn_fetchall(
+        "p_get_patient_timeline",
+        [str(patient_id), after_time, after_kind, after_id, limit, kinds],
+    )
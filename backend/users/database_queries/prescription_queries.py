@@ -3,6 +3,7 @@
 from users.database_queries.connection import (
     fetchone,
     fetchall,
+    fn_fetchone,
     fn_scalar,
     execute,
 )
@@ -38,6 +39,43 @@ def create_prescription(
     return str(list(result.values())[0])
 
 
+def create_prescription_with_medicines(
+    appointment_id: int,
+    doctor_id: str,
+    patient_id: str,
+    prescription_number: str,
+    medicines: list[dict],
+    clinical_notes: str = None,
+    lab_tests: str = None,
+    advice: str = None,
+    follow_up_date=None,
+) -> dict:
+    """Creates the header and every medicine line, completes the appointment
+    and returns the stored prescription with ``medicines``, in one round
+    trip. Medicines keep their list order as sort_order."""
+    def column(key):
+        return [med.get(key) or None for med in medicines]
+
+    return fn_fetchone(
+        "doc_create_prescription_with_medicines",
+        [
+            appointment_id,
+            doctor_id,
+            patient_id,
+            prescription_number,
+            clinical_notes,
+            lab_tests,
+            advice,
+            follow_up_date,
+            [med["medicine_name"] for med in medicines],
+            column("dosage"),
+            column("frequency"),
+            column("duration"),
+            column("instructions"),
+        ],
+    )
+
+
 def add_prescription_medicine(
     prescription_id: str,
     medicine_name: str,
@@ -75,8 +113,8 @@ def get_prescription_medicines(prescription_id: str) -> list[dict]:
     )
 
 
-def get_patient_prescriptions(patient_id: str) -> list[dict]:
+def get_patient_prescriptions(patient_id: str, since=None) -> list[dict]:
     return fetchall(
-        "SELECT * FROM doc_get_patient_prescriptions(%s)",
-        (patient_id,),
+        "SELECT * FROM doc_get_patient_prescriptions(%s, %s)",
+        (patient_id, since),
     )
\ No newline at end of file
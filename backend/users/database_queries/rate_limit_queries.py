@@ -0,0 +1,10 @@
+# backend\users\database_queries\rate_limit_queries.py
+from users.database_queries.connection import fn_scalar
+
+
+def take_tokens(keys: list, capacities: list, refills: list) -> float:
+    return fn_scalar("rl_take_tokens", [keys, capacities, refills])
+
+
+def purge_buckets(idle_seconds: int) -> int:
+    return fn_scalar("rl_purge_buckets", [f"{int(idle_seconds)} seconds"])
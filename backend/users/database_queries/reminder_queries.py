@@ -0,0 +1,15 @@
+# backend/users/database_queries/reminder_queries.py
+
+from users.database_queries.connection import fn_execute, fn_fetchall
+
+
+def claim_appointment_reminders(now, lead_hours: int = 24) -> list:
+    return fn_fetchall("n_claim_appointment_reminders", [now, lead_hours])
+
+
+def claim_follow_up_reminders(now, lead_hours: int = 24) -> list:
+    return fn_fetchall("n_claim_follow_up_reminders", [now, lead_hours])
+
+
+def attach_reminder_emails(reminder_ids: list[int], email_ids: list[int]) -> None:
+    fn_execute("n_attach_reminder_emails", [reminder_ids, email_ids])
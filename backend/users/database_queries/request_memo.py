@@ -0,0 +1,103 @@
+# backend\users\database_queries\request_memo.py
+import copy
+import functools
+import re
+import threading
+from collections import defaultdict
+
+# Per-request identity map for the entity getters in the *_queries
+# modules. RequestMemoMiddleware opens it for the request and drops it at
+# the end; outside a request (commands, worker threads) nothing is cached.
+# Every statement that is not recognisably a read clears it, so a getter
+# called after a write always sees the database again.
+_thread_locals = threading.local()
+
+_stats = defaultdict(lambda: {"requests": 0, "hits": 0, "misses": 0})
+_stats_lock = threading.Lock()
+
+# "SELECT * FROM x_get_...(" / "SELECT x_list_...(" and the like.
+_FN_CALL_RE = re.compile(r"^\s*SELECT\s+(?:\*\s+FROM\s+)?([a-z_0-9]+)\s*\(", re.I)
+_READ_FN_RE = re.compile(r"^(?:[a-z]+_)?(?:get|list)_")
+_CALL_RE = re.compile(r"([a-z_0-9]+)\s*\(", re.I)
+# Things that look like calls in a plain SELECT but cannot write.
+_PURE_FUNCTIONS = frozenset(
+    ["count", "coalesce", "exists", "max", "min", "sum", "lower", "upper", "now"]
+    + ["in", "and", "or", "not", "any"]
+)
+
+
+def begin() -> None:
+    _thread_locals.memo = {}
+    _thread_locals.hits = 0
+    _thread_locals.misses = 0
+
+
+def end(endpoint: str = None) -> None:
+    memo = getattr(_thread_locals, "memo", None)
+    _thread_locals.memo = None
+    if memo is None or not endpoint:
+        return
+    with _stats_lock:
+        entry = _stats[endpoint]
+        entry["requests"] += 1
+        entry["hits"] += _thread_locals.hits
+        entry["misses"] += _thread_locals.misses
+
+
+def clear() -> None:
+    memo = getattr(_thread_locals, "memo", None)
+    if memo:
+        memo.clear()
+
+
+def is_read(sql: str) -> bool:
+    match = _FN_CALL_RE.match(sql)
+    if match and match.group(1).lower() not in _PURE_FUNCTIONS:
+        return bool(_READ_FN_RE.match(match.group(1).lower()))
+    if not sql.lstrip()[:6].upper() == "SELECT":
+        return False
+    return all(
+        name.lower() in _PURE_FUNCTIONS for name in _CALL_RE.findall(sql)
+    )
+
+
+def note_statement(sql: str) -> None:
+    """Called by the connection helpers before each statement."""
+    if getattr(_thread_locals, "memo", None) and not is_read(sql):
+        _thread_locals.memo.clear()
+
+
+def memoize(fn):
+    """Cache a getter's result for the rest of the request. Hits return a
+    deep copy, since callers commonly decorate the returned dict."""
+    name = f"{fn.__module__}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        memo = getattr(_thread_locals, "memo", None)
+        if memo is None:
+            return fn(*args, **kwargs)
+        key = (
+            name,
+            tuple(str(a) for a in args),
+            tuple(sorted((k, str(v)) for k, v in kwargs.items())),
+        )
+        if key in memo:
+            _thread_locals.hits += 1
+            return copy.deepcopy(memo[key])
+        _thread_locals.misses += 1
+        result = fn(*args, **kwargs)
+        # The getter's own statements are reads, so the memo survived them.
+        memo = getattr(_thread_locals, "memo", None)
+        if memo is not None:
+            memo[key] = copy.deepcopy(result)
+        return result
+
+    return wrapper
+
+
+def stats() -> dict:
+    """Per endpoint: requests seen, queries saved (hits) and getter calls
+    that went to the database (misses), since process start."""
+    with _stats_lock:
+        return {endpoint: dict(entry) for endpoint, entry in _stats.items()}
@@ -1,5 +1,6 @@
 # backend/db/role_permission_queries.py
 from users.database_queries.connection import fn_fetchall, fn_fetchone, fn_scalar
+from users.services import permission_matrix
 
 
 def get_all_roles():
@@ -18,13 +19,23 @@ def get_permissions_by_role(role_id: int):
     return fn_fetchall("r_get_permissions_by_role", [role_id])
 
 
+def get_permission_matrix():
+    return fn_fetchall("r_get_permission_matrix", [])
+
+
 def grant_permission_to_role(role_id: int, permission_id: int, grant_by=None):
-    return fn_scalar("r_grant_permission_to_role", [role_id, permission_id, grant_by])
+    msg = fn_scalar("r_grant_permission_to_role", [role_id, permission_id, grant_by])
+    permission_matrix.invalidate()
+    return msg
 
 
 def revoke_permission_from_role(role_id: int, permission_id: int):
-    return fn_scalar("r_revoke_permission_from_role", [role_id, permission_id])
+    msg = fn_scalar("r_revoke_permission_from_role", [role_id, permission_id])
+    permission_matrix.invalidate()
+    return msg
 
 
 def sync_role_permissions(role_id: int, permission_ids: list, grant_by=None):
-    return fn_scalar("r_sync_role_permissions", [role_id, permission_ids, grant_by])
+    msg = fn_scalar("r_sync_role_permissions", [role_id, permission_ids, grant_by])
+    permission_matrix.invalidate()
+    return msg
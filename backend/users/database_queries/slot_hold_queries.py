@@ -0,0 +1,35 @@
+# backend/users/database_queries/slot_hold_queries.py
+
+from users.database_queries.connection import fn_fetchone, fn_scalar
+from users.services import json_codec
+
+
+def place_slot_hold(
+    slot_type: str,
+    slot_id: int,
+    patient_id: str,
+    payload: dict,
+    amount,
+    ttl_seconds: int,
+    today,
+) -> dict:
+    return fn_fetchone(
+        "h_place_slot_hold",
+        [
+            slot_type,
+            slot_id,
+            str(patient_id),
+            json_codec.dumps(payload or {}),
+            amount,
+            ttl_seconds,
+            today,
+        ],
+    )
+
+
+def get_slot_hold(hold_id: str) -> dict | None:
+    return fn_fetchone("h_get_slot_hold", [str(hold_id)])
+
+
+def release_slot_hold(hold_id: str, patient_id: str) -> bool:
+    return bool(fn_scalar("h_release_slot_hold", [str(hold_id), str(patient_id)]))
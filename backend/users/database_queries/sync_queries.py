@@ -0,0 +1,11 @@
+# backend/users/database_queries/sync_queries.py
+
+from users.database_queries.connection import fn_fetchall, fn_scalar
+
+
+def get_tombstones(entity: str, owner_id: str, since) -> list:
+    return fn_fetchall("t_get_tombstones", [entity, str(owner_id), since])
+
+
+def purge_tombstones(before) -> int:
+    return fn_scalar("t_purge_tombstones", [before])
@@ -9,12 +9,15 @@ from users.database_queries.connection import (
     fetchone,
     fetchscalar,
 )
+from users.database_queries.request_memo import memoize
 
 
+@memoize
 def get_user_by_email(email: str) -> dict | None:
     return fn_fetchone("u_get_user_by_email", [email])
 
 
+@memoize
 def get_user_by_id(user_id: str) -> dict | None:
     return fn_fetchone("u_get_user_by_id", [str(user_id)])
 
@@ -29,6 +32,54 @@ def get_user_permission_by_id(role_id) -> dict | None:
     return permissions_list
 
 
+def get_login_context(email: str) -> dict | None:
+    return fn_fetchone("auth_get_login_context", [email])
+
+
+def record_login(
+    user_id: str,
+    outcome: str,
+    reason: str = None,
+    max_attempts: int = 5,
+    lockout_minutes: int = 15,
+    new_password_hash: str = None,
+) -> dict | None:
+    return fn_fetchone(
+        "auth_record_login",
+        [
+            str(user_id),
+            outcome,
+            reason,
+            max_attempts,
+            lockout_minutes,
+            new_password_hash,
+        ],
+    )
+
+
+def rotate_refresh_token(
+    jti: str, family_id: str, user_id: str, expires_at, retain_until,
+    grace_seconds: int = 0,
+) -> dict | None:
+    return fn_fetchone(
+        "auth_rotate_refresh_token",
+        [jti, family_id, user_id, expires_at, retain_until, grace_seconds],
+    )
+
+
+def revoke_refresh_family(
+    jti: str, family_id: str, user_id: str, expires_at, retain_until, reason: str
+) -> bool:
+    return fn_scalar(
+        "auth_revoke_refresh_family",
+        [jti, family_id, user_id, expires_at, retain_until, reason],
+    )
+
+
+def purge_refresh_revocations() -> int:
+    return fn_scalar("auth_purge_refresh_revocations", [])
+
+
 def handle_failed_login(
     user: dict,
     max_attempts: int = 5,
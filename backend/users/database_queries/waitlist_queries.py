@@ -0,0 +1,48 @@
+# backend/users/database_queries/waitlist_queries.py
+
+from users.database_queries.connection import fn_execute, fn_fetchall, fn_fetchone
+from users.services import json_codec
+
+
+def join_waitlist(
+    target_type: str,
+    target_id: str,
+    patient_id: str,
+    date_from,
+    date_to,
+    payload: dict,
+    amount=None,
+) -> dict | None:
+    """Returns None when the patient is already waiting for this target."""
+    return fn_fetchone(
+        "w_join_waitlist",
+        [
+            target_type,
+            str(target_id),
+            str(patient_id),
+            date_from,
+            date_to,
+            json_codec.dumps(payload or {}),
+            amount,
+        ],
+    )
+
+
+def leave_waitlist(entry_id: str, patient_id: str) -> dict | None:
+    return fn_fetchone("w_leave_waitlist", [str(entry_id), str(patient_id)])
+
+
+def list_patient_waitlist(patient_id: str) -> list:
+    return fn_fetchall("w_list_patient_waitlist", [str(patient_id)])
+
+
+def offer_freed_slot(slot_type: str, slot_id: int, ttl_seconds: int, today) -> dict | None:
+    return fn_fetchone("w_offer_freed_slot", [slot_type, slot_id, ttl_seconds, today])
+
+
+def mark_offer_fulfilled(hold_id: str) -> None:
+    fn_execute("w_mark_offer_fulfilled", [str(hold_id)])
+
+
+def expire_waitlist(today) -> list:
+    return fn_fetchall("w_expire_waitlist", [today])
@@ -1,8 +1,11 @@
 from .auth_helpers import set_auth_response_with_tokens, set_refresh_token_cookie
 from .profile_helpers import get_profile_data_by_role
+from .request_helpers import ensure_patient, get_client_ip
 
 __all__ = [
     "set_auth_response_with_tokens",
     "set_refresh_token_cookie",
     "get_profile_data_by_role",
+    "get_client_ip",
+    "ensure_patient",
 ]
\ No newline at end of file
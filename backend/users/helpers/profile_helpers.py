@@ -1,6 +1,12 @@
 # backend\users\helpers\profile_helpers.py
 
 import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, time as dt_time
+
+from django.conf import settings
 
 from users.models import UserRole
 import users.database_queries.patient_queries as pq
@@ -9,12 +15,49 @@ import users.database_queries.lab_queries as lq
 
 logger = logging.getLogger(__name__)
 
+# user_id -> (profile_version, expires_at, profile). Only used when the
+# caller already holds a profile_version (token refresh reads it with the
+# user row), so a hit costs no query at all.
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+_DATETIME_FIELDS = ("created_at", "updated_at")
+_TIME_FIELDS = ("arrival", "leaving", "lunch_start", "lunch_end", "open_time", "close_time")
+
 
-def get_profile_data_by_role(user):
+def get_profile_data_by_role(user, version=None):
 
     user_id = str(getattr(user, "user_id", None) or user.get("user_id", ""))
     role = getattr(user, "role", None) or user.get("role")
 
+    if version is None:
+        return _build_profile(user, user_id, role)
+
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(user_id)
+        if entry and entry[0] == version and entry[1] > now:
+            _cache.move_to_end(user_id)
+            return entry[2]
+
+    profile = _build_profile(user, user_id, role)
+    ttl = int(getattr(settings, "PROFILE_CACHE_TTL_SECONDS", 60))
+    max_entries = int(getattr(settings, "PROFILE_CACHE_MAX_ENTRIES", 4096))
+    if ttl > 0 and max_entries > 0:
+        with _cache_lock:
+            _cache[user_id] = (version, now + ttl, profile)
+            _cache.move_to_end(user_id)
+            while len(_cache) > max_entries:
+                _cache.popitem(last=False)
+    return profile
+
+
+def invalidate_profile(user_id) -> None:
+    with _cache_lock:
+        _cache.pop(str(user_id), None)
+
+
+def _build_profile(user, user_id: str, role):
     if role == UserRole.PATIENT:
         return _patient_profile(user_id)
 
@@ -25,7 +68,7 @@ def get_profile_data_by_role(user):
         return _lab_profile(user_id)
 
     if role in (UserRole.ADMIN, UserRole.STAFF, UserRole.SUPERADMIN):
-        return _admin_profile(user_id)
+        return _admin_profile(user_id, _user_row(user))
 
     logger.warning(
         "get_profile_data_by_role: unrecognised role=%s for user_id=%s", role, user_id
@@ -47,15 +90,14 @@ def _patient_profile(user_id: str) -> dict:
 def _doctor_profile(user_id: str) -> dict:
     from ..serializers.doctor_serializers import DoctorProfileSerializer
 
-    doctor = dq.get_doctor_by_user_id(user_id)
+    doctor = dq.get_doctor_profile_bundle(user_id)
     if doctor:
-        uid = str(doctor["doctor_id"])
-        doctor["qualifications"] = dq.get_doctor_qualifications(uid)
-        doctor["specializations"] = dq.get_doctor_specializations(uid)
-        schedule = dq.get_schedule_by_doctor(uid)
+        doctor["qualifications"] = [_revive(q) for q in doctor["qualifications"]]
+        doctor["specializations"] = [_revive(s) for s in doctor["specializations"]]
+        schedule = doctor["schedule"]
         if schedule:
-            schedule["working_days"] = dq.get_working_days(schedule["schedule_id"])
-        doctor["schedule"] = schedule
+            _revive(schedule)
+            schedule["working_days"] = [_revive(w) for w in schedule["working_days"]]
         return DoctorProfileSerializer(doctor).data
 
     logger.warning("Doctor profile not found for user_id=%s", user_id)
@@ -65,10 +107,9 @@ def _doctor_profile(user_id: str) -> dict:
 def _lab_profile(user_id: str) -> dict:
     from ..serializers.lab_serializers import LabProfileSerializer
 
-    lab = lq.get_lab_by_user_id(user_id)
+    lab = lq.get_lab_profile_bundle(user_id)
     if lab:
-        uid = str(lab["lab_id"])
-        lab["operating_hours"] = lq.get_lab_operating_hours(uid)
+        lab["operating_hours"] = [_revive(h) for h in lab["operating_hours"]]
         # lab["services"] = lq.get_lab_services(uid)
         return LabProfileSerializer(lab).data
 
@@ -76,11 +117,11 @@ def _lab_profile(user_id: str) -> dict:
     return _base_user(user_id)
 
 
-def _admin_profile(user_id: str) -> dict:
+def _admin_profile(user_id: str, user: dict = None) -> dict:
     from users.serializers.user_serializers import UserSerializer
     from users.database_queries.user_queries import get_user_by_id
 
-    user = get_user_by_id(user_id)
+    user = user or get_user_by_id(user_id)
     if user:
         return UserSerializer(user).data
 
@@ -94,3 +135,24 @@ def _base_user(user_id: str) -> dict:
 
     user = get_user_by_id(user_id) or {}
     return UserSerializer(user).data
+
+
+def _user_row(user) -> dict | None:
+    # A full users row (e.g. the one token refresh just read) saves the
+    # admin profile its own lookup; a token payload is not enough.
+    row = getattr(user, "_d", user)
+    if isinstance(row, dict) and "created_at" in row:
+        return row
+    return None
+
+
+def _revive(row: dict) -> dict:
+    # jsonb aggregates come back as ISO strings; restore the types the
+    # per-table queries returned so the serializers format them the same.
+    for key in _DATETIME_FIELDS:
+        if isinstance(row.get(key), str):
+            row[key] = datetime.fromisoformat(row[key])
+    for key in _TIME_FIELDS:
+        if isinstance(row.get(key), str):
+            row[key] = dt_time.fromisoformat(row[key])
+    return row
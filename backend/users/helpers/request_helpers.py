@@ -0,0 +1,29 @@
+# backend\users\helpers\request_helpers.py
+from django.conf import settings
+
+from users.middleware.exceptions import PermissionException
+from users.models import UserRole
+
+
+def get_client_ip(request) -> str | None:
+    """Client address as seen by the last TRUSTED_PROXY_COUNT proxies.
+
+    Each proxy appends the address it received the request from, so only
+    the last N entries of X-Forwarded-For are trustworthy; anything before
+    them was supplied by the client. With TRUSTED_PROXY_COUNT = 0 the
+    header is ignored.
+    """
+    remote_addr = request.META.get("REMOTE_ADDR")
+    proxies = int(getattr(settings, "TRUSTED_PROXY_COUNT", 1))
+    xff = request.META.get("HTTP_X_FORWARDED_FOR")
+    if not proxies or not xff:
+        return remote_addr
+    hops = [hop.strip() for hop in xff.split(",") if hop.strip()]
+    if not hops:
+        return remote_addr
+    return hops[-min(proxies, len(hops))]
+
+
+def ensure_patient(request) -> None:
+    if getattr(request.user, "role", None) != UserRole.PATIENT:
+        raise PermissionException("Access denied. Patient role required.")
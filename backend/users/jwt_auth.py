@@ -1,10 +1,14 @@
 # backend\users\services\jwt_auth.py
 
+import hashlib
+import threading
+import time
 import uuid
 import logging
+from collections import OrderedDict
 
 import jwt
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.conf import settings
 from django.utils import timezone
 from rest_framework.authentication import BaseAuthentication
@@ -30,10 +34,92 @@ def _refresh_exp() -> timedelta:
     return timedelta(days=getattr(settings, "JWT_REFRESH_EXPIRE_DAYS", 7))
 
 
+def _refresh_reuse_grace() -> int:
+    return getattr(settings, "JWT_REFRESH_REUSE_GRACE_SECONDS", 10)
+
+
 def _secret() -> str:
     return settings.SECRET_KEY
 
 
+class _TokenCache:
+    """Bounded LRU of verified access tokens, keyed by their SHA-256 digest.
+
+    An entry is served only while its ``exp`` is in the future, so a hit
+    never outlives the token. ``evict_user`` drops every entry for one
+    user and is called on revocation events.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                user, exp = entry
+                if time.time() < exp:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return user
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: bytes, user, exp) -> None:
+        max_entries = int(getattr(settings, "JWT_CACHE_MAX_ENTRIES", 4096))
+        if max_entries <= 0 or exp is None:
+            return
+        with self._lock:
+            self._entries[key] = (user, exp)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def evict_user(self, user_id) -> None:
+        user_id = str(user_id)
+        with self._lock:
+            for key in [
+                k for k, (u, _) in self._entries.items() if str(u.user_id) == user_id
+            ]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_token_cache = _TokenCache()
+
+
+def token_cache_stats() -> dict:
+    return _token_cache.stats()
+
+
+def revoke_user_tokens(user_id) -> None:
+    """Stop serving cached access tokens for a user; the next request
+    with any of them is decoded and checked again."""
+    _token_cache.evict_user(user_id)
+
+
 class TokenUser:
     def __init__(self, payload: dict):
         self.user_id = payload.get("user_id")
@@ -82,7 +168,9 @@ class UserWrapper:
         return self._d.get("user_id")
 
 
-def generate_tokens(user: dict) -> dict:
+def generate_tokens(user: dict, family_id: str = None) -> dict:
+    """Issue an access/refresh pair. ``family_id`` carries a rotated
+    refresh token's family forward; a new login starts a new family."""
     now = timezone.now()
 
     access_payload = {
@@ -97,6 +185,7 @@ def generate_tokens(user: dict) -> dict:
     refresh_payload = {
         "token_type": "refresh",
         "jti": str(uuid.uuid4()),
+        "fam": family_id or str(uuid.uuid4()),
         "user_id": str(user["user_id"]),
         "email": user["email"],
         "role": user["role"],
@@ -127,6 +216,17 @@ def decode_refresh_token(token: str) -> dict:
     return payload
 
 
+def _refresh_revocation_args(payload: dict) -> tuple:
+    # Tokens issued before families existed start their own family.
+    return (
+        payload["jti"],
+        payload.get("fam") or payload["jti"],
+        payload["user_id"],
+        datetime.fromtimestamp(payload["exp"], tz=dt_timezone.utc),
+        timezone.now() + _refresh_exp(),
+    )
+
+
 def rotate_refresh_token(old_refresh_token: str) -> tuple[dict, str, str]:
     try:
         payload = decode_refresh_token(old_refresh_token)
@@ -135,17 +235,39 @@ def rotate_refresh_token(old_refresh_token: str) -> tuple[dict, str, str]:
     except jwt.PyJWTError:
         raise AuthenticationException("Invalid refresh token.")
 
-    user = user_queries.get_user_by_id(payload.get("user_id"))
+    args = _refresh_revocation_args(payload)
+    user = user_queries.rotate_refresh_token(*args, _refresh_reuse_grace())
 
     if not user:
         raise AuthenticationException("User not found.")
+    status = user.pop("rotation_status")
+    if status == "REUSED":
+        logger.warning(
+            "Refresh token reuse for user %s; family %s revoked.",
+            payload["user_id"],
+            args[1],
+        )
+        raise AuthenticationException("Refresh token has already been used.")
+    if status == "REVOKED":
+        raise AuthenticationException("Refresh token has been revoked.")
     if not user.get("is_active"):
         raise PermissionException("Account is inactive.")
 
-    tokens = generate_tokens(user)
+    tokens = generate_tokens(user, family_id=args[1])
     return user, tokens["access_token"], tokens["refresh_token"]
 
 
+def revoke_refresh_token(refresh_token: str, reason: str = "LOGOUT") -> dict | None:
+    """Revoke a refresh token and every token rotated from the same login.
+    Returns the decoded payload, or None if the token was not valid."""
+    try:
+        payload = decode_refresh_token(refresh_token)
+    except jwt.PyJWTError:
+        return None
+    user_queries.revoke_refresh_family(*_refresh_revocation_args(payload), reason)
+    return payload
+
+
 class PyJWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
         auth_header = request.META.get("HTTP_AUTHORIZATION", "")
@@ -156,6 +278,11 @@ class PyJWTAuthentication(BaseAuthentication):
         if not token:
             return None
 
+        key = _token_cache.key(token)
+        user = _token_cache.get(key)
+        if user is not None:
+            return user, token
+
         try:
             payload = decode_access_token(token)
         except jwt.ExpiredSignatureError:
@@ -167,6 +294,7 @@ class PyJWTAuthentication(BaseAuthentication):
         if not user.is_active:
             raise AuthenticationFailed("User account is inactive.")
 
+        _token_cache.put(key, user, payload.get("exp"))
         return user, token
 
     def authenticate_header(self, request):
@@ -0,0 +1,126 @@
+# backend\users\management\commands\bench_booking_race.py
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+import users.database_queries.doctor_queries as dq
+from users.database_queries.connection import execute, fetchall
+from users.services.appointment_service import AppointmentService
+
+
+class Command(BaseCommand):
+    help = (
+        "Race N patients for each of K free slots of one doctor and check that "
+        "no slot ends up with more than one live appointment. Runs against the "
+        "configured database; bench appointments are removed afterwards unless "
+        "--keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("doctor_id")
+        parser.add_argument("--patients", type=int, default=16)
+        parser.add_argument("--slots", type=int, default=20)
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options):
+        schedule = dq.get_schedule_by_doctor(options["doctor_id"])
+        if not schedule:
+            raise CommandError("Doctor has no schedule.")
+
+        slots = dq.get_available_slots(schedule["schedule_id"], timezone.localdate())
+        slot_ids = [s["slot_id"] for s in slots[: options["slots"]]]
+        patients = [
+            str(r["patient_id"])
+            for r in fetchall(
+                "SELECT patient_id FROM patients ORDER BY patient_id LIMIT %s",
+                [options["patients"]],
+            )
+        ]
+        if not slot_ids or not patients:
+            raise CommandError("Need at least one free slot and one patient.")
+
+        self.stdout.write(
+            f"{len(patients)} patients racing for each of {len(slot_ids)} slots"
+        )
+
+        booked, rejected, errors = [], 0, []
+        lock = threading.Lock()
+        latencies = []
+
+        def attempt(patient_id, slot_id, start_gate):
+            nonlocal rejected
+            start_gate.wait()
+            started = time.perf_counter()
+            try:
+                appointment = AppointmentService.book_appointment(patient_id, slot_id)
+                with lock:
+                    booked.append(appointment["appointment_id"])
+            except ValueError:
+                with lock:
+                    rejected += 1
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+            finally:
+                with lock:
+                    latencies.append(time.perf_counter() - started)
+                connection.close()
+
+        started = time.perf_counter()
+        for slot_id in slot_ids:
+            gate = threading.Barrier(len(patients))
+            threads = [
+                threading.Thread(target=attempt, args=(p, slot_id, gate))
+                for p in patients
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        elapsed = time.perf_counter() - started
+
+        doubles = fetchall(
+            """
+            SELECT slot_id, COUNT(*) AS live
+            FROM doctor_appointments
+            WHERE slot_id = ANY(%s) AND status <> 'cancelled'
+            GROUP BY slot_id
+            HAVING COUNT(*) > 1
+            """,
+            [slot_ids],
+        )
+
+        attempts = len(latencies)
+        latencies.sort()
+        self.stdout.write(
+            f"attempts {attempts}  booked {len(booked)}  rejected {rejected}  "
+            f"errors {len(errors)}"
+        )
+        self.stdout.write(
+            f"throughput {attempts / elapsed:.1f} attempts/s  "
+            f"p50 {latencies[attempts // 2] * 1000:.1f} ms  "
+            f"p99 {latencies[min(attempts - 1, int(attempts * 0.99))] * 1000:.1f} ms"
+        )
+        for error in errors[:5]:
+            self.stdout.write(f"  error: {error}")
+
+        if not options["keep"] and booked:
+            execute(
+                "DELETE FROM doctor_appointments WHERE appointment_id = ANY(%s)",
+                [booked],
+            )
+            execute(
+                "UPDATE appointment_slots SET is_booked = FALSE WHERE slot_id = ANY(%s)",
+                [slot_ids],
+            )
+
+        if doubles or len(booked) != len(slot_ids):
+            raise CommandError(
+                f"Double booking detected: {doubles}"
+                if doubles
+                else f"Expected {len(slot_ids)} bookings, got {len(booked)}."
+            )
+        self.stdout.write(self.style.SUCCESS("no double bookings"))
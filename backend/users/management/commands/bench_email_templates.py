@@ -0,0 +1,44 @@
+# backend\users\management\commands\bench_email_templates.py
+import time
+from datetime import date, time as dt_time
+
+from django.core.management.base import BaseCommand
+
+from users.services import email_templates
+
+
+def _contexts(name, n):
+    if name == "verification":
+        return [
+            {"verify_link": f"http://localhost:3000/verify-email?token=tok{i:08d}"}
+            for i in range(n)
+        ]
+    if name == "appointment_confirmation":
+        return [
+            {
+                "doctor_name": f"Dr. Doctor {i % 40}",
+                "slot_date": date(2026, 1, 1 + i % 28),
+                "start_time": dt_time(9, 30),
+                "end_time": dt_time(10, 0),
+            }
+            for i in range(n)
+        ]
+    return [{"date": date(2026, 1, 1 + i % 28)} for i in range(n)]
+
+
+class Command(BaseCommand):
+    help = "Benchmark bulk rendering of email templates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=10000)
+        parser.add_argument("--locale", default=None)
+
+    def handle(self, *args, **options):
+        n = options["messages"]
+        for name in ("verification", "appointment_confirmation", "lab_booking_cancellation"):
+            contexts = _contexts(name, n)
+            email_templates.render_many(name, contexts[:10], options["locale"])
+            started = time.perf_counter()
+            email_templates.render_many(name, contexts, options["locale"])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"{name:<26} {n / elapsed:>12.0f} msg/s")
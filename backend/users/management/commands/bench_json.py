@@ -0,0 +1,166 @@
+# backend\users\management\commands\bench_json.py
+import json
+import time
+import uuid
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from users.renderers import FastJSONRenderer
+from users.services import json_codec
+from users.services.audit_logs import generate_diff
+
+
+def _doctor_rows(n):
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "doctor_id": uuid.uuid4(),
+            "full_name": f"Dr. Doctor {i}",
+            "email": f"doctor{i}@example.com",
+            "phone_number": "9876543210",
+            "consultation_fee": Decimal("500.00"),
+            "experience_years": Decimal("7.50"),
+            "registration_number": f"REG-{i:06d}",
+            "is_active": True,
+            "verification_status": "VERIFIED",
+            "verified_at": now,
+            "verification_notes": None,
+            "created_at": now,
+            "updated_at": now,
+            "gender": "Male",
+            "verified_by": uuid.uuid4(),
+            "specializations": [
+                {
+                    "id": i,
+                    "specialization_id": 3,
+                    "specialization_name": "Cardiology",
+                    "description": "Heart and blood vessels",
+                    "spec_is_active": True,
+                    "is_primary": True,
+                    "years_in_specialty": 5,
+                    "created_at": now,
+                }
+            ],
+        }
+        for i in range(n)
+    ]
+
+
+def _appointment_rows(n):
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "appointment_id": i,
+            "doctor_id": uuid.uuid4(),
+            "doctor_name": f"Dr. Doctor {i % 40}",
+            "patient_id": uuid.uuid4(),
+            "patient_email": f"patient{i}@example.com",
+            "slot_id": i,
+            "slot_date": date.today() + timedelta(days=i % 30),
+            "start_time": dt_time(9, 30),
+            "end_time": dt_time(10, 0),
+            "appointment_type": "in_person",
+            "status": "confirmed",
+            "reason": "Follow-up visit",
+            "cancellation_reason": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(n)
+    ]
+
+
+def _booking_rows(n):
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "booking_id": uuid.uuid4(),
+            "patient_id": uuid.uuid4(),
+            "lab_id": uuid.uuid4(),
+            "slot_id": i,
+            "test_id": i % 50,
+            "collection_type": "home",
+            "collection_address": {"address_line1": "12 MG Road", "city": "Pune"},
+            "booking_status": "BOOKED",
+            "subtotal": Decimal("850.00"),
+            "home_collection_charge": Decimal("50.00"),
+            "discount_amount": Decimal("0.00"),
+            "total_amount": Decimal("900.00"),
+            "notes": None,
+            "cancelled_at": None,
+            "cancellation_reason": None,
+            "cancelled_by": None,
+            "created_at": now,
+            "updated_at": now,
+            "test_name": "Complete Blood Count",
+            "test_code": "CBC",
+            "sample_type": "Blood",
+            "fasting_required": False,
+            "slot_date": date.today(),
+            "start_time": dt_time(8, 0),
+            "end_time": dt_time(9, 0),
+            "lab_name": "City Diagnostics",
+        }
+        for i in range(n)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Benchmark JSON encoding of list responses and audit payloads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=200)
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        iterations = options["iterations"]
+        self.stdout.write(f"codec backend: {json_codec.BACKEND}")
+
+        stock = JSONRenderer()
+        fast = FastJSONRenderer()
+        shapes = {
+            "doctors": _doctor_rows(rows),
+            "appointments": _appointment_rows(rows),
+            "lab_bookings": _booking_rows(rows),
+        }
+
+        for name, data in shapes.items():
+            body = {"success": True, "message": "Success", "data": data}
+            stock_rate = self._rate(lambda: stock.render(body), iterations)
+            fast_rate = self._rate(lambda: fast.render(body), iterations)
+            self._report(name, stock_rate, fast_rate)
+
+        old, new = _booking_rows(1)[0], _booking_rows(1)[0]
+        old_diff, new_diff = generate_diff(old, new)
+        audit_iterations = iterations * 50
+
+        def stdlib_audit():
+            json.dumps(old_diff, default=str)
+            json.dumps(new_diff, default=str)
+
+        def codec_audit():
+            json_codec.dumps(old_diff)
+            json_codec.dumps(new_diff)
+
+        self._report(
+            "audit_payload",
+            self._rate(stdlib_audit, audit_iterations),
+            self._rate(codec_audit, audit_iterations),
+        )
+
+    def _rate(self, fn, iterations):
+        fn()
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return iterations / (time.perf_counter() - started)
+
+    def _report(self, name, stock_rate, fast_rate):
+        self.stdout.write(
+            f"{name:<14} stdlib {stock_rate:>10.1f}/s   "
+            f"codec {fast_rate:>10.1f}/s   x{fast_rate / stock_rate:.2f}"
+        )
@@ -0,0 +1,128 @@
+# backend\users\management\commands\bench_lab_capacity.py
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from users.database_queries.connection import execute, fetchall, fetchone
+from users.middleware.exceptions import ConflictException
+from users.services.lab_booking_service import LabBookingService
+
+
+class Command(BaseCommand):
+    help = (
+        "Race N patients for one lab slot and check that the slot never ends up "
+        "with more bookings than its capacity. Runs against the configured "
+        "database; bench bookings are removed afterwards unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("slot_id", type=int)
+        parser.add_argument("--patients", type=int, default=32)
+        parser.add_argument("--attempts", type=int, default=1)
+        parser.add_argument("--keep", action="store_true")
+
+    def handle(self, *args, **options):
+        slot_id = options["slot_id"]
+        slot = fetchone("SELECT * FROM lab_test_slots WHERE slot_id=%s", [slot_id])
+        if not slot:
+            raise CommandError(f"Slot {slot_id} not found.")
+
+        test = fetchone(
+            "SELECT test_id FROM lab_tests WHERE is_active=TRUE ORDER BY test_id LIMIT 1"
+        )
+        patients = [
+            str(r["patient_id"])
+            for r in fetchall(
+                "SELECT patient_id FROM patients ORDER BY patient_id LIMIT %s",
+                [options["patients"]],
+            )
+        ]
+        if not test or not patients:
+            raise CommandError("Need an active lab test and at least one patient.")
+
+        free = slot["capacity"] - slot["booked_count"]
+        self.stdout.write(
+            f"{len(patients)} patients x {options['attempts']} attempts for "
+            f"{free} free places (capacity {slot['capacity']})"
+        )
+
+        payload = {
+            "slot_id": slot_id,
+            "lab_id": slot["lab_id"],
+            "test_id": test["test_id"],
+            "collection_type": "lab_visit",
+        }
+        booked, rejected, errors = [], 0, []
+        lock = threading.Lock()
+        gate = threading.Barrier(len(patients))
+
+        def attempt(patient_id):
+            nonlocal rejected
+            gate.wait()
+            try:
+                for _ in range(options["attempts"]):
+                    try:
+                        booking = LabBookingService.create_booking(patient_id, payload)
+                        with lock:
+                            booked.append(str(booking["booking_id"]))
+                    except ConflictException:
+                        with lock:
+                            rejected += 1
+                    except Exception as e:
+                        with lock:
+                            errors.append(repr(e))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=attempt, args=(p,)) for p in patients]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        after = fetchone(
+            """
+            SELECT s.booked_count, s.capacity,
+                   (SELECT COUNT(*) FROM lab_test_slot_bookings b
+                    WHERE b.slot_id = s.slot_id AND b.booking_id = ANY(%s::uuid[])) AS bench
+            FROM lab_test_slots s
+            WHERE s.slot_id = %s
+            """,
+            [booked, slot_id],
+        )
+
+        attempts = len(patients) * options["attempts"]
+        self.stdout.write(
+            f"attempts {attempts}  booked {len(booked)}  rejected {rejected}  "
+            f"errors {len(errors)}"
+        )
+        self.stdout.write(
+            f"throughput {attempts / elapsed:.1f} attempts/s  "
+            f"booked_count {after['booked_count']}/{after['capacity']}"
+        )
+        for error in errors[:5]:
+            self.stdout.write(f"  error: {error}")
+
+        if not options["keep"] and booked:
+            execute(
+                "DELETE FROM lab_test_slot_bookings WHERE booking_id = ANY(%s::uuid[])",
+                [booked],
+            )
+            execute(
+                "UPDATE lab_test_slots SET booked_count = GREATEST(booked_count - %s, 0) "
+                "WHERE slot_id = %s",
+                [len(booked), slot_id],
+            )
+
+        if after["booked_count"] > after["capacity"]:
+            raise CommandError("Slot overbooked.")
+        if after["bench"] != len(booked) or len(booked) > max(free, 0):
+            raise CommandError(
+                f"Expected at most {free} bookings, got {len(booked)} "
+                f"({after['bench']} rows)."
+            )
+        self.stdout.write(self.style.SUCCESS("capacity held"))
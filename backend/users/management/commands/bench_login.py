@@ -0,0 +1,105 @@
+# backend\users\management\commands\bench_login.py
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import users.database_queries.user_queries as uq
+from users.middleware.exceptions import PermissionException
+from users.services import AuthService, password_service
+
+
+def _legacy_login(email: str, password: str):
+    # The login sequence as it was before auth_get_login_context /
+    # auth_record_login, kept here only for comparison.
+    user = uq.get_user_by_email(email)
+    if not user:
+        raise PermissionException("Invalid credentials.")
+    is_locked, lock_msg = AuthService.check_account_lockout(user)
+    if is_locked:
+        raise PermissionException(lock_msg)
+    is_active, active_msg = AuthService.check_account_status(user)
+    if not is_active:
+        raise PermissionException(active_msg)
+    if not password_service.verify_password(password, user.get("password", "")):
+        _, msg = AuthService.handle_failed_login(user)
+        raise PermissionException(msg)
+    AuthService.handle_successful_login(user["user_id"])
+    user = uq.get_user_by_id(user["user_id"])
+    return user, uq.get_user_permission_by_id(user["role_id"])
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Log one existing account in N times from T threads through the old and "
+        "the new login path and report queries per login, p50/p99 latency and "
+        "logins per second. Every run writes real audit rows and resets the "
+        "account's failed-attempt counter."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("email")
+        parser.add_argument("password")
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--threads", type=int, default=8)
+
+    def handle(self, *args, **options):
+        email, password = options["email"], options["password"]
+        try:
+            AuthService.login(email, password)
+        except PermissionException as e:
+            raise CommandError(f"Login failed: {e.message}")
+
+        for name, login in (("before", _legacy_login), ("after", AuthService.login)):
+            with CaptureQueriesContext(connection) as ctx:
+                login(email, password)
+            latencies, elapsed = self._run(login, email, password, options)
+            self.stdout.write(
+                f"{name:<6} queries/login {len(ctx.captured_queries)}  "
+                f"p50 {statistics.median(latencies) * 1000:.1f} ms  "
+                f"p99 {_percentile(latencies, 99) * 1000:.1f} ms  "
+                f"{len(latencies) / elapsed:.1f} logins/s"
+            )
+
+    def _run(self, login, email, password, options):
+        per_thread = max(1, options["requests"] // options["threads"])
+        latencies, errors = [], []
+        lock = threading.Lock()
+        gate = threading.Barrier(options["threads"])
+
+        def worker():
+            gate.wait()
+            try:
+                for _ in range(per_thread):
+                    started = time.perf_counter()
+                    try:
+                        login(email, password)
+                    except Exception as e:
+                        with lock:
+                            errors.append(repr(e))
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        if errors:
+            raise CommandError(f"{len(errors)} logins failed: {errors[:3]}")
+        return latencies, elapsed
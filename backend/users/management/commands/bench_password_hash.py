@@ -0,0 +1,63 @@
+# backend\users\management\commands\bench_password_hash.py
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from users.services import password_service
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure bcrypt throughput at one or more costs: a single inline thread "
+        "against the password_service pool, reported as hashes per second and "
+        "hashes per second per core. No database access."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rounds", type=int, nargs="+", default=[10, 12])
+        parser.add_argument("--hashes", type=int, default=64)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        n = options["hashes"]
+        self.stdout.write(f"{n} verifications per run, pool of {workers} worker(s)")
+
+        for rounds in options["rounds"]:
+            hashed = bcrypt.hashpw(b"bench-password", bcrypt.gensalt(rounds)).decode()
+
+            started = time.perf_counter()
+            for _ in range(n):
+                bcrypt.checkpw(b"bench-password", hashed.encode())
+            inline = n / (time.perf_counter() - started)
+
+            with override_settings(
+                PASSWORD_HASH_WORKERS=workers, PASSWORD_HASH_MAX_QUEUE=n
+            ):
+                password_service._pool = None
+                # One caller thread per verification stands in for request
+                # workers; the hashing itself runs on the service pool.
+                with ThreadPoolExecutor(max_workers=n) as callers:
+                    started = time.perf_counter()
+                    results = list(
+                        callers.map(
+                            lambda _: password_service.verify_password(
+                                "bench-password", hashed
+                            ),
+                            range(n),
+                        )
+                    )
+                    pooled = n / (time.perf_counter() - started)
+                password_service._pool.shutdown()
+                password_service._pool = None
+                if not all(results):
+                    raise CommandError("Pool verification returned False.")
+
+            self.stdout.write(
+                f"cost {rounds:>2}  inline {inline:7.1f}/s  "
+                f"pool {pooled:7.1f}/s  per core {pooled / workers:7.1f}/s"
+            )
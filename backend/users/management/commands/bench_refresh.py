@@ -0,0 +1,86 @@
+# backend\users\management\commands\bench_refresh.py
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import users.database_queries.doctor_queries as dq
+import users.database_queries.lab_queries as lq
+import users.database_queries.patient_queries as pq
+import users.database_queries.user_queries as uq
+from users.helpers import profile_helpers
+from users.jwt_auth import UserWrapper, generate_tokens, rotate_refresh_token
+from users.models import UserRole
+
+
+def _legacy_refresh(user_id: str):
+    # The refresh response as it was built before the profile bundles and
+    # cache, kept here only for comparison.
+    user = uq.get_user_by_id(user_id)
+    role = user["role"]
+    if role == UserRole.DOCTOR:
+        doctor = dq.get_doctor_by_user_id(user_id)
+        doctor["qualifications"] = dq.get_doctor_qualifications(user_id)
+        doctor["specializations"] = dq.get_doctor_specializations(user_id)
+        schedule = dq.get_schedule_by_doctor(user_id)
+        if schedule:
+            schedule["working_days"] = dq.get_working_days(schedule["schedule_id"])
+        return doctor
+    if role == UserRole.LAB:
+        lab = lq.get_lab_by_user_id(user_id)
+        lab["operating_hours"] = lq.get_lab_operating_hours(user_id)
+        return lab
+    if role == UserRole.PATIENT:
+        return pq.get_patient_by_id(user_id)
+    return uq.get_user_by_id(user_id)
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh one account's tokens N times through the old and the new "
+        "path and report queries per refresh and p50 latency. Each new-path "
+        "refresh consumes a real refresh token."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("email")
+        parser.add_argument("--requests", type=int, default=200)
+
+    def handle(self, *args, **options):
+        user = uq.get_user_by_email(options["email"])
+        if not user:
+            raise CommandError("No such user.")
+        user_id = str(user["user_id"])
+        n = options["requests"]
+        refresh_token = generate_tokens(user)["refresh_token"]
+
+        def new_refresh(cold: bool):
+            nonlocal refresh_token
+            if cold:
+                profile_helpers.invalidate_profile(user_id)
+            user_dict, _, refresh_token = rotate_refresh_token(refresh_token)
+            profile_helpers.get_profile_data_by_role(
+                UserWrapper(user_dict), version=user_dict.pop("profile_version", None)
+            )
+
+        runs = (
+            ("before", lambda: _legacy_refresh(user_id)),
+            ("after, cold", lambda: new_refresh(True)),
+            ("after, warm", lambda: new_refresh(False)),
+        )
+        self.stdout.write(f"role {user['role']}, {n} refreshes per run")
+        for name, refresh in runs:
+            refresh()
+            with CaptureQueriesContext(connection) as ctx:
+                refresh()
+            latencies = []
+            for _ in range(n):
+                started = time.perf_counter()
+                refresh()
+                latencies.append(time.perf_counter() - started)
+            self.stdout.write(
+                f"{name:<12} queries/refresh {len(ctx.captured_queries)}  "
+                f"p50 {statistics.median(latencies) * 1000:.2f} ms"
+            )
@@ -0,0 +1,150 @@
+# backend\users\management\commands\bench_waitlist_backfill.py
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+import users.database_queries.doctor_queries as dq
+import users.database_queries.waitlist_queries as wq
+from users.database_queries.connection import execute, fetchall
+from users.services.appointment_service import AppointmentService
+
+
+class Command(BaseCommand):
+    help = (
+        "Book K free slots of one doctor, put K + extra patients on that doctor's "
+        "waitlist, then cancel all K appointments at once. Checks that every freed "
+        "slot is offered to a different patient, oldest entries first. Runs "
+        "against the configured database; bench rows are removed afterwards "
+        "unless --keep is given. Emails go to the in-memory backend."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("doctor_id")
+        parser.add_argument("--slots", type=int, default=10)
+        parser.add_argument("--extra", type=int, default=3)
+        parser.add_argument("--keep", action="store_true")
+
+    @override_settings(
+        EMAIL_OUTBOX_ENABLED=False,
+        EMAIL_BACKEND="django.core.mail.backends.locmem.EmailBackend",
+    )
+    def handle(self, *args, **options):
+        schedule = dq.get_schedule_by_doctor(options["doctor_id"])
+        if not schedule:
+            raise CommandError("Doctor has no schedule.")
+
+        today = timezone.localdate()
+        slots = dq.get_available_slots(schedule["schedule_id"], today)[: options["slots"]]
+        n_slots = len(slots)
+        patients = [
+            str(r["patient_id"])
+            for r in fetchall(
+                "SELECT patient_id FROM patients ORDER BY patient_id LIMIT %s",
+                [2 * n_slots + options["extra"]],
+            )
+        ]
+        if not n_slots or len(patients) < 2 * n_slots + options["extra"]:
+            raise CommandError(
+                f"Need at least one free slot and {2 * n_slots + options['extra']} patients."
+            )
+
+        bookers, waiters = patients[:n_slots], patients[n_slots:]
+        appointments = [
+            AppointmentService.book_appointment(patient, slot["slot_id"])
+            for patient, slot in zip(bookers, slots)
+        ]
+
+        last_date = max(s["slot_date"] for s in slots)
+        entries = []
+        for patient in waiters:
+            entry = wq.join_waitlist(
+                "DOCTOR", options["doctor_id"], patient, today, last_date, {}, None
+            )
+            if not entry:
+                raise CommandError(f"Patient {patient} is already on this waitlist.")
+            entries.append(entry)
+
+        self.stdout.write(
+            f"cancelling {n_slots} appointments with {len(entries)} patients waiting"
+        )
+
+        errors = []
+        lock = threading.Lock()
+        gate = threading.Barrier(n_slots)
+
+        def cancel(appointment):
+            gate.wait()
+            try:
+                AppointmentService.cancel_appointment(
+                    appointment["appointment_id"], str(appointment["patient_id"])
+                )
+            except Exception as e:
+                with lock:
+                    errors.append(repr(e))
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=cancel, args=(a,)) for a in appointments]
+        started = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+
+        entry_ids = [str(e["entry_id"]) for e in entries]
+        rows = fetchall(
+            """
+            SELECT w.entry_id, w.patient_id, w.status, w.offered_slot_id,
+                   h.slot_id AS hold_slot_id, h.patient_id AS hold_patient_id
+            FROM waitlist_entries w
+            LEFT JOIN slot_holds h ON h.hold_id = w.hold_id
+            WHERE w.entry_id = ANY(%s::uuid[])
+            ORDER BY w.created_at
+            """,
+            [entry_ids],
+        )
+        offered = [r for r in rows if r["status"] == "OFFERED"]
+        problems = []
+        if errors:
+            problems.append(f"{len(errors)} cancellations failed: {errors[:3]}")
+        if len(offered) != n_slots:
+            problems.append(f"expected {n_slots} offers, got {len(offered)}")
+        if len({r["offered_slot_id"] for r in offered}) != len(offered):
+            problems.append("a slot was offered twice")
+        if any(
+            r["hold_slot_id"] != r["offered_slot_id"]
+            or r["hold_patient_id"] != r["patient_id"]
+            for r in offered
+        ):
+            problems.append("an offer has no matching hold")
+        if [r["status"] for r in rows[: len(offered)]] != ["OFFERED"] * len(offered):
+            problems.append("offers did not go to the oldest entries first")
+
+        self.stdout.write(
+            f"{n_slots} cancellations + backfill in {elapsed * 1000:.1f} ms  "
+            f"offered {len(offered)}  still waiting {len(rows) - len(offered)}"
+        )
+
+        if not options["keep"]:
+            execute(
+                "DELETE FROM slot_holds WHERE hold_id IN "
+                "(SELECT hold_id FROM waitlist_entries WHERE entry_id = ANY(%s::uuid[]))",
+                [entry_ids],
+            )
+            execute(
+                "DELETE FROM waitlist_entries WHERE entry_id = ANY(%s::uuid[])",
+                [entry_ids],
+            )
+            execute(
+                "DELETE FROM doctor_appointments WHERE appointment_id = ANY(%s)",
+                [[a["appointment_id"] for a in appointments]],
+            )
+
+        if problems:
+            raise CommandError("; ".join(problems))
+        self.stdout.write(self.style.SUCCESS("every freed slot went to a different patient"))
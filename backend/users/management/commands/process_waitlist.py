@@ -0,0 +1,32 @@
+# backend\users\management\commands\process_waitlist.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.services.waitlist_service import WaitlistService
+
+
+class Command(BaseCommand):
+    help = (
+        "Lapse waitlist offers whose hold ran out and offer those slots to the "
+        "next patient in line."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--interval", type=float, default=60.0)
+        parser.add_argument(
+            "--once", action="store_true", help="Run a single pass and exit."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                result = WaitlistService.process_expired()
+                self.stdout.write(
+                    f"lapsed {result['lapsed']}  reoffered {result['reoffered']}"
+                )
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("waitlist processor stopped")
@@ -0,0 +1,18 @@
+# backend\users\management\commands\purge_rate_limit_buckets.py
+from django.core.management.base import BaseCommand
+
+from users.database_queries import rate_limit_queries as rlq
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete shared rate-limit buckets idle long enough to have refilled. "
+        "Only needed with RATE_LIMIT_BACKEND = 'postgres'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--idle-seconds", type=int, default=3600)
+
+    def handle(self, *args, **options):
+        purged = rlq.purge_buckets(options["idle_seconds"])
+        self.stdout.write(f"purged {purged} bucket(s)")
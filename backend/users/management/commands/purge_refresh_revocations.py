@@ -0,0 +1,15 @@
+# backend\users\management\commands\purge_refresh_revocations.py
+from django.core.management.base import BaseCommand
+
+import users.database_queries.user_queries as uq
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete consumed refresh-token jtis and revoked token families whose "
+        "tokens can no longer be presented because they have expired."
+    )
+
+    def handle(self, *args, **options):
+        purged = uq.purge_refresh_revocations()
+        self.stdout.write(f"purged {purged} revocation row(s)")
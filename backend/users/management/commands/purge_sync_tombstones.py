@@ -0,0 +1,15 @@
+# backend\users\management\commands\purge_sync_tombstones.py
+from django.core.management.base import BaseCommand
+
+from users.services.sync_service import SyncService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete delta-sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS. "
+        "Clients holding an older token get a full list with reset=true."
+    )
+
+    def handle(self, *args, **options):
+        purged = SyncService.purge_tombstones()
+        self.stdout.write(f"purged {purged} tombstone(s)")
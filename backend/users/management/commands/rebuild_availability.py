@@ -0,0 +1,17 @@
+# backend\users\management\commands\rebuild_availability.py
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+import users.database_queries.availability_queries as aq
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the per-day doctor/lab availability summary from the slot "
+        "tables. Triggers keep it current afterwards; run this once after "
+        "installing the triggers or to repair drift."
+    )
+
+    def handle(self, *args, **options):
+        rows = aq.rebuild_availability(timezone.localdate())
+        self.stdout.write(self.style.SUCCESS(f"summarised {rows} doctor/lab days"))
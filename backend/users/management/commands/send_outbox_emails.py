@@ -0,0 +1,43 @@
+# backend\users\management\commands\send_outbox_emails.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.services import email_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from email_outbox over a reused mail connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=int(getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 50)),
+        )
+        parser.add_argument("--interval", type=float, default=5.0)
+        parser.add_argument("--worker-id", default=None)
+        parser.add_argument(
+            "--once", action="store_true", help="Drain the outbox once and exit."
+        )
+
+    def handle(self, *args, **options):
+        worker_id = options["worker_id"] or email_outbox.default_worker_id()
+        batch_size = options["batch_size"]
+        self.stdout.write(f"outbox worker {worker_id} (batch {batch_size})")
+
+        try:
+            while True:
+                result = email_outbox.deliver_batch(worker_id, batch_size)
+                if result["claimed"]:
+                    self.stdout.write(
+                        f"claimed {result['claimed']}  sent {result['sent']}  "
+                        f"retry {result['retry']}  failed {result['failed']}"
+                    )
+                if result["claimed"] < batch_size:
+                    if options["once"]:
+                        break
+                    time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("outbox worker stopped")
@@ -0,0 +1,31 @@
+# backend\users\management\commands\send_reminders.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.services.reminder_service import ReminderService
+
+
+class Command(BaseCommand):
+    help = "Queue appointment and follow-up reminder emails due in the next N hours."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lead-hours", type=int, default=None)
+        parser.add_argument("--interval", type=float, default=300.0)
+        parser.add_argument(
+            "--once", action="store_true", help="Run a single pass and exit."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                result = ReminderService.send_all(options["lead_hours"])
+                self.stdout.write(
+                    f"appointments {result['appointments']}  "
+                    f"follow_ups {result['follow_ups']}"
+                )
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("reminder scheduler stopped")
@@ -5,6 +5,7 @@ from users.services.audit_logs import (
     reset_audit_flag,
     was_audit_logged,
 )
+from users.helpers.request_helpers import get_client_ip
 
 class AuditMiddleware:
     def __init__(self, get_response):
@@ -21,8 +22,7 @@ class AuditMiddleware:
         return response
 
     def _get_ip(self, request):
-        xff = request.META.get("HTTP_X_FORWARDED_FOR")
-        return xff.split(",")[0].strip() if xff else request.META.get("REMOTE_ADDR")
+        return get_client_ip(request)
 
     def _log_mutation_audit(self, request, response):
         if request.method not in ("POST", "PUT", "PATCH", "DELETE"):
@@ -1,5 +1,7 @@
 # backend\users\middleware\exceptions.py
 
+import math
+
 from rest_framework import status
 
 
@@ -51,6 +53,10 @@ class RateLimitException(AppException):
     status_code = status.HTTP_429_TOO_MANY_REQUESTS
     default_message = "Too many requests. Please try again later."
 
+    def __init__(self, message=None, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
 
 class ServiceUnavailableException(AppException):
     status_code = status.HTTP_503_SERVICE_UNAVAILABLE
@@ -68,13 +74,13 @@ def custom_exception_handler(exc, context):
         log_error_to_db(
             request, description=f"{type(exc).__name__}: {exc.message}", exception=exc
         )
-        print(f"\n\nHandle in custom_exception_handler.")
-        print(f"{type(exc).__name__}: {exc.message}")
-        print(exc)
-        return Response(
+        response = Response(
             {"success": False, "message": exc.message},
             status=exc.status_code,
         )
+        if getattr(exc, "retry_after", None):
+            response["Retry-After"] = str(math.ceil(exc.retry_after))
+        return response
 
     response = drf_exception_handler(exc, context)
     if response is not None:
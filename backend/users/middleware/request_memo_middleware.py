@@ -0,0 +1,18 @@
+# backend\users\middleware\request_memo_middleware.py
+from users.database_queries import request_memo
+
+
+class RequestMemoMiddleware:
+    """Opens the per-request query memo and records its hits against the
+    resolved view name when the response is done."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_memo.begin()
+        try:
+            return self.get_response(request)
+        finally:
+            match = getattr(request, "resolver_match", None)
+            request_memo.end(match.view_name if match else None)
@@ -1,6 +1,7 @@
-from .role_permissions import IsAdminOrStaff, IsSuperAdmin
+from .role_permissions import IsAdminOrStaff, IsSuperAdmin, HasModulePermission
 
 __all__ = [
     "IsAdminOrStaff",
     "IsSuperAdmin",
+    "HasModulePermission",
 ]
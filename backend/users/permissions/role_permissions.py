@@ -1,5 +1,6 @@
 from rest_framework.permissions import BasePermission
 from users.models import UserRole
+from users.services import permission_matrix
 
 
 class IsAdminOrStaff(BasePermission):
@@ -20,3 +21,29 @@ class IsSuperAdmin(BasePermission):
         if not user or not getattr(user, "is_authenticated", False):
             return False
         return getattr(user, "role", None) == UserRole.SUPERADMIN
+
+
+class HasModulePermission(BasePermission):
+    """Checks the view's ``required_permission`` against the cached role
+    matrix, without a database call.
+
+    ``required_permission`` is a "module:action" string, or a dict mapping
+    HTTP methods to one; methods missing from the dict are refused, apart
+    from OPTIONS.
+    """
+
+    message = "You do not have permission to perform this action."
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or not getattr(user, "is_authenticated", False):
+            return False
+
+        required = getattr(view, "required_permission", None)
+        if isinstance(required, dict):
+            if request.method not in required:
+                return request.method == "OPTIONS"
+            required = required[request.method]
+        if not required:
+            return True
+        return permission_matrix.has_permission(getattr(user, "role", None), required)
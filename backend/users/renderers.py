@@ -0,0 +1,40 @@
+# backend\users\renderers.py
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder as DRFJSONEncoder
+
+from users.services import json_codec
+
+_drf_encoder = DRFJSONEncoder()
+_LINE_SEPARATOR = "\u2028".encode()
+_PARAGRAPH_SEPARATOR = "\u2029".encode()
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes through ``json_codec`` (orjson when installed).
+
+    Output is byte-for-byte what the stock renderer produces: non-native
+    types, datetimes included, go through DRF's encoder first. Falls back to
+    the stock DRF renderer for indented output (browsable API, ``?indent=``)
+    and for anything the codec cannot encode.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = json_codec.dumps_bytes(data, default=_drf_encoder.default)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # The stock renderer escapes these for JavaScript embedding.
+        if _LINE_SEPARATOR in ret or _PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(_LINE_SEPARATOR, b"\\u2028").replace(
+                _PARAGRAPH_SEPARATOR, b"\\u2029"
+            )
+        return ret
@@ -49,6 +49,54 @@ class WorkingDaySerializer(serializers.Serializer):
         return attrs
 
 
+class ScheduleExceptionWriteSerializer(serializers.Serializer):
+    doctor_id = serializers.UUIDField(required=False, allow_null=True)
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    start_time = serializers.TimeField(required=False, allow_null=True)
+    end_time = serializers.TimeField(required=False, allow_null=True)
+    reason = serializers.CharField(
+        required=False, allow_blank=True, allow_null=True, max_length=500
+    )
+
+    def validate(self, attrs):
+        if attrs["start_date"] > attrs["end_date"]:
+            raise serializers.ValidationError("start_date must not be after end_date.")
+        start_time = attrs.get("start_time")
+        end_time = attrs.get("end_time")
+        if (start_time is None) != (end_time is None):
+            raise serializers.ValidationError(
+                "Give both start_time and end_time for partial-day leave, or neither."
+            )
+        if start_time and start_time >= end_time:
+            raise serializers.ValidationError("start_time must be before end_time.")
+        return attrs
+
+
+class ScheduleConflictSerializer(serializers.Serializer):
+    appointment_id = serializers.IntegerField()
+    doctor_id = serializers.UUIDField()
+    doctor_name = serializers.CharField()
+    patient_id = serializers.UUIDField()
+    patient_name = serializers.CharField()
+    patient_email = serializers.EmailField()
+    slot_id = serializers.IntegerField()
+    slot_date = serializers.DateField()
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+
+
+class ScheduleExceptionSerializer(serializers.Serializer):
+    exception_id = serializers.IntegerField()
+    doctor_id = serializers.UUIDField(allow_null=True)
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    start_time = serializers.TimeField(allow_null=True)
+    end_time = serializers.TimeField(allow_null=True)
+    reason = serializers.CharField(allow_null=True)
+    created_at = serializers.DateTimeField()
+
+
 class DoctorScheduleSerializer(serializers.Serializer):
     schedule_id = serializers.IntegerField(read_only=True)
     consultation_duration_min = serializers.IntegerField()
@@ -325,6 +373,10 @@ class BookAppointmentSerializer(serializers.Serializer):
         return value
 
 
+class RescheduleAppointmentSerializer(serializers.Serializer):
+    slot_id = serializers.IntegerField()
+
+
 class DoctorAppointmentSerializer(serializers.Serializer):
     appointment_id = serializers.IntegerField()
     doctor_id = serializers.UUIDField()
@@ -343,6 +395,34 @@ class DoctorAppointmentSerializer(serializers.Serializer):
     updated_at = serializers.DateTimeField()
 
 
+class AgendaQuerySerializer(serializers.Serializer):
+    view = serializers.ChoiceField(choices=["day", "week"], default="day")
+    date = serializers.DateField(required=False)
+    doctor_id = serializers.UUIDField(required=False)
+    cursor = serializers.CharField(required=False, allow_blank=False)
+    limit = serializers.IntegerField(min_value=1, max_value=200, default=50)
+    include_cancelled = serializers.BooleanField(default=False)
+
+
+class AgendaAppointmentSerializer(serializers.Serializer):
+    appointment_id = serializers.IntegerField()
+    slot_id = serializers.IntegerField()
+    slot_date = serializers.DateField()
+    start_time = serializers.TimeField()
+    end_time = serializers.TimeField()
+    appointment_type = serializers.CharField()
+    status = serializers.CharField()
+    reason = serializers.CharField(allow_null=True)
+    patient_id = serializers.UUIDField()
+    patient_name = serializers.CharField(allow_null=True)
+    patient_age = serializers.IntegerField(allow_null=True)
+    patient_mobile = serializers.CharField(allow_null=True)
+    last_visit_date = serializers.DateField(allow_null=True)
+    prescription_id = serializers.UUIDField(allow_null=True)
+    has_prescription = serializers.BooleanField()
+    updated_at = serializers.DateTimeField()
+
+
 class DoctorListSerializer(serializers.Serializer):
     doctor_id = serializers.UUIDField()
     full_name = serializers.CharField()
@@ -364,3 +444,11 @@ class DoctorListSerializer(serializers.Serializer):
     verified_by_email = serializers.EmailField(
         required=False, allow_blank=True, allow_null=True
     )
+    next_slot_id = serializers.IntegerField(required=False, allow_null=True)
+    next_slot_date = serializers.DateField(required=False, allow_null=True)
+    next_start_time = serializers.TimeField(required=False, allow_null=True)
+    free_today = serializers.IntegerField(required=False, default=0)
+    free_next_7_days = serializers.IntegerField(required=False, default=0)
+    specializations = serializers.ListField(
+        child=serializers.DictField(), required=False, default=list
+    )
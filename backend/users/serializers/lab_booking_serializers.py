@@ -54,6 +54,10 @@ class CancelBookingSerializer(serializers.Serializer):
     )
 
 
+class RescheduleBookingSerializer(serializers.Serializer):
+    slot_id = serializers.IntegerField()
+
+
 class CompleteBookingSerializer(serializers.Serializer):
     report_file = serializers.FileField(required=False, allow_null=True)
     report_type = serializers.ChoiceField(
@@ -145,4 +149,9 @@ class LabSlotSerializer(serializers.Serializer):
     start_time = serializers.TimeField(read_only=True)
     end_time = serializers.TimeField(read_only=True)
     booked_count = serializers.IntegerField(read_only=True)
+    capacity = serializers.IntegerField(read_only=True)
     is_active = serializers.BooleanField(read_only=True)
+
+
+class SlotCapacitySerializer(serializers.Serializer):
+    capacity = serializers.IntegerField(min_value=1, max_value=500)
@@ -138,6 +138,22 @@ class LabListSerializer(serializers.Serializer):
     updated_at = serializers.DateTimeField(allow_null=True)
 
 
+class LabDirectorySerializer(serializers.Serializer):
+    lab_id = serializers.UUIDField()
+    lab_name = serializers.CharField()
+    phone_number = serializers.CharField(allow_null=True)
+    lab_logo = serializers.CharField(allow_null=True, allow_blank=True)
+    address_line = serializers.CharField(allow_null=True, allow_blank=True)
+    city = serializers.CharField(allow_null=True, allow_blank=True)
+    state = serializers.CharField(allow_null=True, allow_blank=True)
+    pincode = serializers.CharField(allow_null=True, allow_blank=True)
+    next_slot_id = serializers.IntegerField(allow_null=True)
+    next_slot_date = serializers.DateField(allow_null=True)
+    next_start_time = serializers.TimeField(allow_null=True)
+    free_today = serializers.IntegerField()
+    free_next_7_days = serializers.IntegerField()
+
+
 class LabRegistrationSerializer(serializers.Serializer):
     email = serializers.EmailField(required=True)
     password = serializers.CharField(
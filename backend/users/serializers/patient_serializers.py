@@ -206,3 +206,19 @@ class PatientProfileUpdateSerializer(serializers.Serializer):
         required=False, allow_blank=True, allow_null=True, max_length=10
     )
     address = serializers.JSONField(required=False, allow_null=True)
+
+
+TIMELINE_KINDS = ("APPOINTMENT", "PRESCRIPTION", "LAB_BOOKING", "LAB_REPORT", "PAYMENT")
+
+
+class TimelineQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False, allow_blank=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+    kinds = serializers.CharField(required=False, allow_blank=False)
+
+    def validate_kinds(self, value):
+        kinds = [k.strip().upper() for k in value.split(",") if k.strip()]
+        unknown = sorted(set(kinds) - set(TIMELINE_KINDS))
+        if unknown:
+            raise serializers.ValidationError(f"Unknown kinds: {', '.join(unknown)}.")
+        return kinds or None
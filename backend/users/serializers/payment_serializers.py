@@ -3,7 +3,7 @@ from rest_framework import serializers
 
 
 class CreateOrderSerializer(serializers.Serializer):
-    payment_for = serializers.ChoiceField(choices=["APPOINTMENT", "LAB_TEST"])
+    payment_for = serializers.ChoiceField(choices=["APPOINTMENT", "LAB_TEST", "SLOT_HOLD"])
     reference_id = serializers.CharField(max_length=100)
 
     def validate_reference_id(self, value):
@@ -81,6 +81,7 @@ class PatientPrescriptionListSerializer(serializers.Serializer):
     pdf_path            = serializers.CharField(allow_null=True)
     pdf_url             = serializers.SerializerMethodField()
     created_at          = serializers.DateTimeField()
+    updated_at          = serializers.DateTimeField()
 
     def get_pdf_url(self, obj):
         request = self.context.get("request")
@@ -0,0 +1,10 @@
+# users\serializers\slot_hold_serializers.py
+from rest_framework import serializers
+
+
+class SlotHoldSerializer(serializers.Serializer):
+    hold_id = serializers.UUIDField()
+    slot_type = serializers.CharField()
+    slot_id = serializers.IntegerField()
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    expires_at = serializers.DateTimeField()
@@ -0,0 +1,58 @@
+# users\serializers\waitlist_serializers.py
+from rest_framework import serializers
+
+from users.models import AppointmentType
+from .lab_booking_serializers import COLLECTION_TYPES, CollectionAddressSerializer
+
+
+class _WaitlistWindowSerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+
+    def validate(self, data):
+        if data["date_to"] < data["date_from"]:
+            raise serializers.ValidationError(
+                {"date_to": "date_to must be on or after date_from."}
+            )
+        return data
+
+
+class DoctorWaitlistSerializer(_WaitlistWindowSerializer):
+    doctor_id = serializers.UUIDField()
+    reason = serializers.CharField(required=False, allow_blank=True, default="")
+    appointment_type = serializers.ChoiceField(
+        choices=AppointmentType.choices,
+        default=AppointmentType.IN_PERSON,
+    )
+
+
+class LabWaitlistSerializer(_WaitlistWindowSerializer):
+    lab_id = serializers.UUIDField()
+    test_id = serializers.IntegerField(min_value=1)
+    collection_type = serializers.ChoiceField(choices=COLLECTION_TYPES)
+    collection_address = CollectionAddressSerializer(required=False, allow_null=True)
+    notes = serializers.CharField(
+        max_length=1000, allow_blank=True, allow_null=True, required=False
+    )
+
+    def validate(self, data):
+        data = super().validate(data)
+        if data.get("collection_type") == "home" and not data.get("collection_address"):
+            raise serializers.ValidationError(
+                {"collection_address": "collection_address is required for home collection."}
+            )
+        return data
+
+
+class WaitlistEntrySerializer(serializers.Serializer):
+    entry_id = serializers.UUIDField()
+    target_type = serializers.CharField()
+    target_id = serializers.UUIDField()
+    target_name = serializers.CharField(required=False, allow_null=True)
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    status = serializers.CharField()
+    hold_id = serializers.UUIDField(allow_null=True)
+    offered_slot_id = serializers.IntegerField(allow_null=True)
+    offer_expires_at = serializers.DateTimeField(allow_null=True)
+    created_at = serializers.DateTimeField()
@@ -4,6 +4,7 @@ from users.database_queries.connection import fn_fetchone, fn_scalar
 import users.database_queries.patient_queries as pq
 import users.database_queries.doctor_queries as dq
 import users.database_queries.lab_queries as lq
+from users import jwt_auth
 
 
 class AdminService:
@@ -11,12 +12,16 @@ class AdminService:
     def toggle_patient_status(patient_id: int, reason: str = None):
         patient = pq.toggle_patient_is_active(patient_id, reason)
         action = "activated" if patient["is_active"] else "deactivated"
+        if not patient["is_active"]:
+            jwt_auth.revoke_user_tokens(patient_id)
         return patient, action
 
     @staticmethod
     def toggle_doctor_status(doctor_user_id: str, reason: str = None):
         doctor = dq.toggle_doctor_is_active(doctor_user_id, reason)
         action = "activated" if doctor["is_active"] else "deactivated"
+        if not doctor["is_active"]:
+            jwt_auth.revoke_user_tokens(doctor_user_id)
 
         return doctor, action
 
@@ -32,6 +37,8 @@ class AdminService:
     def toggle_lab_status(lab_user_id: str, reason: str = None):
         lab = lq.toggle_lab_is_active(lab_user_id, reason)
         action = "activated" if lab["is_active"] else "deactivated"
+        if not lab["is_active"]:
+            jwt_auth.revoke_user_tokens(lab_user_id)
         return lab, action
 
     @staticmethod
@@ -0,0 +1,87 @@
+# backend\users\services\agenda_service.py
+import hashlib
+from datetime import date, time, timedelta
+
+from django.utils import timezone
+
+import users.database_queries.doctor_queries as dq
+from users.middleware.exceptions import PermissionException, ValidationException
+from users.models import UserRole
+from users.services import cursor_codec
+
+_ADMIN_ROLES = (UserRole.ADMIN, UserRole.SUPERADMIN)
+
+
+def _encode_cursor(row: dict) -> str:
+    return cursor_codec.encode(
+        row["slot_date"].isoformat(),
+        row["start_time"].isoformat(),
+        str(row["appointment_id"]),
+    )
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    return cursor_codec.decode(cursor, date.fromisoformat, time.fromisoformat, int)
+
+
+class AgendaService:
+
+    @staticmethod
+    def resolve_doctor(user_id: str, role: str, doctor_id=None) -> str:
+        if role == UserRole.DOCTOR:
+            return str(user_id)
+        if role in _ADMIN_ROLES:
+            if not doctor_id:
+                raise ValidationException("doctor_id is required.")
+            return str(doctor_id)
+        raise PermissionException("Doctor or Admin role required.")
+
+    @staticmethod
+    def window(view: str, day=None) -> tuple[date, date]:
+        day = day or timezone.localdate()
+        if view == "week":
+            start = day - timedelta(days=day.weekday())
+            return start, start + timedelta(days=6)
+        return day, day
+
+    @staticmethod
+    def etag(doctor_id: str, date_from, date_to, params: dict) -> str:
+        """Weak ETag for one agenda page, built from the window's version
+        row so a poll that matches never runs the agenda join."""
+        version = dq.get_doctor_agenda_version(doctor_id, date_from, date_to) or {}
+        raw = "|".join(
+            str(v)
+            for v in (
+                doctor_id,
+                date_from,
+                date_to,
+                params.get("cursor"),
+                params.get("limit"),
+                params.get("include_cancelled"),
+                version.get("appointment_count"),
+                version.get("last_updated_at"),
+            )
+        )
+        return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+    @staticmethod
+    def get_agenda(doctor_id: str, date_from, date_to, params: dict) -> dict:
+        limit = params["limit"]
+        after = _decode_cursor(params["cursor"]) if params.get("cursor") else None
+
+        # One extra row tells us whether another page exists.
+        rows = dq.get_doctor_agenda(
+            doctor_id,
+            date_from,
+            date_to,
+            after,
+            limit + 1,
+            params.get("include_cancelled", False),
+        )
+        page = rows[:limit]
+        return {
+            "date_from": date_from,
+            "date_to": date_to,
+            "results": page,
+            "next_cursor": _encode_cursor(page[-1]) if len(rows) > limit else None,
+        }
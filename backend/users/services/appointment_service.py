@@ -1,9 +1,57 @@
 # backend\users\services\appointment_service.py
 from datetime import datetime, timedelta, time as dt_time
+from django.db import DatabaseError
 from django.utils import timezone
 import users.database_queries.doctor_queries as dq
+from users.middleware.exceptions import (
+    ConflictException,
+    NotFoundException,
+    PermissionException,
+    ValidationException,
+)
 from users.models import AppointmentStatus
 
+_BOOKING_ERRORS = {
+    "SLOT_NOT_FOUND": "Slot not found.",
+    "SLOT_ALREADY_BOOKED": "This slot has already been booked.",
+    "SLOT_BLOCKED": "This slot is blocked by the doctor.",
+    "SLOT_IN_PAST": "Cannot book a slot in the past.",
+}
+
+_RESCHEDULE_ERRORS = {
+    "APPOINTMENT_NOT_FOUND": (NotFoundException, "Appointment not found."),
+    "NOT_AUTHORISED": (
+        PermissionException,
+        "You are not authorised to reschedule this appointment.",
+    ),
+    "APPOINTMENT_CLOSED": (
+        ValidationException,
+        "Cannot reschedule a cancelled or completed appointment.",
+    ),
+    "SAME_SLOT": (ValidationException, "The appointment is already in this slot."),
+    "SLOT_WRONG_DOCTOR": (
+        ValidationException,
+        "The new slot belongs to a different doctor.",
+    ),
+    "SLOT_HELD": (ConflictException, "Another patient is checking out this slot."),
+    "SLOT_NOT_FOUND": (NotFoundException, "Slot not found."),
+    "SLOT_ALREADY_BOOKED": (ConflictException, "This slot has already been booked."),
+    "SLOT_BLOCKED": (ValidationException, "This slot is blocked by the doctor."),
+    "SLOT_IN_PAST": (ValidationException, "Cannot book a slot in the past."),
+}
+
+
+def _covering_exception(exceptions, slot_date, start_time, end_time):
+    # Mirrors d_exception_covers; exceptions are already limited to this doctor.
+    for e in exceptions:
+        if not (e["start_date"] <= slot_date <= e["end_date"]):
+            continue
+        if e["start_time"] is None or (
+            start_time < e["end_time"] and end_time > e["start_time"]
+        ):
+            return e["exception_id"]
+    return None
+
 
 class AppointmentService:
 
@@ -27,6 +75,7 @@ class AppointmentService:
         duration = timedelta(minutes=duration_min)
         today = timezone.localdate()
         newly_created = 0
+        exceptions = dq.list_schedule_exceptions(doctor_user_id, today)
 
         for offset in range(days):
             slot_date = today + timedelta(days=offset)
@@ -68,6 +117,9 @@ class AppointmentService:
                         slot_date=slot_date,
                         start_time=current.time(),
                         end_time=slot_end.time(),
+                        blocked_exception_id=_covering_exception(
+                            exceptions, slot_date, current.time(), slot_end.time()
+                        ),
                     )
                     if was_created:
                         newly_created += 1
@@ -91,26 +143,33 @@ class AppointmentService:
         reason: str = "",
         appointment_type: str = "in_person",
     ) -> dict:
-        slot = dq.lock_slot_for_update(slot_id)
-        if not slot:
-            raise ValueError("Slot not found.")
-        if slot["is_booked"]:
-            raise ValueError("This slot has already been booked.")
-        if slot["is_blocked"]:
-            raise ValueError("This slot is blocked by the doctor.")
-        if slot["slot_date"] < timezone.localdate():
-            raise ValueError("Cannot book a slot in the past.")
-
-        doctor_user_id = str(slot["doctor_id"])
-
-        return dq.create_appointment(
-            doctor_id=doctor_user_id,
-            patient_id=patient_user_id,
-            slot_id=slot_id,
-            appointment_type=appointment_type,
-            status="confirmed",
-            reason=reason,
-        )
+        try:
+            return dq.book_slot(
+                patient_id=patient_user_id,
+                slot_id=slot_id,
+                appointment_type=appointment_type,
+                reason=reason,
+                today=timezone.localdate(),
+            )
+        except DatabaseError as e:
+            for code, message in _BOOKING_ERRORS.items():
+                if code in str(e):
+                    raise ValueError(message) from e
+            raise
+
+    @staticmethod
+    def reschedule_appointment(
+        appointment_id: int, new_slot_id: int, user_id: str
+    ) -> dict:
+        try:
+            return dq.reschedule_appointment(
+                appointment_id, new_slot_id, user_id, timezone.localdate()
+            )
+        except DatabaseError as e:
+            for code, (exc_class, message) in _RESCHEDULE_ERRORS.items():
+                if code in str(e):
+                    raise exc_class(message) from e
+            raise
 
     @staticmethod
     def cancel_appointment(
@@ -137,7 +196,8 @@ class AppointmentService:
             cancelled_by_id=cancelled_by_user_id,
             cancellation_reason=reason,
         )
-        if appointment.get("slot_id"):
-            dq.mark_slot_booked(appointment["slot_id"], booked=False)
+        if appointment.get("slot_id") and dq.release_slot(appointment["slot_id"]):
+            from users.services.waitlist_service import WaitlistService
+            WaitlistService.offer_slot("DOCTOR", appointment["slot_id"])
 
         return dq.get_appointment_by_id(appointment_id)
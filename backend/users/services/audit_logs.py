@@ -1,30 +1,16 @@
 # backend\users\services\audit_logs.py
-import json
-import uuid
 import threading
-from datetime import datetime, date, time
-from decimal import Decimal
 from users.database_queries.connection import fn_scalar, fn_fetchall
+from users.services import json_codec
 
 
 _thread_locals = threading.local()
 
 
-class AuditJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, (datetime, date, time)):
-            return obj.isoformat()
-        if isinstance(obj, uuid.UUID):
-            return str(obj)
-        if isinstance(obj, Decimal):
-            return float(obj)
-        return super().default(obj)
-
-
 def to_json(data):
     if data is None:
         return None
-    return json.dumps(data, cls=AuditJSONEncoder)
+    return json_codec.dumps(data)
 
 
 def set_request_context(ip_address=None, user_agent=None):
@@ -3,6 +3,8 @@ from django.utils import timezone
 from users.database_queries.audit_queries import insert_auth_audit
 from users.database_queries.connection import fn_scalar
 import users.database_queries.user_queries as uq
+from users.middleware.exceptions import PermissionException
+from users.services import password_service, permission_matrix
 
 MAX_FAILED_ATTEMPTS = 5
 LOCKOUT_MINUTES = 15
@@ -47,3 +49,63 @@ class AuthService:
     @staticmethod
     def handle_successful_login(user_id: str):
         fn_scalar("auth_login_success", [str(user_id)])
+
+    @staticmethod
+    def login(email: str, password: str) -> tuple[dict, list]:
+        """Checks credentials with one read and one write.
+
+        Returns (user, permissions) on success and raises PermissionException
+        otherwise. The returned user carries the counters written by the
+        login, without the password hash. A hash made with an outdated
+        BCRYPT_ROUNDS is replaced in the same write.
+        """
+        user = uq.get_login_context(email)
+        if not user:
+            raise PermissionException("Invalid credentials.")
+
+        lockout_until = user.get("lockout_until")
+        if lockout_until and lockout_until > timezone.now():
+            uq.record_login(user["user_id"], "REJECTED", "User Account is locked.")
+            unlock_time = lockout_until.strftime("%Y-%m-%d %H:%M:%S UTC")
+            raise PermissionException(
+                f"Account is locked. Try again after {unlock_time}."
+            )
+
+        if not user.get("is_active", False):
+            uq.record_login(user["user_id"], "REJECTED", "User Account is inactive")
+            raise PermissionException(
+                "Your account is inactive. Please contact support."
+            )
+
+        if not password_service.verify_password(password, user.get("password", "")):
+            counters = uq.record_login(
+                user["user_id"],
+                "BAD_PASSWORD",
+                "Invalid password",
+                MAX_FAILED_ATTEMPTS,
+                LOCKOUT_MINUTES,
+            )
+            if counters["failed_login_attempts"] >= MAX_FAILED_ATTEMPTS:
+                raise PermissionException(
+                    "Too many failed login attempts. "
+                    f"Account locked for {LOCKOUT_MINUTES} minutes."
+                )
+            remaining = MAX_FAILED_ATTEMPTS - counters["failed_login_attempts"]
+            raise PermissionException(
+                f"Invalid credentials. {remaining} attempt(s) remaining before lockout."
+            )
+
+        new_hash = None
+        if password_service.needs_rehash(user["password"]):
+            new_hash = password_service.hash_password(password)
+        counters = uq.record_login(
+            user["user_id"],
+            "SUCCESS",
+            max_attempts=MAX_FAILED_ATTEMPTS,
+            lockout_minutes=LOCKOUT_MINUTES,
+            new_password_hash=new_hash,
+        )
+        user.update(counters or {})
+        user.pop("password", None)
+        return user, permission_matrix.permissions_for_role(user["role"])
+
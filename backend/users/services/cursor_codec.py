@@ -0,0 +1,25 @@
+# backend\users\services\cursor_codec.py
+import base64
+
+from users.middleware.exceptions import ValidationException
+
+# Opaque pagination cursors and sync tokens: the parts joined with "|" and
+# base64url encoded without padding. Decoding takes one converter per part;
+# anything malformed becomes a ValidationException.
+
+
+def encode(*parts: str) -> str:
+    raw = "|".join(parts)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode(token: str, *converters, message: str = "Invalid cursor.") -> tuple:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        parts = raw.split("|", len(converters) - 1)
+        if len(parts) != len(converters):
+            raise ValueError("wrong number of cursor parts")
+        return tuple(convert(part) for convert, part in zip(converters, parts))
+    except ValueError as e:
+        raise ValidationException(message) from e
@@ -0,0 +1,107 @@
+# backend\users\services\email_outbox.py
+
+import logging
+import os
+import socket
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+
+import users.database_queries.email_queries as eq
+
+logger = logging.getLogger(__name__)
+
+
+def outbox_enabled() -> bool:
+    return bool(getattr(settings, "EMAIL_OUTBOX_ENABLED", True))
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def backoff_seconds(attempts: int) -> int:
+    base = int(getattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 60))
+    cap = int(getattr(settings, "EMAIL_OUTBOX_MAX_BACKOFF_SECONDS", 3600))
+    return min(cap, base * 2 ** max(attempts - 1, 0))
+
+
+def queue_email(
+    to_email: str,
+    subject: str,
+    text_body: str,
+    html_body: str = None,
+    category: str = None,
+) -> int:
+    max_attempts = int(getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+    return eq.enqueue_email(
+        to_email, subject, text_body, html_body, category, max_attempts
+    )
+
+
+def queue_email_batch(messages: list[tuple], category: str = None) -> list[int]:
+    """Queues many (to_email, subject, text_body, html_body) messages in one
+    round trip. Returns the outbox ids in input order.
+    """
+    max_attempts = int(getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 5))
+    return eq.enqueue_email_batch(messages, category, max_attempts)
+
+
+def deliver_batch(worker_id: str = None, batch_size: int = None) -> dict:
+    """Claims one batch from email_outbox and sends it over a single
+    backend connection. Returns counts of sent / retried / failed messages.
+    """
+    worker_id = worker_id or default_worker_id()
+    batch_size = batch_size or int(getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 50))
+    lease = int(getattr(settings, "EMAIL_OUTBOX_LEASE_SECONDS", 300))
+    from_email = getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@ehealthcare.com")
+
+    result = {"claimed": 0, "sent": 0, "retry": 0, "failed": 0}
+    rows = eq.claim_email_batch(worker_id, batch_size, lease)
+    result["claimed"] = len(rows)
+    if not rows:
+        return result
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        logger.error("Outbox worker %s could not open mail connection: %s", worker_id, e)
+        for row in rows:
+            _record_failure(row, e, result)
+        return result
+
+    try:
+        for row in rows:
+            try:
+                msg = EmailMultiAlternatives(
+                    row["subject"],
+                    row["text_body"],
+                    from_email,
+                    [row["to_email"]],
+                    connection=connection,
+                )
+                if row.get("html_body"):
+                    msg.attach_alternative(row["html_body"], "text/html")
+                msg.send(fail_silently=False)
+            except Exception as e:
+                _record_failure(row, e, result)
+                logger.warning(
+                    "Outbox email %s to %s failed (attempt %s): %s",
+                    row["email_id"], row["to_email"], row["attempts"], e,
+                )
+                continue
+
+            eq.mark_email_sent(row["email_id"])
+            result["sent"] += 1
+    finally:
+        connection.close()
+
+    return result
+
+
+def _record_failure(row: dict, error: Exception, result: dict) -> None:
+    status = eq.mark_email_failed(
+        row["email_id"], str(error)[:1000], backoff_seconds(row["attempts"])
+    )
+    result["failed" if status == "FAILED" else "retry"] += 1
@@ -0,0 +1,361 @@
+# backend\users\services\email_templates.py
+
+import html
+import string
+from typing import Iterable, NamedTuple
+
+from django.conf import settings
+
+_FORMATTER = string.Formatter()
+
+DEFAULT_LOCALE = "en"
+
+SIGNATURE = "\nE-Healthcare System Team"
+THANKS = "Thank you for using E-Healthcare System.\n"
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    text: str
+    html: str | None
+
+
+class CompiledTemplate:
+    """A ``str.format`` style template split once into (literal, field, spec)
+    chunks so rendering is a single pass with no re-parsing.
+
+    A template with no fields is rendered once and returned as-is.
+    Missing or ``None`` context values render as an empty string; values are
+    HTML-escaped when ``escape`` is set.
+    """
+
+    __slots__ = ("fields", "_parts", "_tail", "_static", "_escape")
+
+    def __init__(self, source: str, escape: bool = False):
+        parts = []
+        literal = []
+        for text, field, spec, conversion in _FORMATTER.parse(source):
+            literal.append(text)
+            if field is None:
+                continue
+            if conversion or not field.isidentifier():
+                raise ValueError(f"Unsupported template field: {field!r}")
+            parts.append(("".join(literal), field, spec or ""))
+            literal = []
+
+        self._parts = tuple(parts)
+        self._tail = "".join(literal)
+        self._escape = escape
+        self.fields = frozenset(field for _, field, _ in parts)
+        self._static = self._tail if not parts else None
+
+    def render(self, context: dict) -> str:
+        if self._static is not None:
+            return self._static
+
+        out = []
+        append = out.append
+        get = context.get
+        escape = self._escape
+        for literal, field, spec in self._parts:
+            append(literal)
+            value = get(field)
+            if value is None:
+                continue
+            value = format(value, spec) if spec else str(value)
+            append(html.escape(value) if escape else value)
+        append(self._tail)
+        return "".join(out)
+
+
+class EmailTemplate:
+    __slots__ = ("name", "locale", "subject", "text", "html")
+
+    def __init__(self, name, locale, subject, text, html_source=None):
+        self.name = name
+        self.locale = locale
+        self.subject = CompiledTemplate(subject)
+        self.text = CompiledTemplate(text)
+        self.html = CompiledTemplate(html_source, escape=True) if html_source else None
+
+    def render(self, context: dict) -> RenderedEmail:
+        return RenderedEmail(
+            self.subject.render(context),
+            self.text.render(context),
+            self.html.render(context) if self.html else None,
+        )
+
+
+_REGISTRY: dict[tuple[str, str], EmailTemplate] = {}
+
+
+def register(name, subject, text, html_source=None, locale=DEFAULT_LOCALE):
+    template = EmailTemplate(name, _normalise_locale(locale), subject, text, html_source)
+    _REGISTRY[(name, template.locale)] = template
+    return template
+
+
+def get_template(name: str, locale: str = None) -> EmailTemplate:
+    """Resolves ``locale`` (e.g. ``hi-in``), then its language (``hi``),
+    then the site language, then ``DEFAULT_LOCALE``.
+    """
+    for candidate in _locale_chain(locale):
+        template = _REGISTRY.get((name, candidate))
+        if template is not None:
+            return template
+    raise KeyError(f"Unknown email template: {name}")
+
+
+def render(name: str, context: dict, locale: str = None) -> RenderedEmail:
+    return get_template(name, locale).render(context)
+
+
+def render_many(name: str, contexts: Iterable[dict], locale: str = None):
+    template = get_template(name, locale)
+    return [template.render(context) for context in contexts]
+
+
+def _normalise_locale(locale: str) -> str:
+    return (locale or DEFAULT_LOCALE).replace("_", "-").lower()
+
+
+def _locale_chain(locale: str = None):
+    site = _normalise_locale(getattr(settings, "LANGUAGE_CODE", DEFAULT_LOCALE))
+    chain = []
+    for candidate in (locale and _normalise_locale(locale), site, DEFAULT_LOCALE):
+        if not candidate:
+            continue
+        for option in (candidate, candidate.split("-")[0]):
+            if option not in chain:
+                chain.append(option)
+    return chain
+
+
+def _html_layout(banner: str, body: str) -> str:
+    # banner and body are static; they are merged into the shell before
+    # compiling so the whole page is a single template.
+    return _HTML_SHELL.replace("[[banner]]", banner).replace("[[body]]", body)
+
+
+_HTML_SHELL = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+</head>
+<body style="margin:0;padding:0;font-family:Arial,sans-serif;background-color:#f3f4f6;">
+    <table role="presentation" style="width:100%;border-collapse:collapse;">
+        <tr>
+            <td align="center" style="padding:40px 0;">
+                <table role="presentation" style="width:600px;border-collapse:collapse;background-color:#ffffff;border-radius:8px;box-shadow:0 4px 6px rgba(0,0,0,0.1);">
+                    <tr>
+                        <td style="padding:40px 40px 20px 40px;text-align:center;background:linear-gradient(135deg,#059669 0%,#047857 100%);border-radius:8px 8px 0 0;">
+                            <h1 style="margin:0;color:#ffffff;font-size:28px;font-weight:bold;">E-Healthcare System</h1>
+                            <p style="margin:10px 0 0 0;color:#d1fae5;font-size:14px;">[[banner]]</p>
+                        </td>
+                    </tr>
+                    <tr>
+                        <td style="padding:40px;">
+[[body]]
+                        </td>
+                    </tr>
+                </table>
+            </td>
+        </tr>
+    </table>
+</body>
+</html>"""
+
+_VERIFICATION_BODY = """                            <h2 style="margin:0 0 20px 0;color:#111827;font-size:24px;">Welcome!</h2>
+                            <p style="margin:0 0 20px 0;color:#4b5563;font-size:16px;line-height:24px;">
+                                please verify your email address.
+                            </p>
+                            <table role="presentation" style="margin:30px 0;">
+                                <tr>
+                                    <td style="border-radius:6px;background-color:#059669;">
+                                        <a href="{verify_link}" target="_blank"
+                                           style="display:inline-block;padding:14px 32px;color:#ffffff;text-decoration:none;font-weight:600;font-size:16px;">
+                                            Verify Email Address
+                                        </a>
+                                    </td>
+                                </tr>
+                            </table>
+                            <p style="margin:0 0 20px 0;padding:12px;background-color:#f9fafb;border:1px solid #e5e7eb;border-radius:4px;word-break:break-all;font-size:12px;color:#374151;">
+                                {verify_link}
+                            </p>"""
+
+_PASSWORD_RESET_BODY = """                            <h2 style="margin:0 0 20px 0;color:#111827;font-size:24px;">Password Reset Request</h2>
+                            <p style="margin:0 0 20px 0;color:#4b5563;font-size:16px;line-height:24px;">
+                                You recently requested to reset your password. Click the button below to set a new password.
+                            </p>
+                            <table role="presentation" style="margin:30px 0;">
+                                <tr>
+                                    <td style="border-radius:6px;background-color:#059669;">
+                                        <a href="{reset_link}" target="_blank"
+                                           style="display:inline-block;padding:14px 32px;color:#ffffff;text-decoration:none;font-weight:600;font-size:16px;">
+                                            Reset Password
+                                        </a>
+                                    </td>
+                                </tr>
+                            </table>
+                            <p style="margin:0 0 20px 0;color:#4b5563;font-size:14px;line-height:24px;">
+                                If you did not request a password reset, please ignore this email.
+                            </p>"""
+
+
+register(
+    "verification",
+    subject="Verify Your Email - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "Thank you for registering with E-Healthcare System.\n"
+        "Please verify your email by visiting: {verify_link}\n\n"
+        "This link expires in 24 hours.\n"
+        + SIGNATURE
+    ),
+    html_source=_html_layout("Email Verification", _VERIFICATION_BODY),
+)
+
+register(
+    "password_reset",
+    subject="Reset Your Password - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "You requested to reset your password.\n"
+        "Please click the link below to set a new password: {reset_link}\n\n"
+        "This link expires in 60 minutes.\n"
+        + SIGNATURE
+    ),
+    html_source=_html_layout("Password Reset", _PASSWORD_RESET_BODY),
+)
+
+register(
+    "appointment_confirmation",
+    subject="Doctor Appointment Confirmed - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "Your appointment with {doctor_name} has been confirmed.\n"
+        "Date: {slot_date}\n"
+        "Time: {start_time} to {end_time}\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "lab_booking_confirmation",
+    subject="Lab Test Booking Confirmed - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "Your lab test booking has been confirmed.\n"
+        "Date: {date}\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "prescription_completed",
+    subject="Your Prescription is Ready - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "Your doctor has generated a prescription for your recent appointment.\n"
+        "Prescription Number: {prescription_number}\n\n"
+        "You can view and download it from your patient dashboard.\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "lab_report_completed",
+    subject="Your Lab Report is Ready - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "Your lab report for your recent lab test is now available.\n"
+        "You can view and download it from your patient dashboard.\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "appointment_cancellation",
+    subject="Doctor Appointment Cancelled - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "Your appointment with {doctor_name} on {slot_date} has been cancelled.\n"
+        "If you did not request this cancellation or have any questions, please contact support.\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "lab_booking_cancellation",
+    subject="Lab Test Booking Cancelled - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "Your lab test booking scheduled for {date} has been cancelled.\n"
+        "If you did not request this cancellation or have any questions, please contact support.\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "appointment_rescheduled",
+    subject="Doctor Appointment Rescheduled - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "Your appointment with {doctor_name} has been moved.\n"
+        "New date: {slot_date}\n"
+        "New time: {start_time} to {end_time}\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "lab_booking_rescheduled",
+    subject="Lab Test Booking Rescheduled - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "Your lab test booking has been moved.\n"
+        "New date: {date}\n"
+        "New time: {start_time}\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "waitlist_offer",
+    subject="A Slot Opened Up For You - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "A slot you were waiting for with {target_name} is now available.\n"
+        "Date: {slot_date}\n"
+        "Time: {start_time} to {end_time}\n\n"
+        "We are holding it for you until {expires_at}.\n"
+        "Complete the payment from your patient dashboard to confirm it "
+        "(reference {hold_id}).\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "appointment_reminder",
+    subject="Appointment Reminder - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "This is a reminder of your upcoming appointment with {doctor_name}.\n"
+        "Date: {slot_date}\n"
+        "Time: {start_time} to {end_time}\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
+
+register(
+    "follow_up_reminder",
+    subject="Follow-up Visit Reminder - E-Healthcare System",
+    text=(
+        "Hello,\n\n"
+        "{doctor_name} asked to see you again for a follow-up on {follow_up_date}.\n"
+        "Prescription Number: {prescription_number}\n\n"
+        "You can book the visit from your patient dashboard.\n\n"
+        + THANKS + SIGNATURE
+    ),
+)
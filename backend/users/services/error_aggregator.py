@@ -0,0 +1,202 @@
+# backend\users\services\error_aggregator.py
+
+import atexit
+import hashlib
+import logging
+import os
+import random
+import re
+import threading
+import time
+import traceback
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_NUMBER_RE = re.compile(r"\b\d+\b")
+_HEX_RE = re.compile(r"0x[0-9a-fA-F]+")
+_UUID_RE = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+_QUOTED_RE = re.compile(r"'[^']*'|\"[^\"]*\"")
+
+
+def _window_seconds() -> int:
+    return int(getattr(settings, "ERROR_LOG_WINDOW_SECONDS", 300))
+
+
+def _flush_seconds() -> int:
+    return int(getattr(settings, "ERROR_LOG_FLUSH_SECONDS", 30))
+
+
+def _sample_rate() -> float:
+    return float(getattr(settings, "ERROR_LOG_TRACEBACK_SAMPLE_RATE", 0.1))
+
+
+def normalise_message(message: str) -> str:
+    message = _UUID_RE.sub("<uuid>", message or "")
+    message = _HEX_RE.sub("<hex>", message)
+    message = _QUOTED_RE.sub("<str>", message)
+    return _NUMBER_RE.sub("<n>", message).strip()
+
+
+def fingerprint(exception=None, description: str = None) -> tuple[str, str]:
+    """Returns (fingerprint, exception_type).
+
+    The fingerprint is a hash of the exception type and the stack reduced to
+    file name + function name per frame, so line shifts and differing ids in
+    the message do not split a group. Without a traceback the normalised
+    message stands in for the stack.
+    """
+    if exception is None:
+        exc_type = "Message"
+        parts = [normalise_message(description or "")]
+    else:
+        exc_type = f"{type(exception).__module__}.{type(exception).__qualname__}"
+        frames = traceback.extract_tb(exception.__traceback__) if exception.__traceback__ else []
+        parts = [
+            f"{os.path.basename(frame.filename)}:{frame.name}"
+            for frame in frames
+            if "site-packages" not in frame.filename
+        ]
+        if not parts:
+            parts = [normalise_message(str(exception))]
+
+    digest = hashlib.sha1("|".join([exc_type, *parts]).encode("utf-8")).hexdigest()
+    return digest, exc_type
+
+
+class _Group:
+    __slots__ = (
+        "fingerprint",
+        "window_start",
+        "exception_type",
+        "ref_from",
+        "description",
+        "created_by",
+        "pending",
+        "first_seen",
+        "last_seen",
+    )
+
+    def __init__(self, fp, window_start, exception_type, ref_from, created_by, now):
+        self.fingerprint = fp
+        self.window_start = window_start
+        self.exception_type = exception_type
+        self.ref_from = ref_from
+        self.description = None
+        self.created_by = created_by
+        self.pending = 0
+        self.first_seen = now
+        self.last_seen = now
+
+
+class ErrorAggregator:
+    """Collapses repeated errors into one error_log_groups row per
+    fingerprint per time window.
+
+    The first occurrence of a fingerprint in a window is written straight
+    away (with a full traceback); later occurrences only bump an in-memory
+    counter which is flushed as a delta every ERROR_LOG_FLUSH_SECONDS, when
+    the window rolls over, or at process exit.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._groups: dict[tuple[str, datetime], _Group] = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, ref_from=None, description=None, exception=None, created_by=None):
+        fp, exc_type = fingerprint(exception, description)
+        now = datetime.now(dt_timezone.utc)
+        window = _window_seconds()
+        window_start = datetime.fromtimestamp(
+            int(now.timestamp()) // window * window, tz=dt_timezone.utc
+        )
+        key = (fp, window_start)
+
+        with self._lock:
+            group = self._groups.get(key)
+            is_new = group is None
+            if is_new:
+                group = _Group(fp, window_start, exc_type, ref_from, created_by, now)
+                self._groups[key] = group
+            group.pending += 1
+            group.last_seen = now
+            if created_by:
+                group.created_by = created_by
+            if is_new or random.random() < _sample_rate():
+                group.description = _describe(description, exception)
+
+            due = is_new or time.monotonic() - self._last_flush >= _flush_seconds()
+
+        if due:
+            self.flush(only=key if is_new else None)
+
+    def flush(self, only=None):
+        with self._lock:
+            if only is not None:
+                batch = [self._take(self._groups[only])] if only in self._groups else []
+            else:
+                batch = [self._take(g) for g in self._groups.values() if g.pending]
+                self._evict_stale()
+                self._last_flush = time.monotonic()
+
+        from users.database_queries import error_logs_queries as elq
+
+        for row in batch:
+            try:
+                elq.upsert_error_log_group(**row)
+            except Exception as e:
+                logger.error("[ErrorAggregator] Failed to persist group: %s", e)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "groups": len(self._groups),
+                "pending": sum(g.pending for g in self._groups.values()),
+            }
+
+    def _take(self, group: _Group) -> dict:
+        row = {
+            "fingerprint": group.fingerprint,
+            "window_start": group.window_start,
+            "exception_type": group.exception_type,
+            "ref_from": group.ref_from,
+            "description": group.description,
+            "count": group.pending,
+            "first_seen": group.first_seen,
+            "last_seen": group.last_seen,
+            "created_by": group.created_by,
+        }
+        group.pending = 0
+        group.description = None
+        group.first_seen = group.last_seen
+        return row
+
+    def _evict_stale(self):
+        window = _window_seconds()
+        cutoff = datetime.fromtimestamp(
+            int(time.time()) // window * window, tz=dt_timezone.utc
+        )
+        for key in [k for k, g in self._groups.items() if k[1] < cutoff and not g.pending]:
+            del self._groups[key]
+
+
+def _describe(description=None, exception=None) -> str:
+    if exception is not None:
+        tb_lines = traceback.format_exception(
+            type(exception), exception, exception.__traceback__
+        )
+        return "".join(tb_lines).strip()
+
+    if description:
+        return description.strip()
+
+    return "Unknown error (no exception or description provided)"
+
+
+error_aggregator = ErrorAggregator()
+atexit.register(error_aggregator.flush)
@@ -0,0 +1,73 @@
+# backend\users\services\json_codec.py
+import json
+import uuid
+from datetime import datetime, date, time
+from decimal import Decimal
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Temporal types are passed through to ``default`` so both backends format
+# them the same way (orjson would otherwise use its own RFC 3339 output).
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson is not None
+    else 0
+)
+
+
+def _default(obj):
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(data, default=None) -> bytes:
+    """Encode ``data`` to UTF-8 JSON bytes.
+
+    UUID, datetime, date, time and Decimal are handled natively. ``default``
+    is consulted before the built-in conversions for any type the backend
+    does not encode itself, so a caller can choose its own date format.
+    """
+    fallback = _chain_default(default)
+    if orjson is not None:
+        return orjson.dumps(data, default=fallback, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        data, default=fallback, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def dumps(data, default=None) -> str:
+    return dumps_bytes(data, default=default).decode("utf-8")
+
+
+def loads(raw):
+    if orjson is not None:
+        return orjson.loads(raw)
+    if isinstance(raw, (bytes, bytearray, memoryview)):
+        raw = bytes(raw).decode("utf-8")
+    return json.loads(raw)
+
+
+def _chain_default(default):
+    if default is None:
+        return _default
+
+    def _fallback(obj):
+        try:
+            return default(obj)
+        except TypeError:
+            return _default(obj)
+
+    return _fallback
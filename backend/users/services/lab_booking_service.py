@@ -6,16 +6,16 @@ import re
 import uuid
 from datetime import datetime, date, timedelta, time as dt_time
 
-from django.db import transaction
+from django.db import DatabaseError, transaction
 from django.core.files.storage import default_storage
 
 from users.middleware.exceptions import (
+    ConflictException,
     NotFoundException,
     ValidationException,
     PermissionException,
 )
 from users.models import UserRole
-from users.database_queries.connection import fetchone
 import users.database_queries.lab_booking_queries as bq
 import users.database_queries.lab_service_quries as lsq
 import users.database_queries.lab_queries as lq
@@ -25,6 +25,31 @@ logger = logging.getLogger(__name__)
 HOME_COLLECTION_CHARGE = 50.00
 DEFAULT_DISCOUNT = 0.00
 
+_BOOKING_ERRORS = {
+    "SLOT_NOT_FOUND": (NotFoundException, "Slot {slot_id} not found."),
+    "SLOT_WRONG_LAB": (
+        ValidationException,
+        "The selected slot does not belong to the requested lab.",
+    ),
+    "SLOT_INACTIVE": (ValidationException, "Slot {slot_id} is not active."),
+    "SLOT_IN_PAST": (ValidationException, "Cannot book a slot in the past."),
+    "SLOT_FULL": (ConflictException, "Slot {slot_id} is fully booked."),
+}
+
+_RESCHEDULE_ERRORS = {
+    "BOOKING_NOT_FOUND": (NotFoundException, "Booking not found."),
+    "NOT_AUTHORISED": (
+        PermissionException,
+        "You are not authorised to reschedule this booking.",
+    ),
+    "BOOKING_CLOSED": (
+        ValidationException,
+        "Only active bookings can be rescheduled.",
+    ),
+    "SAME_SLOT": (ValidationException, "The booking is already in slot {slot_id}."),
+    **_BOOKING_ERRORS,
+}
+
 
 class LabBookingService:
 
@@ -37,26 +62,34 @@ class LabBookingService:
         collection_address = validated_data.get("collection_address")
         notes = validated_data.get("notes")
 
-        slot = fetchone(
-            "SELECT slot_id, lab_id, slot_date, is_active, booked_count "
-            "FROM lab_test_slots WHERE slot_id = %s",
-            [slot_id],
-        )
-
-        if not slot:
-            raise NotFoundException(f"Slot {slot_id} not found.")
-
-        if not slot["is_active"]:
-            raise ValidationException(f"Slot {slot_id} is not active.")
-
-        if slot["slot_date"] < date.today():
-            raise ValidationException("Cannot book a slot in the past.")
+        quote = LabBookingService.quote(test_id, collection_type, collection_address)
 
-        if str(slot["lab_id"]) != lab_id:
-            raise ValidationException(
-                "The selected slot does not belong to the requested lab."
+        try:
+            booking = bq.book_lab_slot(
+                patient_id=patient_user_id,
+                lab_id=lab_id,
+                slot_id=slot_id,
+                test_id=test_id,
+                collection_type=collection_type,
+                collection_address=collection_address,
+                subtotal=quote["subtotal"],
+                home_collection_charge=quote["home_collection_charge"],
+                discount_amount=quote["discount_amount"],
+                total_amount=quote["total_amount"],
+                notes=notes,
+                today=date.today(),
             )
+        except DatabaseError as exc:
+            for code, (exc_class, message) in _BOOKING_ERRORS.items():
+                if code in str(exc):
+                    raise exc_class(message.format(slot_id=slot_id)) from exc
+            logger.warning("Booking creation failed: %s", exc)
+            raise ValidationException(str(exc))
 
+        return booking
+
+    @staticmethod
+    def quote(test_id: int, collection_type: str, collection_address=None) -> dict:
         test = lsq.get_details_lab_test(test_id)
         if not test:
             raise NotFoundException(f"Lab test {test_id} not found.")
@@ -75,29 +108,12 @@ class LabBookingService:
         subtotal = float(test["price"])
         home_fee = HOME_COLLECTION_CHARGE if collection_type == "home" else 0.00
         discount = DEFAULT_DISCOUNT
-        total = subtotal + home_fee - discount
-
-        try:
-            with transaction.atomic():
-                bq.increment_slot_booked_count(slot_id)
-                booking = bq.create_lab_booking(
-                    patient_id=patient_user_id,
-                    lab_id=lab_id,
-                    slot_id=slot_id,
-                    test_id=test_id,
-                    collection_type=collection_type,
-                    collection_address=collection_address,
-                    subtotal=subtotal,
-                    home_collection_charge=home_fee,
-                    discount_amount=discount,
-                    total_amount=total,
-                    notes=notes,
-                )
-        except Exception as exc:
-            logger.warning("Booking creation failed: %s", exc)
-            raise ValidationException(str(exc))
-
-        return booking
+        return {
+            "subtotal": subtotal,
+            "home_collection_charge": home_fee,
+            "discount_amount": discount,
+            "total_amount": subtotal + home_fee - discount,
+        }
 
     @staticmethod
     def cancel_booking(
@@ -144,8 +160,42 @@ class LabBookingService:
             logger.warning("Booking cancellation failed: %s", exc)
             raise ValidationException(str(exc))
 
+        from users.services.waitlist_service import WaitlistService
+        WaitlistService.offer_slot("LAB", slot_id)
+
         return bq.get_lab_booking(booking_id)
 
+    @staticmethod
+    def reschedule_booking(
+        booking_id: str,
+        new_slot_id: int,
+        requesting_user_id: str,
+        requesting_user_role: str,
+    ) -> dict:
+        # Patients move their own bookings and labs their own lab's; admins
+        # may move any booking.
+        scope = {}
+        if requesting_user_role == UserRole.PATIENT:
+            scope["patient_id"] = requesting_user_id
+        elif requesting_user_role == UserRole.LAB:
+            scope["lab_id"] = requesting_user_id
+        elif requesting_user_role not in (UserRole.ADMIN, UserRole.SUPERADMIN):
+            raise PermissionException("You are not authorised to reschedule this booking.")
+
+        try:
+            return bq.reschedule_lab_booking(
+                booking_id,
+                new_slot_id,
+                today=date.today(),
+                **scope,
+            )
+        except DatabaseError as exc:
+            for code, (exc_class, message) in _RESCHEDULE_ERRORS.items():
+                if code in str(exc):
+                    raise exc_class(message.format(slot_id=new_slot_id)) from exc
+            logger.warning("Booking reschedule failed: %s", exc)
+            raise ValidationException(str(exc))
+
     @staticmethod
     def complete_booking(booking_id: str) -> dict:
         booking = bq.get_lab_booking(booking_id)
@@ -296,6 +346,7 @@ class LabBookingService:
                     slot_date=slot_date,
                     start_time=curr_dt.time(),
                     end_time=slot_end.time(),
+                    capacity=op.get("max_bookings") or 10,
                 )
 
                 if was_created:
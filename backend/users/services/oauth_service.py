@@ -1,11 +1,15 @@
 # backend\users\services\oauth_service.py
 
 import logging
+import re
+import threading
+import time
 
+import jwt
 import requests
 from django.conf import settings
-from google.oauth2 import id_token as google_id_token
-from google.auth.transport import requests as google_requests
+from google.auth import exceptions as google_exceptions
+from google.auth import jwt as google_jwt
 
 from users.middleware.exceptions import (
     AuthenticationException,
@@ -16,6 +20,131 @@ logger = logging.getLogger(__name__)
 
 _VALID_ISSUERS = frozenset(["accounts.google.com", "https://accounts.google.com"])
 _TOKENINFO_ENDPOINT = "https://oauth2.googleapis.com/tokeninfo"
+_CERTS_ENDPOINT = "https://www.googleapis.com/oauth2/v1/certs"
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+# Used when Google's response carries no max-age, and as the shortest gap
+# between forced refreshes for an unknown key id.
+_DEFAULT_CERTS_MAX_AGE = 300
+_MIN_FORCED_REFRESH_SECONDS = 60
+
+# Google's signing certificates as (certs, expires_at, fetched_at), on
+# the monotonic clock. Certificates are kept past expiry and served stale
+# while Google cannot be reached.
+_certs = None
+_certs_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+
+def _timeout() -> float:
+    return float(getattr(settings, "GOOGLE_HTTP_TIMEOUT_SECONDS", 5))
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = requests.Session()
+    return _session
+
+
+class _CircuitBreaker:
+    """Opens after GOOGLE_BREAKER_THRESHOLD consecutive network failures.
+    While open, calls fail fast; after GOOGLE_BREAKER_COOLDOWN_SECONDS one
+    caller is let through to probe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            cooldown = float(getattr(settings, "GOOGLE_BREAKER_COOLDOWN_SECONDS", 30))
+            if time.monotonic() - self._opened_at < cooldown:
+                return False
+            self._opened_at = time.monotonic()
+            return True
+
+    def success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= int(getattr(settings, "GOOGLE_BREAKER_THRESHOLD", 5)):
+                self._opened_at = time.monotonic()
+
+
+_breaker = _CircuitBreaker()
+
+
+def _unavailable() -> ServiceUnavailableException:
+    return ServiceUnavailableException(
+        "Google authentication service is currently unavailable."
+    )
+
+
+def _fetch_certs() -> tuple:
+    if not _breaker.allow():
+        raise _unavailable()
+    try:
+        response = _get_session().get(
+            getattr(settings, "GOOGLE_CERTS_URL", _CERTS_ENDPOINT),
+            timeout=_timeout(),
+        )
+        response.raise_for_status()
+        certs = response.json()
+    except (requests.RequestException, ValueError):
+        _breaker.failure()
+        logger.exception("Google certificate endpoint unreachable.")
+        raise _unavailable()
+    _breaker.success()
+
+    match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+    max_age = int(match.group(1)) if match else _DEFAULT_CERTS_MAX_AGE
+    now = time.monotonic()
+    return certs, now + max_age, now
+
+
+def _get_certs(kid: str = None) -> dict:
+    """Cached certificates; refetched when expired, or when ``kid`` is
+    unknown (Google rotated its keys) and the copy is not brand new."""
+    global _certs
+
+    def fresh(cached):
+        if cached is None:
+            return False
+        certs, expires_at, fetched_at = cached
+        now = time.monotonic()
+        if now >= expires_at:
+            return False
+        return (
+            kid is None
+            or kid in certs
+            or now - fetched_at < _MIN_FORCED_REFRESH_SECONDS
+        )
+
+    cached = _certs
+    if fresh(cached):
+        return cached[0]
+    with _certs_lock:
+        cached = _certs
+        if fresh(cached):
+            return cached[0]
+        try:
+            _certs = _fetch_certs()
+        except ServiceUnavailableException:
+            if cached is None:
+                raise
+            logger.warning("Serving stale Google certificates.")
+            return cached[0]
+        return _certs[0]
 
 
 class OAuthService:
@@ -25,11 +154,23 @@ class OAuthService:
     def verify_google_token(id_token_str: str) -> dict:
         if not id_token_str:
             raise AuthenticationException("Google ID token is required.")
+        # Without a client ID there is no audience to check, and a token
+        # minted for any other Google app would be accepted.
+        if not OAuthService.GOOGLE_CLIENT_ID:
+            logger.error("GOOGLE_CLIENT_ID is not set; refusing Google sign-in.")
+            raise ServiceUnavailableException("Google sign-in is not configured.")
 
-        idinfo = OAuthService._verify_with_library(id_token_str)
+        try:
+            kid = jwt.get_unverified_header(id_token_str).get("kid")
+        except jwt.PyJWTError:
+            raise AuthenticationException("Google token verification failed.")
 
-        if not idinfo:
+        try:
+            certs = _get_certs(kid)
+        except ServiceUnavailableException:
             idinfo = OAuthService._verify_with_tokeninfo(id_token_str)
+        else:
+            idinfo = OAuthService._verify_locally(id_token_str, certs)
 
         if not idinfo:
             raise AuthenticationException("Google token verification failed.")
@@ -37,32 +178,41 @@ class OAuthService:
         return idinfo
 
     @staticmethod
-    def _verify_with_library(id_token_str: str) -> dict | None:
+    def _verify_locally(id_token_str: str, certs: dict) -> dict | None:
         try:
-            return google_id_token.verify_oauth2_token(
+            idinfo = google_jwt.decode(
                 id_token_str,
-                google_requests.Request(),
-                OAuthService.GOOGLE_CLIENT_ID,
-            )
-        except Exception:
-            logger.warning(
-                "Google library token verification failed — trying tokeninfo fallback."
+                certs=certs,
+                audience=OAuthService.GOOGLE_CLIENT_ID,
             )
+        except (ValueError, google_exceptions.GoogleAuthError):
+            logger.warning("Google token failed local verification.")
             return None
 
+        if idinfo.get("iss") not in _VALID_ISSUERS:
+            raise AuthenticationException("Google token has an invalid issuer.")
+
+        return idinfo
+
     @staticmethod
     def _verify_with_tokeninfo(id_token_str: str) -> dict | None:
+        if not _breaker.allow():
+            raise _unavailable()
         try:
-            response = requests.get(
+            response = _get_session().get(
                 _TOKENINFO_ENDPOINT,
                 params={"id_token": id_token_str},
-                timeout=5,
+                timeout=_timeout(),
             )
         except requests.RequestException:
+            _breaker.failure()
             logger.exception("tokeninfo endpoint unreachable.")
-            raise ServiceUnavailableException(
-                "Google authentication service is currently unavailable."
-            )
+            raise _unavailable()
+        if response.status_code >= 500:
+            _breaker.failure()
+            logger.warning("tokeninfo returned status=%s", response.status_code)
+            raise _unavailable()
+        _breaker.success()
 
         if response.status_code != 200:
             logger.warning("tokeninfo returned status=%s", response.status_code)
@@ -70,10 +220,7 @@ class OAuthService:
 
         data = response.json()
 
-        if (
-            OAuthService.GOOGLE_CLIENT_ID
-            and data.get("aud") != OAuthService.GOOGLE_CLIENT_ID
-        ):
+        if data.get("aud") != OAuthService.GOOGLE_CLIENT_ID:
             raise AuthenticationException("Google token client ID mismatch.")
 
         if data.get("iss") not in _VALID_ISSUERS:
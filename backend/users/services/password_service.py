@@ -1,11 +1,84 @@
 # backend\users\services\password_service.py
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
 import bcrypt
+from django.conf import settings
+
+from users.middleware.exceptions import ServiceUnavailableException
+
+# bcrypt releases the GIL while hashing, so a thread pool gives real
+# parallelism without the pickling and start-up cost of processes. The
+# pool bounds how many hashes run at once; the semaphore bounds how many
+# may wait, and anything beyond that is shed instead of queueing behind
+# a login burst.
+_pool = None
+_slots = None
+_pool_lock = threading.Lock()
+
+
+def _rounds() -> int:
+    return int(getattr(settings, "BCRYPT_ROUNDS", 12))
+
+
+def _get_pool():
+    global _pool, _slots
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = int(
+                    getattr(settings, "PASSWORD_HASH_WORKERS", 0) or os.cpu_count() or 1
+                )
+                queue = int(getattr(settings, "PASSWORD_HASH_MAX_QUEUE", workers * 4))
+                _slots = threading.BoundedSemaphore(workers + queue)
+                _pool = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="password-hash"
+                )
+    return _pool
+
+
+def _run(fn, *args):
+    pool = _get_pool()
+    if not _slots.acquire(blocking=False):
+        raise ServiceUnavailableException(
+            "Too many sign-in attempts right now. Please try again shortly."
+        )
+    try:
+        future = pool.submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(
+            timeout=float(getattr(settings, "PASSWORD_HASH_TIMEOUT_SECONDS", 10))
+        )
+    except FutureTimeout:
+        raise ServiceUnavailableException(
+            "Too many sign-in attempts right now. Please try again shortly."
+        )
+
+
+def _hash(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
 
 
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode()
+    return _run(_hash, password.encode("utf-8"), _rounds()).decode()
 
 
 def verify_password(password: str, hashed_password: str) -> bool:
-    print("In verify_password")
-    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+    if not hashed_password:
+        return False
+    return _run(
+        bcrypt.checkpw, password.encode("utf-8"), hashed_password.encode("utf-8")
+    )
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True when the hash was made with a different cost than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != _rounds()
+    except (AttributeError, IndexError, ValueError):
+        return False
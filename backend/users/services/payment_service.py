@@ -8,6 +8,7 @@ from django.conf import settings
 from django.db import connection
 
 from users.middleware.exceptions import (
+    ConflictException,
     NotFoundException,
     PermissionException,
     ValidationException,
@@ -85,6 +86,108 @@ class PaymentService:
             )
         return row
 
+    @staticmethod
+    def _fetch_slot_hold(reference_id, patient_id):
+        from users.services.slot_hold_service import SlotHoldService
+
+        hold = SlotHoldService.get_hold_for_patient(reference_id, patient_id)
+        if not hold["is_active"]:
+            raise ValidationException("This hold has expired. Please select the slot again.")
+        return hold
+
+    @staticmethod
+    def claim_success(order_id, transaction_id, signature=None):
+        """Moves the payment to SUCCESS and returns it, or returns None if
+        it already was. The client verify call and the webhook can race;
+        only the caller that gets the row back may fulfil it."""
+        return _execute(
+            """
+            UPDATE payments
+               SET status = 'SUCCESS',
+                   transaction_id = %s,
+                   razorpay_signature = COALESCE(%s, razorpay_signature),
+                   updated_at = NOW()
+             WHERE order_id = %s
+               AND status <> 'SUCCESS'
+            RETURNING *
+            """,
+            [transaction_id, signature, order_id],
+            fetch="one",
+        )
+
+    @staticmethod
+    def fulfil(payment):
+        """Applies a successful payment to what it paid for. A paid slot hold
+        is converted into its booking and the payment is re-pointed at it.
+        """
+        payment_for = payment["payment_for"]
+        reference_id = payment["reference_id"]
+
+        if payment_for == "SLOT_HOLD":
+            from users.services.email_service import EmailService
+            from users.services.slot_hold_service import SlotHoldService
+
+            # The payment is already SUCCESS here, so a hold that has since
+            # been purged must be recorded like any other failed conversion.
+            try:
+                hold = SlotHoldService.get_hold_for_patient(
+                    reference_id, payment["patient_id"]
+                )
+                payment_for, reference_id, booking = SlotHoldService.convert_hold(hold)
+            except Exception as e:
+                _execute(
+                    """
+                    UPDATE payments
+                       SET failure_reason = %s,
+                           updated_at = NOW()
+                     WHERE payment_id = %s
+                    """,
+                    [f"Hold conversion failed: {e}", str(payment["payment_id"])],
+                )
+                raise ConflictException(
+                    "Payment received but the slot is no longer available. "
+                    "Please request a refund."
+                ) from e
+
+            _execute(
+                """
+                UPDATE payments
+                   SET payment_for = %s,
+                       reference_id = %s,
+                       updated_at = NOW()
+                 WHERE payment_id = %s
+                """,
+                [payment_for, reference_id, str(payment["payment_id"])],
+            )
+            if payment_for == "APPOINTMENT":
+                EmailService.send_doctor_appointment_confirmation(
+                    str(payment["patient_id"]), booking
+                )
+            else:
+                EmailService.send_lab_booking_confirmation(
+                    str(payment["patient_id"]), booking
+                )
+            return payment_for, reference_id
+
+        if payment_for == "APPOINTMENT":
+            _execute(
+                """
+                UPDATE doctor_appointments
+                   SET status = 'confirmed', updated_at = NOW()
+                 WHERE appointment_id = %s
+                """,
+                [reference_id],
+            )
+        else:
+            _execute(
+                """
+                UPDATE lab_test_slot_bookings
+                   SET booking_status = 'BOOKED', updated_at = NOW()
+                 WHERE booking_id = %s
+                """,
+                [reference_id],
+            )
+        return payment_for, reference_id
 
     @staticmethod
     def create_order(validated_data, patient_id):
@@ -108,6 +211,9 @@ class PaymentService:
         if payment_for == "APPOINTMENT":
             record = PaymentService._fetch_appointment(reference_id, patient_id)
             amount = float(record["consultation_fee"] or 0)
+        elif payment_for == "SLOT_HOLD":
+            record = PaymentService._fetch_slot_hold(reference_id, patient_id)
+            amount = float(record["amount"] or 0)
         else:
             record = PaymentService._fetch_lab_booking(reference_id, patient_id)
             amount = float(record["total_amount"] or 0)
@@ -205,44 +311,16 @@ class PaymentService:
         if str(payment["patient_id"]) != str(patient_id):
             raise PermissionException("You do not own this payment.")
 
-        if payment["status"] == "SUCCESS":
+        payment = PaymentService.claim_success(order_id, payment_id, signature)
+        if payment is None:
             raise ValidationException("This payment has already been verified.")
 
-        _execute(
-            """
-            UPDATE payments
-               SET status = 'SUCCESS',
-                   transaction_id = %s,
-                   razorpay_signature = %s,
-                   updated_at = NOW()
-             WHERE order_id = %s
-            """,
-            [payment_id, signature, order_id],
-        )
-
-        if payment["payment_for"] == "APPOINTMENT":
-            _execute(
-                """
-                UPDATE doctor_appointments
-                   SET status = 'confirmed', updated_at = NOW()
-                 WHERE appointment_id = %s
-                """,
-                [payment["reference_id"]],
-            )
-        else:
-            _execute(
-                """
-                UPDATE lab_test_slot_bookings
-                   SET booking_status = 'BOOKED', updated_at = NOW()
-                 WHERE booking_id = %s
-                """,
-                [payment["reference_id"]],
-            )
+        payment_for, reference_id = PaymentService.fulfil(payment)
 
         return {
             "payment_id": payment_id,
-            "payment_for": payment["payment_for"],
-            "reference_id": payment["reference_id"],
+            "payment_for": payment_for,
+            "reference_id": reference_id,
             "amount": float(payment["amount"]),
         }
 
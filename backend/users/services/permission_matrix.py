@@ -0,0 +1,84 @@
+# backend\users\services\permission_matrix.py
+import threading
+import time
+
+from django.conf import settings
+
+# role -> bitmask over every "module:action" the system knows. Built from
+# one r_get_permission_matrix call and kept per process; writes through
+# role_permission_queries drop it at once, and PERMISSION_MATRIX_TTL_SECONDS
+# bounds how long another worker process can serve a stale copy.
+_matrix = None
+_generation = 0
+_lock = threading.Lock()
+
+
+class _Matrix:
+    __slots__ = ("bits", "roles", "labels", "loaded_at")
+
+    def __init__(self, rows):
+        self.bits = {}
+        self.roles = {}
+        self.labels = []
+        for index, row in enumerate(
+            sorted(rows, key=lambda r: (r["module"], r["action"]))
+        ):
+            bit = 1 << index
+            self.bits[f"{row['module']}:{row['action']}"] = bit
+            self.labels.append(f"{row['module']} : {row['action']}")
+            for role in row["roles"] or []:
+                self.roles[role] = self.roles.get(role, 0) | bit
+        self.loaded_at = time.monotonic()
+
+    def mask(self, role: str) -> int:
+        return self.roles.get(role, 0)
+
+    def allows(self, role: str, permission: str) -> bool:
+        return bool(self.roles.get(role, 0) & self.bits.get(permission, 0))
+
+    def labels_for(self, role: str) -> list:
+        mask = self.roles.get(role, 0)
+        return [label for i, label in enumerate(self.labels) if mask >> i & 1]
+
+
+def _ttl_seconds() -> int:
+    return int(getattr(settings, "PERMISSION_MATRIX_TTL_SECONDS", 60))
+
+
+def get_matrix() -> _Matrix:
+    matrix = _matrix
+    if matrix is not None and time.monotonic() - matrix.loaded_at < _ttl_seconds():
+        return matrix
+    return _reload()
+
+
+def _reload() -> _Matrix:
+    global _matrix
+    from users.database_queries import role_permission_queries as rpq
+
+    with _lock:
+        matrix = _matrix
+        if matrix is None or time.monotonic() - matrix.loaded_at >= _ttl_seconds():
+            generation = _generation
+            matrix = _Matrix(rpq.get_permission_matrix())
+            # An invalidate() during the read means it may predate the write.
+            if generation == _generation:
+                _matrix = matrix
+    return matrix
+
+
+def invalidate() -> None:
+    global _matrix, _generation
+    _generation += 1
+    _matrix = None
+
+
+def has_permission(role: str, permission: str) -> bool:
+    """O(1) check of a "module:action" string for a role name."""
+    return get_matrix().allows(role, permission)
+
+
+def permissions_for_role(role: str) -> list:
+    """The role's permissions as "module : action" strings, sorted, in the
+    shape the login response has always used."""
+    return get_matrix().labels_for(role)
@@ -5,6 +5,7 @@ import users.database_queries.patient_queries as pq
 import users.database_queries.user_queries as uq
 from ..serializers.patient_serializers import PatientProfileSerializer
 from users.services.base_profile_service import BaseProfileService
+from users.helpers.profile_helpers import invalidate_profile
 
 import users.database_queries.lab_queries as lq
 from ..serializers.lab_serializers import LabProfileSerializer
@@ -69,6 +70,7 @@ class PatientProfileService(BaseProfileService):
             if k in data
         }
         updated = pq.update_patient(patient_id, **profile_fields)
+        invalidate_profile(patient_id)
         return PatientProfileSerializer(updated).data
 
 
@@ -143,6 +145,7 @@ class LabProfileService(BaseProfileService):
                 user_id,
             )
 
+        invalidate_profile(user_id)
         updated = lq.get_lab_by_user_id(user_id)
         updated["operating_hours"] = lq.get_lab_operating_hours(user_id)
 
@@ -261,6 +264,7 @@ class DoctorProfileService(BaseProfileService):
                         user_id,
                     )
 
+        invalidate_profile(user_id)
         updated = dq.get_doctor_by_user_id(user_id)
         updated["qualifications"] = dq.get_doctor_qualifications(user_id)
         updated["specializations"] = dq.get_doctor_specializations(user_id)
@@ -0,0 +1,140 @@
+# backend\users\services\rate_limiter.py
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"s": 1, "sec": 1, "m": 60, "min": 60, "h": 3600, "hour": 3600}
+
+# scope -> bucket kind -> "N/period". N is both the burst size and the
+# number of tokens refilled evenly over the period. AUTH_RATE_LIMITS in
+# settings overrides individual entries.
+DEFAULT_LIMITS = {
+    "login": {"ip": "20/min", "email": "10/min", "route": "1200/min"},
+    "refresh": {"ip": "60/min", "route": "6000/min"},
+    "forgot_password": {"ip": "10/hour", "email": "3/hour", "route": "600/min"},
+    "resend_verification": {"ip": "10/hour", "email": "3/hour", "route": "600/min"},
+}
+
+
+def parse_rate(rate: str) -> tuple[int, float]:
+    """"10/min" -> (capacity 10, refill 10/60 tokens per second)."""
+    count, period = rate.split("/")
+    capacity = int(count)
+    return capacity, capacity / _PERIODS[period.strip()]
+
+
+def limits_for(scope: str) -> dict:
+    limits = dict(DEFAULT_LIMITS.get(scope, {}))
+    limits.update(getattr(settings, "AUTH_RATE_LIMITS", {}).get(scope, {}))
+    return limits
+
+
+def bucket_key(scope: str, kind: str, value: str = None) -> str:
+    if kind == "route":
+        return f"{scope}:route"
+    if kind == "email":
+        # Emails are hashed so the shared table never holds addresses.
+        value = hashlib.sha256(value.strip().lower().encode()).hexdigest()[:32]
+    return f"{scope}:{kind}:{value}"
+
+
+class LocalBuckets:
+    """Token buckets held in this process. The least recently used bucket
+    is dropped beyond RATE_LIMIT_MAX_KEYS; a dropped bucket comes back
+    full."""
+
+    def __init__(self):
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, buckets: list) -> float:
+        """Take one token from every (key, capacity, refill) bucket, or from
+        none. Returns 0 on success, otherwise the seconds until all of them
+        have a token. A refused request costs nothing, so one IP flooding
+        its own bucket cannot drain the route or email buckets."""
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            for key, capacity, refill in buckets:
+                tokens, updated = self._buckets.pop(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated) * refill)
+                levels.append((key, tokens, refill))
+            wait = max(
+                ((1 - tokens) / refill for _, tokens, refill in levels if tokens < 1),
+                default=0.0,
+            )
+            for key, tokens, _ in levels:
+                self._buckets[key] = (tokens if wait else tokens - 1, now)
+            max_keys = int(getattr(settings, "RATE_LIMIT_MAX_KEYS", 50000))
+            while len(self._buckets) > max_keys:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def refund(self, buckets: list) -> None:
+        """Give back the token take() charged each bucket, for a request a
+        later check refused."""
+        with self._lock:
+            for key, capacity, _ in buckets:
+                if key in self._buckets:
+                    tokens, updated = self._buckets[key]
+                    self._buckets[key] = (min(capacity, tokens + 1), updated)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+_local = LocalBuckets()
+
+
+def _take_shared(buckets: list) -> float:
+    from users.database_queries import rate_limit_queries as rlq
+
+    try:
+        return rlq.take_tokens(
+            [key for key, _, _ in buckets],
+            [capacity for _, capacity, _ in buckets],
+            [refill for _, _, refill in buckets],
+        )
+    except Exception:
+        # A broken shared store should not lock everyone out; the local
+        # buckets still apply.
+        logger.exception("Shared rate-limit check failed; allowing request.")
+        return 0.0
+
+
+def check(scope: str, ip: str = None, email: str = None) -> float:
+    """Charge one request against the scope's route, IP and email buckets.
+
+    Returns 0 if the request may proceed, otherwise the seconds to wait.
+    Tokens are only taken when every bucket allows the request. The local
+    buckets are checked first, so a flood is refused without any I/O; with
+    RATE_LIMIT_BACKEND = "postgres" the surviving requests are also charged
+    against buckets shared by every process.
+    """
+    values = {"route": None, "ip": ip, "email": email}
+    buckets = []
+    for kind, rate in limits_for(scope).items():
+        if kind != "route" and not values.get(kind):
+            continue
+        capacity, refill = parse_rate(rate)
+        buckets.append((bucket_key(scope, kind, values[kind]), capacity, refill))
+
+    if not buckets:
+        return 0.0
+    wait = _local.take(buckets)
+    if wait:
+        return wait
+
+    if getattr(settings, "RATE_LIMIT_BACKEND", "local") == "postgres":
+        wait = _take_shared(buckets)
+        if wait:
+            _local.refund(buckets)
+        return wait
+    return 0.0
@@ -0,0 +1,89 @@
+# backend\users\services\reminder_service.py
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+import users.database_queries.reminder_queries as rq
+from users.services import email_outbox, email_templates
+
+logger = logging.getLogger(__name__)
+
+
+def _lead_hours() -> int:
+    return int(getattr(settings, "REMINDER_LEAD_HOURS", 24))
+
+
+def _batch_size() -> int:
+    return int(getattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 50))
+
+
+class ReminderService:
+
+    @staticmethod
+    def send_appointment_reminders(lead_hours: int = None, now=None) -> int:
+        return ReminderService._run(
+            rq.claim_appointment_reminders,
+            "appointment_reminder",
+            lambda row: {
+                "doctor_name": row["doctor_name"],
+                "slot_date": row["slot_date"],
+                "start_time": row["start_time"],
+                "end_time": row["end_time"],
+            },
+            lead_hours,
+            now,
+        )
+
+    @staticmethod
+    def send_follow_up_reminders(lead_hours: int = None, now=None) -> int:
+        return ReminderService._run(
+            rq.claim_follow_up_reminders,
+            "follow_up_reminder",
+            lambda row: {
+                "doctor_name": row["doctor_name"],
+                "follow_up_date": row["follow_up_date"],
+                "prescription_number": row["prescription_number"],
+            },
+            lead_hours,
+            now,
+        )
+
+    @staticmethod
+    def send_all(lead_hours: int = None) -> dict:
+        return {
+            "appointments": ReminderService.send_appointment_reminders(lead_hours),
+            "follow_ups": ReminderService.send_follow_up_reminders(lead_hours),
+        }
+
+    @staticmethod
+    def _run(claim, template, build_context, lead_hours=None, now=None) -> int:
+        # Slot dates/times are stored as local wall-clock values.
+        now = (now or timezone.localtime()).replace(tzinfo=None)
+        lead_hours = lead_hours or _lead_hours()
+
+        # Claiming, queueing and linking share one transaction: if queueing
+        # fails the claims and the watermark move roll back with it.
+        with transaction.atomic():
+            rows = [row for row in claim(now, lead_hours) if row.get("patient_email")]
+            batch = _batch_size()
+            for start in range(0, len(rows), batch):
+                chunk = rows[start:start + batch]
+                rendered = email_templates.render_many(
+                    template, [build_context(row) for row in chunk]
+                )
+                email_ids = email_outbox.queue_email_batch(
+                    [
+                        (row["patient_email"], r.subject, r.text, r.html)
+                        for row, r in zip(chunk, rendered)
+                    ],
+                    category=template,
+                )
+                rq.attach_reminder_emails(
+                    [row["reminder_id"] for row in chunk], email_ids
+                )
+
+        if rows:
+            logger.info("Queued %s %s emails", len(rows), template)
+        return len(rows)
@@ -0,0 +1,74 @@
+# backend\users\services\schedule_exception_service.py
+import logging
+
+from django.utils import timezone
+
+import users.database_queries.doctor_queries as dq
+from users.middleware.exceptions import (
+    NotFoundException,
+    PermissionException,
+    ValidationException,
+)
+from users.models import UserRole
+
+logger = logging.getLogger(__name__)
+
+_ADMIN_ROLES = (UserRole.ADMIN, UserRole.SUPERADMIN)
+
+
+class ScheduleExceptionService:
+
+    @staticmethod
+    def create_exception(user_id: str, role: str, validated_data: dict) -> dict:
+        """Doctors add leave for themselves; admins add it for one doctor or,
+        with no doctor_id, a clinic-wide closure."""
+        if role == UserRole.DOCTOR:
+            doctor_id = str(user_id)
+        elif role in _ADMIN_ROLES:
+            doctor_id = validated_data.get("doctor_id")
+            if doctor_id and not dq.get_schedule_by_doctor(str(doctor_id)):
+                raise NotFoundException("Doctor has no schedule.")
+        else:
+            raise PermissionException("Doctor or Admin role required.")
+
+        if validated_data["start_date"] < timezone.localdate():
+            raise ValidationException("start_date cannot be in the past.")
+
+        exception = dq.create_schedule_exception(
+            doctor_id=doctor_id,
+            start_date=validated_data["start_date"],
+            end_date=validated_data["end_date"],
+            start_time=validated_data.get("start_time"),
+            end_time=validated_data.get("end_time"),
+            reason=validated_data.get("reason"),
+            created_by=user_id,
+        )
+        if exception["conflicts"]:
+            logger.info(
+                "Schedule exception %s overlaps %d booked appointment(s)",
+                exception["exception_id"],
+                len(exception["conflicts"]),
+            )
+        return exception
+
+    @staticmethod
+    def delete_exception(exception_id: int, user_id: str, role: str) -> int:
+        if role == UserRole.DOCTOR:
+            owner = str(user_id)
+        elif role in _ADMIN_ROLES:
+            owner = None
+        else:
+            raise PermissionException("Doctor or Admin role required.")
+
+        result = dq.delete_schedule_exception(exception_id, owner)
+        if not result:
+            raise NotFoundException("Schedule exception not found.")
+        return result["unblocked_slots"]
+
+    @staticmethod
+    def list_exceptions(user_id: str, role: str) -> list:
+        if role == UserRole.DOCTOR:
+            return dq.list_schedule_exceptions(str(user_id), timezone.localdate())
+        if role in _ADMIN_ROLES:
+            return dq.list_schedule_exceptions(None, timezone.localdate())
+        raise PermissionException("Doctor or Admin role required.")
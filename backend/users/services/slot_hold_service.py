@@ -0,0 +1,146 @@
+# backend\users\services\slot_hold_service.py
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+import users.database_queries.slot_hold_queries as hq
+import users.database_queries.waitlist_queries as wq
+from users.middleware.exceptions import (
+    ConflictException,
+    NotFoundException,
+    PermissionException,
+    ValidationException,
+)
+
+logger = logging.getLogger(__name__)
+
+DOCTOR = "DOCTOR"
+LAB = "LAB"
+
+_HOLD_ERRORS = {
+    "SLOT_NOT_FOUND": (NotFoundException, "Slot not found."),
+    "SLOT_ALREADY_BOOKED": (ConflictException, "This slot has already been booked."),
+    "SLOT_BLOCKED": (ValidationException, "This slot is not available for booking."),
+    "SLOT_IN_PAST": (ValidationException, "Cannot book a slot in the past."),
+    "SLOT_HELD": (
+        ConflictException,
+        "Another patient is checking out this slot. Please try again shortly.",
+    ),
+    "SLOT_FULL": (ConflictException, "This slot is fully booked."),
+}
+
+
+def _ttl_seconds() -> int:
+    return int(getattr(settings, "SLOT_HOLD_TTL_SECONDS", 600))
+
+
+class SlotHoldService:
+
+    @staticmethod
+    def place_doctor_hold(
+        patient_user_id: str,
+        slot_id: int,
+        reason: str = "",
+        appointment_type: str = "in_person",
+    ) -> dict:
+        return SlotHoldService._place(
+            DOCTOR,
+            slot_id,
+            patient_user_id,
+            {"reason": reason, "appointment_type": appointment_type},
+            amount=None,
+        )
+
+    @staticmethod
+    def place_lab_hold(patient_user_id: str, validated_data: dict) -> dict:
+        from users.services.lab_booking_service import LabBookingService
+
+        quote = LabBookingService.quote(
+            validated_data["test_id"],
+            validated_data["collection_type"],
+            validated_data.get("collection_address"),
+        )
+        payload = {
+            "lab_id": str(validated_data["lab_id"]),
+            "test_id": validated_data["test_id"],
+            "collection_type": validated_data["collection_type"],
+            "collection_address": validated_data.get("collection_address"),
+            "notes": validated_data.get("notes"),
+        }
+        return SlotHoldService._place(
+            LAB,
+            validated_data["slot_id"],
+            patient_user_id,
+            payload,
+            amount=quote["total_amount"],
+        )
+
+    @staticmethod
+    def release_hold(hold_id: str, patient_user_id: str) -> None:
+        if not hq.release_slot_hold(hold_id, patient_user_id):
+            raise NotFoundException("Hold not found.")
+
+    @staticmethod
+    def get_hold_for_patient(hold_id: str, patient_user_id: str) -> dict:
+        hold = hq.get_slot_hold(hold_id)
+        if not hold:
+            raise NotFoundException("Hold not found or already used.")
+        if str(hold["patient_id"]) != str(patient_user_id):
+            raise PermissionException("You do not own this hold.")
+        return hold
+
+    @staticmethod
+    def convert_hold(hold: dict) -> tuple[str, str, dict]:
+        """Turns a paid hold into a real booking.
+
+        Returns (payment_for, reference_id, booking). The hold row is removed
+        once the booking exists; an expired hold still converts as long as
+        nobody else has taken the slot meanwhile.
+        """
+        patient_id = str(hold["patient_id"])
+        payload = hold.get("payload") or {}
+
+        if hold["slot_type"] == DOCTOR:
+            from users.services.appointment_service import AppointmentService
+
+            try:
+                booking = AppointmentService.book_appointment(
+                    patient_user_id=patient_id,
+                    slot_id=hold["slot_id"],
+                    reason=payload.get("reason", ""),
+                    appointment_type=payload.get("appointment_type", "in_person"),
+                )
+            except ValueError as e:
+                raise ConflictException(str(e)) from e
+            result = ("APPOINTMENT", str(booking["appointment_id"]), booking)
+        else:
+            from users.services.lab_booking_service import LabBookingService
+
+            booking = LabBookingService.create_booking(
+                patient_id, {**payload, "slot_id": hold["slot_id"]}
+            )
+            result = ("LAB_TEST", str(booking["booking_id"]), booking)
+
+        hq.release_slot_hold(hold["hold_id"], patient_id)
+        wq.mark_offer_fulfilled(hold["hold_id"])
+        return result
+
+    @staticmethod
+    def _place(slot_type, slot_id, patient_user_id, payload, amount) -> dict:
+        try:
+            return hq.place_slot_hold(
+                slot_type,
+                slot_id,
+                patient_user_id,
+                payload,
+                amount,
+                _ttl_seconds(),
+                timezone.localdate(),
+            )
+        except DatabaseError as e:
+            for code, (exc_class, message) in _HOLD_ERRORS.items():
+                if code in str(e):
+                    raise exc_class(message) from e
+            raise
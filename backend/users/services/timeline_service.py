@@ -0,0 +1,33 @@
+# backend\users\services\timeline_service.py
+from datetime import datetime
+
+import users.database_queries.patient_queries as pq
+from users.services import cursor_codec
+
+
+def _encode_cursor(row: dict) -> str:
+    return cursor_codec.encode(
+        row["event_time"].isoformat(), row["kind"], str(row["event_id"])
+    )
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    return cursor_codec.decode(cursor, datetime.fromisoformat, str, str)
+
+
+class TimelineService:
+
+    @staticmethod
+    def get_timeline(patient_id: str, params: dict) -> dict:
+        """Rows come back from the database ready to render; details is the
+        per-kind payload built in SQL, so no serializer runs over them."""
+        limit = params["limit"]
+        after = _decode_cursor(params["cursor"]) if params.get("cursor") else None
+
+        # One extra row tells us whether another page exists.
+        rows = pq.get_patient_timeline(patient_id, after, limit + 1, params.get("kinds"))
+        page = rows[:limit]
+        return {
+            "results": page,
+            "next_cursor": _encode_cursor(page[-1]) if len(rows) > limit else None,
+        }
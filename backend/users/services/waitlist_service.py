@@ -0,0 +1,136 @@
+# backend\users\services\waitlist_service.py
+import logging
+
+from django.conf import settings
+from django.utils import timezone
+
+import users.database_queries.doctor_queries as dq
+import users.database_queries.waitlist_queries as wq
+from users.middleware.exceptions import (
+    ConflictException,
+    NotFoundException,
+    ValidationException,
+)
+from users.services.slot_hold_service import DOCTOR, LAB
+
+logger = logging.getLogger(__name__)
+
+
+def _offer_ttl_seconds() -> int:
+    return int(getattr(settings, "WAITLIST_OFFER_TTL_SECONDS", 900))
+
+
+def _max_window_days() -> int:
+    return int(getattr(settings, "WAITLIST_MAX_DAYS", 60))
+
+
+class WaitlistService:
+
+    @staticmethod
+    def join_doctor_waitlist(patient_user_id: str, validated_data: dict) -> dict:
+        doctor_id = str(validated_data["doctor_id"])
+        if not dq.get_doctor_by_user_id(doctor_id):
+            raise NotFoundException("Doctor not found.")
+
+        payload = {
+            "reason": validated_data.get("reason", ""),
+            "appointment_type": validated_data.get("appointment_type", "in_person"),
+        }
+        return WaitlistService._join(
+            DOCTOR, doctor_id, patient_user_id, validated_data, payload, amount=None
+        )
+
+    @staticmethod
+    def join_lab_waitlist(patient_user_id: str, validated_data: dict) -> dict:
+        from users.services.lab_booking_service import LabBookingService
+
+        quote = LabBookingService.quote(
+            validated_data["test_id"],
+            validated_data["collection_type"],
+            validated_data.get("collection_address"),
+        )
+        lab_id = str(validated_data["lab_id"])
+        payload = {
+            "lab_id": lab_id,
+            "test_id": validated_data["test_id"],
+            "collection_type": validated_data["collection_type"],
+            "collection_address": validated_data.get("collection_address"),
+            "notes": validated_data.get("notes"),
+        }
+        return WaitlistService._join(
+            LAB,
+            lab_id,
+            patient_user_id,
+            validated_data,
+            payload,
+            amount=quote["total_amount"],
+        )
+
+    @staticmethod
+    def leave_waitlist(entry_id: str, patient_user_id: str) -> None:
+        released = wq.leave_waitlist(entry_id, patient_user_id)
+        if not released:
+            raise NotFoundException("Waitlist entry not found or no longer active.")
+        if released.get("offered_slot_id"):
+            WaitlistService.offer_slot(
+                released["slot_type"], released["offered_slot_id"]
+            )
+
+    @staticmethod
+    def list_for_patient(patient_user_id: str) -> list:
+        return wq.list_patient_waitlist(patient_user_id)
+
+    @staticmethod
+    def offer_slot(slot_type: str, slot_id: int) -> dict | None:
+        """Offers a just-freed slot to the next waiting patient, if any.
+
+        Never raises: a cancellation must not fail because the backfill did.
+        """
+        try:
+            offer = wq.offer_freed_slot(
+                slot_type, slot_id, _offer_ttl_seconds(), timezone.localdate()
+            )
+        except Exception:
+            logger.exception("Waitlist offer failed for %s slot %s", slot_type, slot_id)
+            return None
+
+        if offer:
+            from users.services.email_service import EmailService
+
+            EmailService.send_waitlist_offer(str(offer["patient_id"]), offer)
+        return offer
+
+    @staticmethod
+    def mark_fulfilled(hold_id: str) -> None:
+        wq.mark_offer_fulfilled(hold_id)
+
+    @staticmethod
+    def process_expired() -> dict:
+        """Lapses stale entries and offers again every slot whose offer ran out."""
+        lapsed = wq.expire_waitlist(timezone.localdate())
+        reoffered = 0
+        for row in lapsed:
+            if WaitlistService.offer_slot(row["slot_type"], row["slot_id"]):
+                reoffered += 1
+        return {"lapsed": len(lapsed), "reoffered": reoffered}
+
+    @staticmethod
+    def _join(target_type, target_id, patient_user_id, validated_data, payload, amount):
+        date_from = validated_data["date_from"]
+        date_to = validated_data["date_to"]
+        today = timezone.localdate()
+        if date_from < today:
+            raise ValidationException("date_from cannot be in the past.")
+        if date_to < date_from:
+            raise ValidationException("date_to must be on or after date_from.")
+        if (date_to - today).days > _max_window_days():
+            raise ValidationException(
+                f"You can only wait for slots up to {_max_window_days()} days ahead."
+            )
+
+        entry = wq.join_waitlist(
+            target_type, target_id, patient_user_id, date_from, date_to, payload, amount
+        )
+        if not entry:
+            raise ConflictException("You are already on this waitlist.")
+        return entry
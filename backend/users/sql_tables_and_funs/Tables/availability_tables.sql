@@ -0,0 +1,22 @@
+-- backend\users\sql_tables_and_funs\Tables\availability_tables.sql
+
+-- Free capacity per doctor/lab per day, kept current by triggers on
+-- appointment_slots and lab_test_slots (see availability_functions.sql).
+-- Directory listings read "next available", "free today" and "free this
+-- week" from here instead of scanning the slot tables per doctor or lab.
+-- Rows are keyed by date, so they never go stale as days pass.
+CREATE TABLE IF NOT EXISTS public.slot_availability_daily
+(
+    target_type        VARCHAR(10) NOT NULL CHECK (target_type IN ('DOCTOR', 'LAB')),
+    target_id          UUID        NOT NULL,
+    slot_date          DATE        NOT NULL,
+    free_slots         INT         NOT NULL DEFAULT 0,
+    first_free_slot_id INT,
+    first_free_time    TIME,
+    updated_at         TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT slot_availability_daily_pkey PRIMARY KEY (target_type, target_id, slot_date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_slot_availability_daily_free
+    ON public.slot_availability_daily (target_type, target_id, slot_date)
+    WHERE free_slots > 0;
@@ -216,6 +216,10 @@ CREATE UNIQUE INDEX IF NOT EXISTS prescriptions_appointment_uniq
 CREATE INDEX IF NOT EXISTS idx_prescriptions_doctor  ON public.prescriptions (doctor_id);
 CREATE INDEX IF NOT EXISTS idx_prescriptions_patient ON public.prescriptions (patient_id);
 
+-- Agenda "last visit" lookups: one patient's history with one doctor.
+CREATE INDEX IF NOT EXISTS idx_doctor_appointments_doctor_patient
+    ON public.doctor_appointments (doctor_id, patient_id);
+
 
 -- ── Medicines ────────────────────────────────────────────────
 
@@ -239,4 +243,46 @@ CREATE TABLE IF NOT EXISTS public.prescription_medicines
 );
 
 CREATE INDEX IF NOT EXISTS idx_presc_medicines_presc
-    ON public.prescription_medicines (prescription_id);
\ No newline at end of file
+    ON public.prescription_medicines (prescription_id);
+
+-- ── Schedule exceptions ──────────────────────────────────────
+-- Leave and holidays. doctor_id NULL means a clinic-wide closure that
+-- applies to every doctor; start_time/end_time NULL means whole days,
+-- otherwise only that part of each day in the range is blocked.
+
+CREATE TABLE IF NOT EXISTS public.schedule_exceptions
+(
+    exception_id INTEGER NOT NULL GENERATED BY DEFAULT AS IDENTITY
+                 ( INCREMENT 1 START 1 MINVALUE 1 MAXVALUE 2147483647 CACHE 1 ),
+    doctor_id    UUID REFERENCES public.doctors (doctor_id) ON DELETE CASCADE,
+    start_date   DATE NOT NULL,
+    end_date     DATE NOT NULL,
+    start_time   TIME,
+    end_time     TIME,
+    reason       TEXT,
+    created_by   UUID,
+    created_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT schedule_exceptions_pkey PRIMARY KEY (exception_id),
+    CONSTRAINT schedule_exceptions_dates_chk CHECK (start_date <= end_date),
+    CONSTRAINT schedule_exceptions_times_chk CHECK (
+        (start_time IS NULL AND end_time IS NULL)
+        OR (start_time IS NOT NULL AND end_time IS NOT NULL AND start_time < end_time)
+    )
+);
+
+CREATE INDEX IF NOT EXISTS idx_schedule_exceptions_doctor
+    ON public.schedule_exceptions (doctor_id, end_date);
+
+-- Slots blocked by an exception remember which one, so removing the
+-- exception unblocks exactly those slots and never a manual block.
+ALTER TABLE public.appointment_slots
+    ADD COLUMN IF NOT EXISTS blocked_exception_id INTEGER
+    REFERENCES public.schedule_exceptions (exception_id) ON DELETE SET NULL;
+
+CREATE INDEX IF NOT EXISTS idx_appointment_slots_exception
+    ON public.appointment_slots (blocked_exception_id)
+    WHERE blocked_exception_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_appointment_slots_date
+    ON public.appointment_slots (slot_date);
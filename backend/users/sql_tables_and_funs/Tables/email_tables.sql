@@ -0,0 +1,29 @@
+-- backend\users\sql_tables_and_funs\Tables\email_tables.sql
+CREATE TABLE IF NOT EXISTS public.email_outbox
+(
+    email_id        BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    to_email        VARCHAR(254) NOT NULL,
+    subject         VARCHAR(255) NOT NULL,
+    text_body       TEXT         NOT NULL,
+    html_body       TEXT,
+    category        VARCHAR(50),
+    status          VARCHAR(20)  NOT NULL DEFAULT 'PENDING'
+                    CHECK (status IN ('PENDING', 'SENDING', 'SENT', 'FAILED')),
+    attempts        INT          NOT NULL DEFAULT 0,
+    max_attempts    INT          NOT NULL DEFAULT 5,
+    next_attempt_at TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+    locked_at       TIMESTAMPTZ,
+    locked_by       VARCHAR(100),
+    last_error      TEXT,
+    sent_at         TIMESTAMPTZ,
+    created_at      TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+    updated_at      TIMESTAMPTZ  NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_email_outbox_due
+    ON public.email_outbox (next_attempt_at)
+    WHERE status = 'PENDING';
+
+CREATE INDEX IF NOT EXISTS idx_email_outbox_sending
+    ON public.email_outbox (locked_at)
+    WHERE status = 'SENDING';
@@ -55,11 +55,52 @@ create table if not EXISTS public.lab_test_slots
     start_time time not null,
     end_time time not null,
     booked_count int not null DEFAULT 0,
+    capacity int not null DEFAULT 10,
     is_active boolean not null DEFAULT true,
     created_at timestamp with time zone not null default now(),
     updated_at timestamp with time zone not null default now()
 );
 
+-- Per-slot capacity, seeded from lab_operating_hours.max_bookings when the
+-- slot is generated. Existing rows are backfilled only when the column is
+-- first added, so re-running this file keeps capacities set per slot since;
+-- the check is NOT VALID so historical overbookings do not block the
+-- migration.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = 'public'
+          AND table_name = 'lab_test_slots'
+          AND column_name = 'capacity'
+    ) THEN
+        ALTER TABLE public.lab_test_slots
+            ADD COLUMN capacity int not null DEFAULT 10;
+
+        UPDATE public.lab_test_slots s
+        SET capacity = oh.max_bookings
+        FROM public.lab_operating_hours oh
+        WHERE oh.lab_id = s.lab_id
+          AND oh.day_of_week = EXTRACT(DOW FROM s.slot_date)::INT
+          AND s.capacity <> oh.max_bookings;
+    END IF;
+END;
+$$;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint
+        WHERE conname = 'lab_test_slots_capacity_check'
+          AND conrelid = 'public.lab_test_slots'::regclass
+    ) THEN
+        ALTER TABLE public.lab_test_slots
+            ADD CONSTRAINT lab_test_slots_capacity_check
+            CHECK (booked_count >= 0 AND booked_count <= capacity) NOT VALID;
+    END IF;
+END;
+$$;
+
 
 CREATE TABLE IF NOT EXISTS public.lab_test_categories
 (
@@ -0,0 +1,14 @@
+-- Shared token buckets for the authentication rate limiter, used when
+-- RATE_LIMIT_BACKEND = 'postgres'. UNLOGGED: losing the buckets in a
+-- crash only refills them, and it keeps WAL out of the hot path.
+CREATE UNLOGGED TABLE IF NOT EXISTS public.rate_limit_buckets
+(
+    bucket_key VARCHAR(120) NOT NULL,
+    tokens     DOUBLE PRECISION NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL,
+
+    CONSTRAINT rate_limit_buckets_pkey PRIMARY KEY (bucket_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limit_buckets_updated
+    ON public.rate_limit_buckets (updated_at);
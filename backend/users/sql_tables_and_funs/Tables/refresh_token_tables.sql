@@ -0,0 +1,35 @@
+-- Refresh-token revocation. A refresh token is single use: rotating it
+-- records its jti here, so presenting the same jti again is a reuse.
+-- Rows are only needed until the token would have expired anyway.
+CREATE TABLE IF NOT EXISTS public.refresh_token_denylist
+(
+    jti        UUID NOT NULL,
+    family_id  UUID NOT NULL,
+    expires_at TIMESTAMPTZ NOT NULL,
+
+    CONSTRAINT refresh_token_denylist_pkey PRIMARY KEY (jti)
+);
+
+-- When the jti was consumed; a reuse shortly after is a concurrent refresh
+-- (two tabs racing), not a stolen token.
+ALTER TABLE public.refresh_token_denylist
+    ADD COLUMN IF NOT EXISTS consumed_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS idx_refresh_token_denylist_expires
+    ON public.refresh_token_denylist (expires_at);
+
+-- A family is every refresh token descended from one login. Reuse or
+-- logout revokes the whole family; only revoked families are stored.
+CREATE TABLE IF NOT EXISTS public.refresh_token_revoked_families
+(
+    family_id  UUID NOT NULL,
+    user_id    UUID NOT NULL,
+    reason     VARCHAR(20) NOT NULL,  -- 'REUSED' | 'LOGOUT'
+    revoked_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL,
+
+    CONSTRAINT refresh_token_revoked_families_pkey PRIMARY KEY (family_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_refresh_token_revoked_families_expires
+    ON public.refresh_token_revoked_families (expires_at);
@@ -0,0 +1,41 @@
+-- backend\users\sql_tables_and_funs\Tables\reminder_tables.sql
+CREATE TABLE IF NOT EXISTS public.reminder_log
+(
+    reminder_id   BIGINT GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    reminder_type VARCHAR(20) NOT NULL
+                  CHECK (reminder_type IN ('APPOINTMENT', 'FOLLOW_UP')),
+    reference_id  VARCHAR(64) NOT NULL,
+    patient_id    UUID        NOT NULL,
+    due_at        TIMESTAMP   NOT NULL,
+    email_id      BIGINT,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT reminder_log_reference_due_uniq UNIQUE (reminder_type, reference_id, due_at)
+);
+
+-- One row per reminder type. scanned_until is the high-water mark of the
+-- due-time window already scanned; last_run_at bounds the catch-up scan for
+-- rows booked or changed behind the mark.
+CREATE TABLE IF NOT EXISTS public.reminder_watermarks
+(
+    reminder_type VARCHAR(20) PRIMARY KEY,
+    scanned_until TIMESTAMP   NOT NULL,
+    last_run_at   TIMESTAMPTZ NOT NULL,
+    updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_appointment_slots_booked_time
+    ON public.appointment_slots (slot_date, start_time)
+    WHERE is_booked;
+
+CREATE INDEX IF NOT EXISTS idx_doctor_appointments_slot
+    ON public.doctor_appointments (slot_id);
+
+CREATE INDEX IF NOT EXISTS idx_doctor_appointments_updated
+    ON public.doctor_appointments (updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_prescriptions_follow_up
+    ON public.prescriptions (follow_up_date)
+    WHERE follow_up_date IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_prescriptions_updated
+    ON public.prescriptions (updated_at);
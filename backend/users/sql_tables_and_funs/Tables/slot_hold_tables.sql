@@ -0,0 +1,19 @@
+-- backend\users\sql_tables_and_funs\Tables\slot_hold_tables.sql
+
+-- Short-lived checkout holds on doctor and lab slots. A hold is live while
+-- expires_at > NOW(); expired rows are simply ignored by every reader and
+-- cleared lazily the next time the same slot is held.
+CREATE TABLE IF NOT EXISTS public.slot_holds
+(
+    hold_id    UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    slot_type  VARCHAR(10)   NOT NULL CHECK (slot_type IN ('DOCTOR', 'LAB')),
+    slot_id    INT           NOT NULL,
+    patient_id UUID          NOT NULL,
+    payload    JSONB         NOT NULL DEFAULT '{}'::jsonb,
+    amount     NUMERIC(10,2),
+    expires_at TIMESTAMPTZ   NOT NULL,
+    created_at TIMESTAMPTZ   NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_slot_holds_slot
+    ON public.slot_holds (slot_type, slot_id, expires_at);
@@ -0,0 +1,33 @@
+-- backend\users\sql_tables_and_funs\Tables\sync_tables.sql
+-- Delta sync. List endpoints accept a "since" token and return rows with
+-- updated_at after it, so every owner gets an (owner, updated_at) index.
+-- Hard deletes leave one tombstone per owner so clients can drop the row.
+
+CREATE INDEX IF NOT EXISTS idx_doctor_appointments_patient_updated
+    ON public.doctor_appointments (patient_id, updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_doctor_appointments_doctor_updated
+    ON public.doctor_appointments (doctor_id, updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_lab_bookings_lab_updated
+    ON public.lab_test_slot_bookings (lab_id, updated_at);
+
+CREATE INDEX IF NOT EXISTS idx_prescriptions_patient_updated
+    ON public.prescriptions (patient_id, updated_at);
+
+CREATE TABLE IF NOT EXISTS public.sync_tombstones
+(
+    tombstone_id BIGINT NOT NULL GENERATED BY DEFAULT AS IDENTITY,
+    entity       VARCHAR(30) NOT NULL,  -- 'APPOINTMENT' | 'LAB_BOOKING' | 'PRESCRIPTION'
+    entity_id    TEXT NOT NULL,
+    owner_id     UUID NOT NULL,
+    deleted_at   TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+
+    CONSTRAINT sync_tombstones_pkey PRIMARY KEY (tombstone_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_owner
+    ON public.sync_tombstones (entity, owner_id, deleted_at);
+
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_deleted
+    ON public.sync_tombstones (deleted_at);
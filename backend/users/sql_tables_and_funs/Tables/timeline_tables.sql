@@ -0,0 +1,19 @@
+-- backend\users\sql_tables_and_funs\Tables\timeline_tables.sql
+-- Indexes behind p_get_patient_timeline. Every branch of the timeline
+-- walks one of these backwards from the cursor and stops after a page,
+-- so a page costs the same for a new patient and one with years of history.
+
+CREATE INDEX IF NOT EXISTS idx_doctor_appointments_patient_created
+    ON public.doctor_appointments (patient_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_prescriptions_patient_created
+    ON public.prescriptions (patient_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_lab_bookings_patient_created
+    ON public.lab_test_slot_bookings (patient_id, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_lab_test_reports_booking
+    ON public.lab_test_reports (booking_id, uploaded_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_payments_patient_created
+    ON public.payments (patient_id, created_at DESC);
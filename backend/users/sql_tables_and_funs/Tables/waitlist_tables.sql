@@ -0,0 +1,48 @@
+-- backend\users\sql_tables_and_funs\Tables\waitlist_tables.sql
+
+-- Patients waiting for a doctor or lab slot between date_from and date_to.
+-- When a slot frees up, the oldest WAITING entry whose range covers the slot
+-- date is offered the slot through a slot_holds row (status OFFERED); paying
+-- for the hold marks the entry FULFILLED, letting it lapse marks it EXPIRED.
+CREATE TABLE IF NOT EXISTS public.waitlist_entries
+(
+    entry_id         UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    target_type      VARCHAR(10)  NOT NULL CHECK (target_type IN ('DOCTOR', 'LAB')),
+    target_id        UUID         NOT NULL,
+    patient_id       UUID         NOT NULL REFERENCES public.users (user_id) ON DELETE CASCADE,
+    date_from        DATE         NOT NULL,
+    date_to          DATE         NOT NULL,
+    payload          JSONB        NOT NULL DEFAULT '{}'::jsonb,
+    amount           NUMERIC(10,2),
+    status           VARCHAR(10)  NOT NULL DEFAULT 'WAITING'
+        CHECK (status IN ('WAITING', 'OFFERED', 'FULFILLED', 'EXPIRED', 'CANCELLED')),
+    hold_id          UUID,
+    offered_slot_id  INT,
+    offer_expires_at TIMESTAMPTZ,
+    created_at       TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+    updated_at       TIMESTAMPTZ  NOT NULL DEFAULT NOW(),
+    CONSTRAINT waitlist_entries_date_range_chk CHECK (date_from <= date_to)
+);
+
+-- One live entry per patient and doctor/lab.
+CREATE UNIQUE INDEX IF NOT EXISTS uq_waitlist_entries_active
+    ON public.waitlist_entries (patient_id, target_type, target_id)
+    WHERE status IN ('WAITING', 'OFFERED');
+
+-- The queue itself: a freed slot seeks straight to its doctor/lab and walks
+-- WAITING entries oldest first, so matching never scans other targets or
+-- entries that were already offered, fulfilled or dropped.
+CREATE INDEX IF NOT EXISTS idx_waitlist_entries_queue
+    ON public.waitlist_entries (target_type, target_id, created_at)
+    WHERE status = 'WAITING';
+
+CREATE INDEX IF NOT EXISTS idx_waitlist_entries_offer_expiry
+    ON public.waitlist_entries (offer_expires_at)
+    WHERE status = 'OFFERED';
+
+CREATE INDEX IF NOT EXISTS idx_waitlist_entries_hold
+    ON public.waitlist_entries (hold_id)
+    WHERE hold_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_waitlist_entries_patient
+    ON public.waitlist_entries (patient_id, created_at DESC);
@@ -90,6 +90,118 @@ END;
 $$;
 
 
+-- Everything login needs in one read: the user row, lockout state and
+-- role name. Permissions come from the cached matrix.
+DROP FUNCTION IF EXISTS auth_get_login_context(varchar);
+CREATE OR REPLACE FUNCTION auth_get_login_context(
+    p_email varchar
+)
+RETURNS TABLE (
+    user_id uuid,
+    email varchar,
+    email_verified boolean,
+    is_active boolean,
+    password varchar,
+    oauth_provider varchar,
+    oauth_provider_id varchar,
+    two_factor_enabled boolean,
+    failed_login_attempts int,
+    lockout_until timestamptz,
+    created_at timestamptz,
+    updated_at timestamptz,
+    last_login_at timestamptz,
+    role_id int,
+    role varchar
+)
+LANGUAGE sql STABLE
+AS $$
+SELECT
+    u.user_id,
+    u.email,
+    u.email_verified,
+    u.is_active,
+    u.password,
+    u.oauth_provider,
+    u.oauth_provider_id,
+    u.two_factor_enabled,
+    u.failed_login_attempts,
+    u.lockout_until,
+    u.created_at,
+    u.updated_at,
+    u.last_login_at,
+    u.role_id,
+    r.role
+FROM users u
+JOIN user_roles r
+    ON r.role_id = u.role_id
+WHERE u.email = p_email;
+$$;
+
+
+
+-- The single write at the end of a login attempt. p_outcome is
+-- SUCCESS (reset counters, stamp last_login_at), BAD_PASSWORD (count the
+-- failure and lock once p_max_attempts is reached) or REJECTED (locked or
+-- inactive account: audit only). A successful login may also swap in
+-- p_new_password when the stored hash used an outdated cost. Returns the
+-- user's counters afterwards.
+DROP FUNCTION IF EXISTS auth_record_login(uuid, varchar, text, int, int);
+CREATE OR REPLACE FUNCTION auth_record_login(
+    p_user_id         uuid,
+    p_outcome         varchar,
+    p_reason          text    DEFAULT NULL,
+    p_max_attempts    int     DEFAULT 5,
+    p_lockout_minutes int     DEFAULT 15,
+    p_new_password    varchar DEFAULT NULL
+)
+RETURNS TABLE (
+    failed_login_attempts int,
+    lockout_until timestamptz,
+    last_login_at timestamptz,
+    updated_at timestamptz
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+
+IF p_outcome = 'SUCCESS' THEN
+    UPDATE users u
+    SET
+        failed_login_attempts = 0,
+        lockout_until = NULL,
+        last_login_at = NOW(),
+        password = COALESCE(p_new_password, u.password),
+        updated_at = NOW()
+    WHERE u.user_id = p_user_id;
+ELSIF p_outcome = 'BAD_PASSWORD' THEN
+    UPDATE users u
+    SET
+        failed_login_attempts = u.failed_login_attempts + 1,
+        lockout_until = CASE
+            WHEN u.failed_login_attempts + 1 >= p_max_attempts
+            THEN NOW() + make_interval(mins => p_lockout_minutes)
+            ELSE u.lockout_until
+        END,
+        updated_at = NOW()
+    WHERE u.user_id = p_user_id;
+END IF;
+
+PERFORM a_auth_audit_fn(
+    p_user_id,
+    'USER_LOGIN',
+    CASE WHEN p_outcome = 'SUCCESS' THEN 'SUCCESS' ELSE 'FAILURE' END,
+    p_reason
+);
+
+RETURN QUERY
+SELECT u.failed_login_attempts, u.lockout_until, u.last_login_at, u.updated_at
+FROM users u
+WHERE u.user_id = p_user_id;
+
+END;
+$$;
+
+
 
 CREATE OR REPLACE FUNCTION auth_toggle_user_is_active(u_user_id uuid, u_reason varchar)
 RETURNS void
@@ -233,6 +345,154 @@ $$;
 
 
 
+-- Consume a refresh token and read its user in one round trip.
+-- rotation_status is OK, REVOKED (family already revoked) or REUSED (jti
+-- already consumed; the family is revoked now). A jti consumed less than
+-- p_grace_seconds ago is rotated again as OK, so concurrent refreshes of
+-- one token don't log the user out everywhere. p_retain_until must cover
+-- the newest token the family can hold, so callers pass now + the refresh
+-- lifetime. profile_version changes whenever the user or role row does and
+-- keys the cached profile sent back with the new tokens.
+DROP FUNCTION IF EXISTS auth_rotate_refresh_token(uuid, uuid, uuid, timestamptz, timestamptz);
+CREATE OR REPLACE FUNCTION auth_rotate_refresh_token(
+    p_jti uuid,
+    p_family_id uuid,
+    p_user_id uuid,
+    p_expires_at timestamptz,
+    p_retain_until timestamptz,
+    p_grace_seconds int DEFAULT 0
+)
+RETURNS TABLE (
+    user_id uuid,
+    email varchar,
+    email_verified boolean,
+    is_active boolean,
+    oauth_provider varchar,
+    oauth_provider_id varchar,
+    two_factor_enabled boolean,
+    failed_login_attempts int,
+    lockout_until timestamptz,
+    created_at timestamptz,
+    updated_at timestamptz,
+    last_login_at timestamptz,
+    role_id int,
+    role varchar,
+    rotation_status varchar,
+    profile_version timestamptz
+)
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_status varchar := 'OK';
+BEGIN
+
+IF EXISTS (
+    SELECT 1 FROM refresh_token_revoked_families f
+    WHERE f.family_id = p_family_id
+) THEN
+    v_status := 'REVOKED';
+ELSE
+    INSERT INTO refresh_token_denylist (jti, family_id, expires_at)
+    VALUES (p_jti, p_family_id, p_expires_at)
+    ON CONFLICT (jti) DO NOTHING;
+
+    IF NOT FOUND AND NOT EXISTS (
+        SELECT 1 FROM refresh_token_denylist d
+        WHERE d.jti = p_jti
+          AND d.consumed_at > NOW() - make_interval(secs => p_grace_seconds)
+    ) THEN
+        v_status := 'REUSED';
+        INSERT INTO refresh_token_revoked_families (
+            family_id, user_id, reason, expires_at
+        )
+        VALUES (p_family_id, p_user_id, 'REUSED', p_retain_until)
+        ON CONFLICT (family_id) DO NOTHING;
+    END IF;
+END IF;
+
+RETURN QUERY
+SELECT
+    u.user_id,
+    u.email,
+    u.email_verified,
+    u.is_active,
+    u.oauth_provider,
+    u.oauth_provider_id,
+    u.two_factor_enabled,
+    u.failed_login_attempts,
+    u.lockout_until,
+    u.created_at,
+    u.updated_at,
+    u.last_login_at,
+    u.role_id,
+    r.role,
+    v_status,
+    GREATEST(u.updated_at, p.updated_at, d.updated_at, l.updated_at)
+FROM users u
+JOIN user_roles r
+    ON r.role_id = u.role_id
+LEFT JOIN patients p ON p.patient_id = u.user_id
+LEFT JOIN doctors d ON d.doctor_id = u.user_id
+LEFT JOIN labs l ON l.lab_id = u.user_id
+WHERE u.user_id = p_user_id;
+
+END;
+$$;
+
+
+
+CREATE OR REPLACE FUNCTION auth_revoke_refresh_family(
+    p_jti uuid,
+    p_family_id uuid,
+    p_user_id uuid,
+    p_expires_at timestamptz,
+    p_retain_until timestamptz,
+    p_reason varchar
+)
+RETURNS boolean
+LANGUAGE plpgsql
+AS $$
+BEGIN
+
+INSERT INTO refresh_token_denylist (jti, family_id, expires_at)
+VALUES (p_jti, p_family_id, p_expires_at)
+ON CONFLICT (jti) DO NOTHING;
+
+INSERT INTO refresh_token_revoked_families (
+    family_id, user_id, reason, expires_at
+)
+VALUES (p_family_id, p_user_id, p_reason, p_retain_until)
+ON CONFLICT (family_id) DO NOTHING;
+
+RETURN TRUE;
+
+END;
+$$;
+
+
+
+CREATE OR REPLACE FUNCTION auth_purge_refresh_revocations()
+RETURNS int
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_jtis int;
+    v_families int;
+BEGIN
+
+DELETE FROM refresh_token_denylist d WHERE d.expires_at < NOW();
+GET DIAGNOSTICS v_jtis = ROW_COUNT;
+
+DELETE FROM refresh_token_revoked_families f WHERE f.expires_at < NOW();
+GET DIAGNOSTICS v_families = ROW_COUNT;
+
+RETURN v_jtis + v_families;
+
+END;
+$$;
+
+
+
 CREATE OR REPLACE FUNCTION auth_create_verification(
     p_user_id uuid,
     p_verification_type_id int,
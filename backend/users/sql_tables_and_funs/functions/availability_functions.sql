@@ -0,0 +1,234 @@
+-- backend\users\sql_tables_and_funs\functions\availability_functions.sql
+
+-- Recomputes one doctor's or lab's row for one day. The summary row is
+-- locked before counting, so concurrent bookings on the same day queue up
+-- and each recount sees the previous one's committed slot changes.
+CREATE OR REPLACE FUNCTION s_refresh_availability_day(
+    p_target_type VARCHAR,
+    p_target_id   UUID,
+    p_slot_date   DATE
+)
+RETURNS VOID
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_total      INT;
+    v_free       INT;
+    v_first_slot INT;
+    v_first_time TIME;
+BEGIN
+    INSERT INTO slot_availability_daily (target_type, target_id, slot_date)
+    VALUES (p_target_type, p_target_id, p_slot_date)
+    ON CONFLICT ON CONSTRAINT slot_availability_daily_pkey DO NOTHING;
+
+    PERFORM 1
+    FROM slot_availability_daily a
+    WHERE a.target_type = p_target_type
+      AND a.target_id = p_target_id
+      AND a.slot_date = p_slot_date
+    FOR UPDATE;
+
+    IF p_target_type = 'DOCTOR' THEN
+        SELECT COUNT(*),
+               COUNT(*) FILTER (WHERE NOT s.is_booked AND NOT s.is_blocked),
+               (ARRAY_AGG(s.slot_id ORDER BY s.start_time)
+                    FILTER (WHERE NOT s.is_booked AND NOT s.is_blocked))[1],
+               MIN(s.start_time) FILTER (WHERE NOT s.is_booked AND NOT s.is_blocked)
+        INTO v_total, v_free, v_first_slot, v_first_time
+        FROM appointment_slots s
+        JOIN doctor_schedules ds ON ds.schedule_id = s.schedule_id
+        WHERE ds.doctor_id = p_target_id
+          AND s.slot_date = p_slot_date;
+    ELSE
+        SELECT COUNT(*),
+               COUNT(*) FILTER (WHERE s.is_active AND s.booked_count < s.capacity),
+               (ARRAY_AGG(s.slot_id ORDER BY s.start_time)
+                    FILTER (WHERE s.is_active AND s.booked_count < s.capacity))[1],
+               MIN(s.start_time) FILTER (WHERE s.is_active AND s.booked_count < s.capacity)
+        INTO v_total, v_free, v_first_slot, v_first_time
+        FROM lab_test_slots s
+        WHERE s.lab_id = p_target_id
+          AND s.slot_date = p_slot_date;
+    END IF;
+
+    IF v_total = 0 THEN
+        DELETE FROM slot_availability_daily a
+        WHERE a.target_type = p_target_type
+          AND a.target_id = p_target_id
+          AND a.slot_date = p_slot_date;
+        RETURN;
+    END IF;
+
+    UPDATE slot_availability_daily a
+    SET free_slots         = v_free,
+        first_free_slot_id = v_first_slot,
+        first_free_time    = v_first_time,
+        updated_at         = NOW()
+    WHERE a.target_type = p_target_type
+      AND a.target_id = p_target_id
+      AND a.slot_date = p_slot_date;
+END;
+$$;
+
+
+-- Locks several summary rows of one target type in (target_id, slot_date)
+-- order, creating any that are missing. Anything that changes slots on more
+-- than one day in a transaction calls this first, so two such transactions
+-- can't each hold one day and wait on the other's.
+CREATE OR REPLACE FUNCTION s_lock_availability_days(
+    p_target_type VARCHAR,
+    p_target_ids  UUID[],
+    p_slot_dates  DATE[]
+)
+RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO slot_availability_daily (target_type, target_id, slot_date)
+    SELECT DISTINCT p_target_type, k.target_id, k.slot_date
+    FROM unnest(p_target_ids, p_slot_dates) AS k(target_id, slot_date)
+    WHERE k.target_id IS NOT NULL AND k.slot_date IS NOT NULL
+    ORDER BY 2, 3
+    ON CONFLICT ON CONSTRAINT slot_availability_daily_pkey DO NOTHING;
+
+    PERFORM 1
+    FROM slot_availability_daily a
+    JOIN unnest(p_target_ids, p_slot_dates) AS k(target_id, slot_date)
+      ON k.target_id = a.target_id AND k.slot_date = a.slot_date
+    WHERE a.target_type = p_target_type
+    ORDER BY a.target_id, a.slot_date
+    FOR UPDATE OF a;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION s_appointment_slots_availability_trg()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_old_doctor_id UUID;
+    v_new_doctor_id UUID;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT ds.doctor_id INTO v_old_doctor_id
+        FROM doctor_schedules ds
+        WHERE ds.schedule_id = OLD.schedule_id;
+    END IF;
+
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND (NEW.schedule_id, NEW.slot_date)
+                                IS DISTINCT FROM (OLD.schedule_id, OLD.slot_date)) THEN
+        SELECT ds.doctor_id INTO v_new_doctor_id
+        FROM doctor_schedules ds
+        WHERE ds.schedule_id = NEW.schedule_id;
+    END IF;
+
+    -- A slot moved between days touches two summary rows.
+    IF v_old_doctor_id IS NOT NULL AND v_new_doctor_id IS NOT NULL THEN
+        PERFORM s_lock_availability_days(
+            'DOCTOR',
+            ARRAY[v_old_doctor_id, v_new_doctor_id],
+            ARRAY[OLD.slot_date, NEW.slot_date]
+        );
+    END IF;
+
+    IF v_old_doctor_id IS NOT NULL THEN
+        PERFORM s_refresh_availability_day('DOCTOR', v_old_doctor_id, OLD.slot_date);
+    END IF;
+    IF v_new_doctor_id IS NOT NULL THEN
+        PERFORM s_refresh_availability_day('DOCTOR', v_new_doctor_id, NEW.slot_date);
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION s_lab_test_slots_availability_trg()
+RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND (NEW.lab_id, NEW.slot_date)
+                            IS DISTINCT FROM (OLD.lab_id, OLD.slot_date) THEN
+        PERFORM s_lock_availability_days(
+            'LAB', ARRAY[OLD.lab_id, NEW.lab_id], ARRAY[OLD.slot_date, NEW.slot_date]
+        );
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM s_refresh_availability_day('LAB', OLD.lab_id, OLD.slot_date);
+    END IF;
+
+    IF TG_OP = 'INSERT'
+       OR (TG_OP = 'UPDATE' AND (NEW.lab_id, NEW.slot_date)
+                                IS DISTINCT FROM (OLD.lab_id, OLD.slot_date)) THEN
+        PERFORM s_refresh_availability_day('LAB', NEW.lab_id, NEW.slot_date);
+    END IF;
+
+    RETURN NULL;
+END;
+$$;
+
+
+DROP TRIGGER IF EXISTS trg_appointment_slots_availability_ins_del ON appointment_slots;
+CREATE TRIGGER trg_appointment_slots_availability_ins_del
+    AFTER INSERT OR DELETE ON appointment_slots
+    FOR EACH ROW EXECUTE FUNCTION s_appointment_slots_availability_trg();
+
+DROP TRIGGER IF EXISTS trg_appointment_slots_availability_upd ON appointment_slots;
+CREATE TRIGGER trg_appointment_slots_availability_upd
+    AFTER UPDATE OF is_booked, is_blocked, slot_date, schedule_id ON appointment_slots
+    FOR EACH ROW
+    WHEN ((OLD.is_booked, OLD.is_blocked, OLD.slot_date, OLD.schedule_id)
+          IS DISTINCT FROM (NEW.is_booked, NEW.is_blocked, NEW.slot_date, NEW.schedule_id))
+    EXECUTE FUNCTION s_appointment_slots_availability_trg();
+
+DROP TRIGGER IF EXISTS trg_lab_test_slots_availability_ins_del ON lab_test_slots;
+CREATE TRIGGER trg_lab_test_slots_availability_ins_del
+    AFTER INSERT OR DELETE ON lab_test_slots
+    FOR EACH ROW EXECUTE FUNCTION s_lab_test_slots_availability_trg();
+
+DROP TRIGGER IF EXISTS trg_lab_test_slots_availability_upd ON lab_test_slots;
+CREATE TRIGGER trg_lab_test_slots_availability_upd
+    AFTER UPDATE OF booked_count, capacity, is_active, slot_date, lab_id ON lab_test_slots
+    FOR EACH ROW
+    WHEN ((OLD.booked_count, OLD.capacity, OLD.is_active, OLD.slot_date, OLD.lab_id)
+          IS DISTINCT FROM (NEW.booked_count, NEW.capacity, NEW.is_active, NEW.slot_date, NEW.lab_id))
+    EXECUTE FUNCTION s_lab_test_slots_availability_trg();
+
+
+-- Rebuilds every row from p_from onwards; used to seed the table and to
+-- repair drift. Past days are dropped since nothing reads them.
+CREATE OR REPLACE FUNCTION s_rebuild_availability(p_from DATE DEFAULT CURRENT_DATE)
+RETURNS INT
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_rows INT;
+BEGIN
+    DELETE FROM slot_availability_daily;
+
+    INSERT INTO slot_availability_daily
+        (target_type, target_id, slot_date, free_slots, first_free_slot_id, first_free_time)
+    SELECT 'DOCTOR', ds.doctor_id, s.slot_date,
+           COUNT(*) FILTER (WHERE NOT s.is_booked AND NOT s.is_blocked),
+           (ARRAY_AGG(s.slot_id ORDER BY s.start_time)
+                FILTER (WHERE NOT s.is_booked AND NOT s.is_blocked))[1],
+           MIN(s.start_time) FILTER (WHERE NOT s.is_booked AND NOT s.is_blocked)
+    FROM appointment_slots s
+    JOIN doctor_schedules ds ON ds.schedule_id = s.schedule_id
+    WHERE s.slot_date >= p_from
+    GROUP BY ds.doctor_id, s.slot_date;
+
+    INSERT INTO slot_availability_daily
+        (target_type, target_id, slot_date, free_slots, first_free_slot_id, first_free_time)
+    SELECT 'LAB', s.lab_id, s.slot_date,
+           COUNT(*) FILTER (WHERE s.is_active AND s.booked_count < s.capacity),
+           (ARRAY_AGG(s.slot_id ORDER BY s.start_time)
+                FILTER (WHERE s.is_active AND s.booked_count < s.capacity))[1],
+           MIN(s.start_time) FILTER (WHERE s.is_active AND s.booked_count < s.capacity)
+    FROM lab_test_slots s
+    WHERE s.slot_date >= p_from
+    GROUP BY s.lab_id, s.slot_date;
+
+    SELECT COUNT(*) INTO v_rows FROM slot_availability_daily;
+    RETURN v_rows;
+END;
+$$;
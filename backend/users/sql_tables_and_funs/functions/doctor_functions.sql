@@ -440,6 +440,312 @@ END;
 $$;
 
 
+-- Verified, active doctors with their availability summary for the public
+-- directory; one query regardless of how many doctors are listed, with each
+-- doctor's specializations aggregated in the same order as
+-- d_get_specializations.
+DROP FUNCTION IF EXISTS d_list_doctor_directory(date);
+CREATE OR REPLACE FUNCTION d_list_doctor_directory(p_today date DEFAULT CURRENT_DATE)
+RETURNS TABLE(
+    doctor_id           uuid,
+    full_name           varchar,
+    email               varchar,
+    phone_number        varchar,
+    consultation_fee    numeric,
+    experience_years    numeric,
+    registration_number varchar,
+    is_active           boolean,
+    verification_status varchar,
+    verified_at         timestamptz,
+    verification_notes  text,
+    created_at          timestamptz,
+    updated_at          timestamptz,
+    gender              varchar,
+    verified_by         uuid,
+    next_slot_id        int,
+    next_slot_date      date,
+    next_start_time     time,
+    free_today          int,
+    free_next_7_days    int,
+    specializations     jsonb
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        d.doctor_id,
+        d.full_name,
+        u.email,
+        d.phone_number,
+        d.consultation_fee,
+        d.experience_years,
+        d.registration_number,
+        u.is_active,
+        d.verification_status,
+        d.verified_at,
+        d.verification_notes,
+        d.created_at,
+        d.updated_at,
+        g.gender_value,
+        d.verified_by_id,
+        nxt.first_free_slot_id,
+        nxt.slot_date,
+        nxt.first_free_time,
+        COALESCE(wk.free_today, 0)::int,
+        COALESCE(wk.free_week, 0)::int,
+        COALESCE(sp.specializations, '[]'::jsonb)
+    FROM doctors d
+    JOIN users u ON u.user_id = d.doctor_id
+    LEFT JOIN genders g ON d.gender_id = g.gender_id
+    LEFT JOIN LATERAL (
+        SELECT a.first_free_slot_id, a.slot_date, a.first_free_time
+        FROM slot_availability_daily a
+        WHERE a.target_type = 'DOCTOR'
+          AND a.target_id = d.doctor_id
+          AND a.slot_date >= p_today
+          AND a.free_slots > 0
+        ORDER BY a.slot_date
+        LIMIT 1
+    ) nxt ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT SUM(a.free_slots) FILTER (WHERE a.slot_date = p_today) AS free_today,
+               SUM(a.free_slots) AS free_week
+        FROM slot_availability_daily a
+        WHERE a.target_type = 'DOCTOR'
+          AND a.target_id = d.doctor_id
+          AND a.slot_date BETWEEN p_today AND p_today + 6
+    ) wk ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(
+                   jsonb_build_object(
+                       'id', ds.id,
+                       'specialization_id', ds.specialization_id,
+                       'specialization_name', s.specialization_name,
+                       'description', s.description,
+                       'spec_is_active', s.is_active,
+                       'is_primary', ds.is_primary,
+                       'years_in_specialty', ds.years_in_specialty,
+                       'created_at', ds.created_at
+                   )
+                   ORDER BY ds.is_primary DESC, ds.created_at
+               ) AS specializations
+        FROM doctor_specializations ds
+        JOIN specializations s ON s.specialization_id = ds.specialization_id
+        WHERE ds.doctor_id = d.doctor_id
+    ) sp ON TRUE
+    WHERE u.is_active
+      AND d.verification_status = 'VERIFIED'
+    ORDER BY d.created_at DESC;
+$$;
+
+
+-- Single round trip booking: claims the slot with a conditional UPDATE
+-- (concurrent callers serialise on the row and re-check the predicate, so
+-- exactly one wins; a live checkout hold by another patient also blocks it),
+-- inserts the appointment and returns it enriched the
+-- same way get_appointment_by_id does.
+CREATE OR REPLACE FUNCTION d_book_slot(
+    p_patient_id       uuid,
+    p_slot_id          int,
+    p_appointment_type varchar DEFAULT 'in_person',
+    p_reason           text    DEFAULT NULL,
+    p_today            date    DEFAULT CURRENT_DATE
+)
+RETURNS TABLE(
+    appointment_id      int,
+    appointment_type    varchar,
+    status              varchar,
+    reason              text,
+    cancellation_reason text,
+    created_at          timestamptz,
+    updated_at          timestamptz,
+    cancelled_by_id     uuid,
+    doctor_id           uuid,
+    patient_id          uuid,
+    slot_id             int,
+    doctor_name         varchar,
+    patient_email       varchar,
+    slot_date           date,
+    start_time          time,
+    end_time            time
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_doctor_id  uuid;
+    v_slot_date  date;
+    v_start_time time;
+    v_end_time   time;
+    v_is_booked  boolean;
+    v_is_blocked boolean;
+BEGIN
+    UPDATE appointment_slots s
+    SET is_booked = TRUE
+    FROM doctor_schedules ds
+    WHERE s.slot_id = p_slot_id
+      AND ds.schedule_id = s.schedule_id
+      AND NOT s.is_booked
+      AND NOT s.is_blocked
+      AND s.slot_date >= p_today
+      AND h_other_holds('DOCTOR', s.slot_id, p_patient_id) = 0
+    RETURNING ds.doctor_id, s.slot_date, s.start_time, s.end_time
+    INTO v_doctor_id, v_slot_date, v_start_time, v_end_time;
+
+    IF NOT FOUND THEN
+        SELECT s.is_booked, s.is_blocked, s.slot_date
+        INTO v_is_booked, v_is_blocked, v_slot_date
+        FROM appointment_slots s
+        WHERE s.slot_id = p_slot_id;
+
+        IF NOT FOUND THEN RAISE EXCEPTION 'SLOT_NOT_FOUND'; END IF;
+        IF v_is_booked  THEN RAISE EXCEPTION 'SLOT_ALREADY_BOOKED'; END IF;
+        IF v_is_blocked THEN RAISE EXCEPTION 'SLOT_BLOCKED'; END IF;
+        IF v_slot_date < p_today THEN RAISE EXCEPTION 'SLOT_IN_PAST'; END IF;
+        RAISE EXCEPTION 'SLOT_HELD';
+    END IF;
+
+    RETURN QUERY
+    WITH ins AS (
+        INSERT INTO doctor_appointments
+            (doctor_id, patient_id, slot_id, appointment_type, status, reason, created_at, updated_at)
+        VALUES
+            (v_doctor_id, p_patient_id, p_slot_id, p_appointment_type, 'confirmed', p_reason, NOW(), NOW())
+        RETURNING *
+    )
+    SELECT
+        ins.appointment_id,
+        ins.appointment_type,
+        ins.status,
+        ins.reason,
+        ins.cancellation_reason,
+        ins.created_at,
+        ins.updated_at,
+        ins.cancelled_by_id,
+        ins.doctor_id,
+        ins.patient_id,
+        ins.slot_id,
+        d.full_name,
+        u.email,
+        v_slot_date,
+        v_start_time,
+        v_end_time
+    FROM ins
+    JOIN doctors d ON d.doctor_id = ins.doctor_id
+    JOIN users u   ON u.user_id = ins.patient_id;
+END;
+$$;
+
+-- Moves an appointment to another slot of the same doctor in one
+-- transaction. The appointment row is locked first, then both slots in
+-- slot_id order, so two reschedules crossing the same pair of slots cannot
+-- deadlock and nobody can take the new slot in between.
+CREATE OR REPLACE FUNCTION d_reschedule_appointment(
+    p_appointment_id int,
+    p_new_slot_id    int,
+    p_user_id        uuid,
+    p_today          date DEFAULT CURRENT_DATE
+)
+RETURNS TABLE(
+    appointment_id      int,
+    appointment_type    varchar,
+    status              varchar,
+    reason              text,
+    cancellation_reason text,
+    created_at          timestamptz,
+    updated_at          timestamptz,
+    cancelled_by_id     uuid,
+    doctor_id           uuid,
+    patient_id          uuid,
+    slot_id             int,
+    doctor_name         varchar,
+    patient_email       varchar,
+    slot_date           date,
+    start_time          time,
+    end_time            time
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_appt       doctor_appointments%ROWTYPE;
+    v_doctor_id  uuid;
+    v_is_booked  boolean;
+    v_is_blocked boolean;
+    v_slot_date  date;
+BEGIN
+    SELECT da.* INTO v_appt
+    FROM doctor_appointments da
+    WHERE da.appointment_id = p_appointment_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN RAISE EXCEPTION 'APPOINTMENT_NOT_FOUND'; END IF;
+    IF p_user_id NOT IN (v_appt.patient_id, v_appt.doctor_id) THEN
+        RAISE EXCEPTION 'NOT_AUTHORISED';
+    END IF;
+    IF v_appt.status IN ('cancelled', 'completed') THEN
+        RAISE EXCEPTION 'APPOINTMENT_CLOSED';
+    END IF;
+    IF v_appt.slot_id = p_new_slot_id THEN RAISE EXCEPTION 'SAME_SLOT'; END IF;
+
+    PERFORM 1
+    FROM appointment_slots s
+    WHERE s.slot_id IN (v_appt.slot_id, p_new_slot_id)
+    ORDER BY s.slot_id
+    FOR UPDATE;
+
+    SELECT ds.doctor_id, s.is_booked, s.is_blocked, s.slot_date
+    INTO v_doctor_id, v_is_booked, v_is_blocked, v_slot_date
+    FROM appointment_slots s
+    JOIN doctor_schedules ds ON ds.schedule_id = s.schedule_id
+    WHERE s.slot_id = p_new_slot_id;
+
+    IF NOT FOUND THEN RAISE EXCEPTION 'SLOT_NOT_FOUND'; END IF;
+    IF v_doctor_id <> v_appt.doctor_id THEN RAISE EXCEPTION 'SLOT_WRONG_DOCTOR'; END IF;
+    IF v_is_booked  THEN RAISE EXCEPTION 'SLOT_ALREADY_BOOKED'; END IF;
+    IF v_is_blocked THEN RAISE EXCEPTION 'SLOT_BLOCKED'; END IF;
+    IF v_slot_date < p_today THEN RAISE EXCEPTION 'SLOT_IN_PAST'; END IF;
+    IF h_other_holds('DOCTOR', p_new_slot_id, v_appt.patient_id) > 0 THEN
+        RAISE EXCEPTION 'SLOT_HELD';
+    END IF;
+
+    PERFORM s_lock_availability_days(
+        'DOCTOR',
+        ARRAY[v_appt.doctor_id, v_appt.doctor_id],
+        ARRAY(SELECT s.slot_date FROM appointment_slots s
+              WHERE s.slot_id IN (v_appt.slot_id, p_new_slot_id))
+    );
+
+    UPDATE appointment_slots s
+    SET is_booked = TRUE
+    WHERE s.slot_id = p_new_slot_id;
+
+    PERFORM d_release_slot(v_appt.slot_id);
+
+    UPDATE doctor_appointments da
+    SET slot_id = p_new_slot_id, updated_at = NOW()
+    WHERE da.appointment_id = p_appointment_id;
+
+    RETURN QUERY
+    SELECT
+        da.appointment_id,
+        da.appointment_type,
+        da.status,
+        da.reason,
+        da.cancellation_reason,
+        da.created_at,
+        da.updated_at,
+        da.cancelled_by_id,
+        da.doctor_id,
+        da.patient_id,
+        da.slot_id,
+        d.full_name,
+        u.email,
+        s.slot_date,
+        s.start_time,
+        s.end_time
+    FROM doctor_appointments da
+    JOIN doctors d           ON d.doctor_id = da.doctor_id
+    JOIN users u             ON u.user_id = da.patient_id
+    JOIN appointment_slots s ON s.slot_id = da.slot_id
+    WHERE da.appointment_id = p_appointment_id;
+END;
+$$;
+
 CREATE OR REPLACE FUNCTION d_cancel_appointment(
     p_appointment_id   int,
     p_cancelled_by_id  uuid,
@@ -463,9 +769,11 @@ END;
 $$;
 
 
+DROP FUNCTION IF EXISTS d_get_appointments(uuid, uuid);
 CREATE OR REPLACE FUNCTION d_get_appointments(
     p_doctor_id  uuid DEFAULT NULL,
-    p_patient_id uuid DEFAULT NULL
+    p_patient_id uuid DEFAULT NULL,
+    p_since      timestamptz DEFAULT NULL
 )
 RETURNS TABLE(
     appointment_id      int,
@@ -510,6 +818,370 @@ BEGIN
     WHERE
         (p_doctor_id  IS NULL OR da.doctor_id  = p_doctor_id)
         AND (p_patient_id IS NULL OR da.patient_id = p_patient_id)
+        AND (p_since IS NULL OR da.updated_at > p_since)
     ORDER BY da.created_at ASC;
 END;
-$$;
\ No newline at end of file
+$$;
+
+
+-- A doctor's agenda for a date range with the patient summary the front
+-- desk needs. Slots are found through the (schedule_id, slot_date,
+-- start_time) unique index and appointments through their slot_id index,
+-- so the cost follows the size of the window, not the doctor's history.
+-- Pages are keyset-based: pass the (slot_date, start_time, appointment_id)
+-- of the last row seen.
+CREATE OR REPLACE FUNCTION d_get_doctor_agenda(
+    p_doctor_id         uuid,
+    p_from              date,
+    p_to                date,
+    p_after_date        date    DEFAULT NULL,
+    p_after_time        time    DEFAULT NULL,
+    p_after_id          int     DEFAULT NULL,
+    p_limit             int     DEFAULT 50,
+    p_include_cancelled boolean DEFAULT FALSE
+)
+RETURNS TABLE(
+    appointment_id   int,
+    slot_id          int,
+    slot_date        date,
+    start_time       time,
+    end_time         time,
+    appointment_type varchar,
+    status           varchar,
+    reason           text,
+    patient_id       uuid,
+    patient_name     varchar,
+    patient_age      int,
+    patient_mobile   varchar,
+    last_visit_date  date,
+    prescription_id  uuid,
+    has_prescription boolean,
+    updated_at       timestamptz
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        da.appointment_id,
+        s.slot_id,
+        s.slot_date,
+        s.start_time,
+        s.end_time,
+        da.appointment_type,
+        da.status,
+        da.reason,
+        da.patient_id,
+        p.full_name,
+        date_part('year', age(p.date_of_birth))::int,
+        p.mobile,
+        lv.last_visit_date,
+        rx.prescription_id,
+        rx.prescription_id IS NOT NULL,
+        da.updated_at
+    FROM doctor_schedules ds
+    JOIN appointment_slots s
+      ON s.schedule_id = ds.schedule_id
+     AND s.slot_date BETWEEN p_from AND p_to
+    JOIN doctor_appointments da
+      ON da.slot_id = s.slot_id
+     AND da.doctor_id = p_doctor_id
+    LEFT JOIN patients p       ON p.patient_id = da.patient_id
+    LEFT JOIN prescriptions rx ON rx.appointment_id = da.appointment_id
+    LEFT JOIN LATERAL (
+        SELECT MAX(s2.slot_date) AS last_visit_date
+        FROM doctor_appointments da2
+        JOIN appointment_slots s2 ON s2.slot_id = da2.slot_id
+        WHERE da2.doctor_id  = p_doctor_id
+          AND da2.patient_id = da.patient_id
+          AND da2.status     = 'completed'
+          AND s2.slot_date   < s.slot_date
+    ) lv ON TRUE
+    WHERE ds.doctor_id = p_doctor_id
+      AND (p_include_cancelled OR da.status <> 'cancelled')
+      AND (p_after_date IS NULL
+           OR (s.slot_date, s.start_time, da.appointment_id)
+              > (p_after_date, p_after_time, p_after_id))
+    ORDER BY s.slot_date, s.start_time, da.appointment_id
+    LIMIT p_limit;
+$$;
+
+
+-- Cheap fingerprint of an agenda window for ETag checks: it changes
+-- whenever an appointment in the window is booked, moved, cancelled or
+-- updated, or one of their prescriptions is written.
+CREATE OR REPLACE FUNCTION d_get_doctor_agenda_version(
+    p_doctor_id uuid,
+    p_from      date,
+    p_to        date
+)
+RETURNS TABLE(
+    appointment_count bigint,
+    last_updated_at   timestamptz
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        COUNT(*),
+        GREATEST(MAX(da.updated_at), MAX(rx.updated_at))
+    FROM doctor_schedules ds
+    JOIN appointment_slots s
+      ON s.schedule_id = ds.schedule_id
+     AND s.slot_date BETWEEN p_from AND p_to
+    JOIN doctor_appointments da
+      ON da.slot_id = s.slot_id
+     AND da.doctor_id = p_doctor_id
+    LEFT JOIN prescriptions rx ON rx.appointment_id = da.appointment_id
+    WHERE ds.doctor_id = p_doctor_id;
+$$;
+
+
+-- True when exception e covers the slot. Used by every exception query so
+-- block, unblock and conflict reports agree on what "covered" means.
+CREATE OR REPLACE FUNCTION d_exception_covers(
+    e            schedule_exceptions,
+    p_doctor_id  uuid,
+    p_slot_date  date,
+    p_start_time time,
+    p_end_time   time
+)
+RETURNS boolean
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT (e.doctor_id IS NULL OR e.doctor_id = p_doctor_id)
+       AND p_slot_date BETWEEN e.start_date AND e.end_date
+       AND (e.start_time IS NULL
+            OR (p_start_time < e.end_time AND p_end_time > e.start_time));
+$$;
+
+
+-- Locks the given slots in slot_id order and then their availability days
+-- in (doctor_id, slot_date) order, the same order d_reschedule_appointment
+-- takes them in. Call before any UPDATE that may touch slots on several
+-- days, so its per-row availability triggers find their days already held.
+CREATE OR REPLACE FUNCTION d_lock_slots_and_days(p_slot_ids int[])
+RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM 1
+    FROM appointment_slots s
+    WHERE s.slot_id = ANY(p_slot_ids)
+    ORDER BY s.slot_id
+    FOR UPDATE;
+
+    PERFORM s_lock_availability_days(
+        'DOCTOR', array_agg(ds.doctor_id), array_agg(s.slot_date)
+    )
+    FROM appointment_slots s
+    JOIN doctor_schedules ds ON ds.schedule_id = s.schedule_id
+    WHERE s.slot_id = ANY(p_slot_ids);
+END;
+$$;
+
+
+-- Frees a booked slot. If an exception still covers it (leave taken while
+-- it was booked), the slot goes back to that exception rather than the
+-- open schedule. Returns TRUE when the slot is bookable again.
+CREATE OR REPLACE FUNCTION d_release_slot(p_slot_id int)
+RETURNS boolean
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_blocked boolean;
+BEGIN
+    PERFORM d_lock_slots_and_days(ARRAY[p_slot_id]);
+
+    UPDATE appointment_slots s
+    SET is_booked = FALSE,
+        blocked_exception_id = o.exception_id,
+        is_blocked = (o.exception_id IS NOT NULL)
+    FROM (
+        SELECT s2.slot_id,
+               (SELECT e.exception_id
+                FROM schedule_exceptions e
+                WHERE d_exception_covers(e, ds.doctor_id, s2.slot_date,
+                                         s2.start_time, s2.end_time)
+                ORDER BY e.exception_id
+                LIMIT 1) AS exception_id
+        FROM appointment_slots s2
+        JOIN doctor_schedules ds ON ds.schedule_id = s2.schedule_id
+        WHERE s2.slot_id = p_slot_id
+    ) o
+    WHERE s.slot_id = o.slot_id
+    RETURNING s.is_blocked INTO v_blocked;
+
+    RETURN FOUND AND NOT v_blocked;
+END;
+$$;
+
+
+-- Records an exception and blocks every free slot it covers with one
+-- UPDATE. Booked slots are left alone and returned in conflicts so the
+-- caller can contact or move those patients.
+CREATE OR REPLACE FUNCTION d_create_schedule_exception(
+    p_doctor_id  uuid,
+    p_start_date date,
+    p_end_date   date,
+    p_start_time time,
+    p_end_time   time,
+    p_reason     text,
+    p_created_by uuid
+)
+RETURNS TABLE(
+    exception_id  int,
+    doctor_id     uuid,
+    start_date    date,
+    end_date      date,
+    start_time    time,
+    end_time      time,
+    reason        text,
+    created_at    timestamptz,
+    blocked_slots int,
+    conflicts     jsonb
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_exc       schedule_exceptions%ROWTYPE;
+    v_slot_ids  int[];
+    v_blocked   int;
+    v_conflicts jsonb;
+BEGIN
+    INSERT INTO schedule_exceptions
+        (doctor_id, start_date, end_date, start_time, end_time, reason, created_by)
+    VALUES
+        (p_doctor_id, p_start_date, p_end_date, p_start_time, p_end_time, p_reason, p_created_by)
+    RETURNING * INTO v_exc;
+
+    v_slot_ids := ARRAY(
+        SELECT s.slot_id
+        FROM appointment_slots s
+        JOIN doctor_schedules ds ON ds.schedule_id = s.schedule_id
+        WHERE (v_exc.doctor_id IS NULL OR ds.doctor_id = v_exc.doctor_id)
+          AND s.slot_date BETWEEN v_exc.start_date AND v_exc.end_date
+          AND NOT s.is_booked
+          AND NOT s.is_blocked
+          AND d_exception_covers(v_exc, ds.doctor_id, s.slot_date, s.start_time, s.end_time)
+    );
+    PERFORM d_lock_slots_and_days(v_slot_ids);
+
+    -- Re-checked under the lock: a slot may have been booked meanwhile.
+    UPDATE appointment_slots s
+    SET is_blocked = TRUE,
+        blocked_exception_id = v_exc.exception_id
+    WHERE s.slot_id = ANY(v_slot_ids)
+      AND NOT s.is_booked
+      AND NOT s.is_blocked;
+
+    GET DIAGNOSTICS v_blocked = ROW_COUNT;
+
+    SELECT COALESCE(
+               jsonb_agg(
+                   jsonb_build_object(
+                       'appointment_id', da.appointment_id,
+                       'doctor_id',      da.doctor_id,
+                       'doctor_name',    d.full_name,
+                       'patient_id',     da.patient_id,
+                       'patient_name',   p.full_name,
+                       'patient_email',  u.email,
+                       'slot_id',        s.slot_id,
+                       'slot_date',      s.slot_date,
+                       'start_time',     s.start_time,
+                       'end_time',       s.end_time
+                   )
+                   ORDER BY s.slot_date, s.start_time, d.full_name
+               ),
+               '[]'::jsonb
+           )
+    INTO v_conflicts
+    FROM appointment_slots s
+    JOIN doctor_schedules ds    ON ds.schedule_id = s.schedule_id
+    JOIN doctor_appointments da ON da.slot_id = s.slot_id
+    JOIN doctors d              ON d.doctor_id = da.doctor_id
+    JOIN patients p             ON p.patient_id = da.patient_id
+    JOIN users u                ON u.user_id = da.patient_id
+    WHERE (v_exc.doctor_id IS NULL OR ds.doctor_id = v_exc.doctor_id)
+      AND s.slot_date BETWEEN v_exc.start_date AND v_exc.end_date
+      AND s.is_booked
+      AND da.status NOT IN ('cancelled', 'completed')
+      AND d_exception_covers(v_exc, ds.doctor_id, s.slot_date, s.start_time, s.end_time);
+
+    RETURN QUERY
+    SELECT v_exc.exception_id, v_exc.doctor_id, v_exc.start_date, v_exc.end_date,
+           v_exc.start_time, v_exc.end_time, v_exc.reason, v_exc.created_at,
+           v_blocked, v_conflicts;
+END;
+$$;
+
+
+-- Removes an exception and, in one UPDATE, hands each slot it blocked to
+-- another exception that still covers it or unblocks it. p_doctor_id limits
+-- the delete to that doctor's own exceptions; pass NULL for admins. Returns
+-- no row when there is nothing to delete.
+CREATE OR REPLACE FUNCTION d_delete_schedule_exception(
+    p_exception_id int,
+    p_doctor_id    uuid DEFAULT NULL
+)
+RETURNS TABLE(unblocked_slots int)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_slot_ids  int[];
+    v_unblocked int;
+BEGIN
+    PERFORM 1
+    FROM schedule_exceptions e
+    WHERE e.exception_id = p_exception_id
+      AND (p_doctor_id IS NULL OR e.doctor_id = p_doctor_id)
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    v_slot_ids := ARRAY(
+        SELECT s.slot_id FROM appointment_slots s
+        WHERE s.blocked_exception_id = p_exception_id
+    );
+    PERFORM d_lock_slots_and_days(v_slot_ids);
+
+    WITH released AS (
+        UPDATE appointment_slots s
+        SET blocked_exception_id = o.other_id,
+            is_blocked = (o.other_id IS NOT NULL)
+        FROM (
+            SELECT s2.slot_id,
+                   (SELECT e.exception_id
+                    FROM schedule_exceptions e
+                    WHERE e.exception_id <> p_exception_id
+                      AND d_exception_covers(e, ds.doctor_id, s2.slot_date,
+                                             s2.start_time, s2.end_time)
+                    ORDER BY e.exception_id
+                    LIMIT 1) AS other_id
+            FROM appointment_slots s2
+            JOIN doctor_schedules ds ON ds.schedule_id = s2.schedule_id
+            WHERE s2.slot_id = ANY(v_slot_ids)
+              AND s2.blocked_exception_id = p_exception_id
+        ) o
+        WHERE s.slot_id = o.slot_id
+        RETURNING s.is_blocked
+    )
+    SELECT COUNT(*) FILTER (WHERE NOT released.is_blocked)::int
+    INTO v_unblocked
+    FROM released;
+
+    DELETE FROM schedule_exceptions e WHERE e.exception_id = p_exception_id;
+
+    unblocked_slots := v_unblocked;
+    RETURN NEXT;
+END;
+$$;
+
+
+-- A doctor's own exceptions plus clinic-wide ones ending on or after
+-- p_from; every exception when p_doctor_id is NULL.
+CREATE OR REPLACE FUNCTION d_list_schedule_exceptions(
+    p_doctor_id uuid,
+    p_from      date
+)
+RETURNS SETOF schedule_exceptions
+LANGUAGE sql STABLE AS $$
+    SELECT e.*
+    FROM schedule_exceptions e
+    WHERE e.end_date >= p_from
+      AND (p_doctor_id IS NULL OR e.doctor_id IS NULL OR e.doctor_id = p_doctor_id)
+    ORDER BY e.start_date, e.start_time NULLS FIRST;
+$$;
+
@@ -0,0 +1,127 @@
+-- backend\users\sql_tables_and_funs\functions\email_outbox_functions.sql
+CREATE OR REPLACE FUNCTION e_enqueue_email(
+    p_to_email     VARCHAR,
+    p_subject      VARCHAR,
+    p_text_body    TEXT,
+    p_html_body    TEXT    DEFAULT NULL,
+    p_category     VARCHAR DEFAULT NULL,
+    p_max_attempts INT     DEFAULT 5
+)
+RETURNS BIGINT
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_email_id BIGINT;
+BEGIN
+    INSERT INTO email_outbox (to_email, subject, text_body, html_body, category, max_attempts)
+    VALUES (p_to_email, p_subject, p_text_body, p_html_body, p_category, p_max_attempts)
+    RETURNING email_id INTO v_email_id;
+
+    RETURN v_email_id;
+END;
+$$;
+
+
+-- Claims up to p_limit due messages for one worker. Rows stuck in SENDING
+-- longer than p_lease_seconds (crashed worker) are reclaimed as well.
+CREATE OR REPLACE FUNCTION e_claim_email_batch(
+    p_worker        VARCHAR,
+    p_limit         INT DEFAULT 50,
+    p_lease_seconds INT DEFAULT 300
+)
+RETURNS TABLE (
+    email_id     BIGINT,
+    to_email     VARCHAR,
+    subject      VARCHAR,
+    text_body    TEXT,
+    html_body    TEXT,
+    category     VARCHAR,
+    attempts     INT,
+    max_attempts INT
+)
+LANGUAGE plpgsql AS $$
+BEGIN
+    RETURN QUERY
+    UPDATE email_outbox o
+    SET status     = 'SENDING',
+        attempts   = o.attempts + 1,
+        locked_at  = NOW(),
+        locked_by  = p_worker,
+        updated_at = NOW()
+    WHERE o.email_id IN (
+        SELECT c.email_id
+        FROM email_outbox c
+        WHERE (c.status = 'PENDING' AND c.next_attempt_at <= NOW())
+           OR (c.status = 'SENDING'
+               AND c.locked_at < NOW() - make_interval(secs => p_lease_seconds))
+        ORDER BY c.next_attempt_at
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING o.email_id, o.to_email, o.subject, o.text_body, o.html_body,
+              o.category, o.attempts, o.max_attempts;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION e_mark_email_sent(p_email_id BIGINT)
+RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE email_outbox
+    SET status     = 'SENT',
+        sent_at    = NOW(),
+        locked_at  = NULL,
+        last_error = NULL,
+        updated_at = NOW()
+    WHERE email_id = p_email_id;
+END;
+$$;
+
+
+-- Schedules a retry after p_backoff_seconds, or gives up once attempts
+-- reaches max_attempts. Returns the resulting status.
+CREATE OR REPLACE FUNCTION e_mark_email_failed(
+    p_email_id        BIGINT,
+    p_error           TEXT,
+    p_backoff_seconds INT
+)
+RETURNS VARCHAR
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_status VARCHAR;
+BEGIN
+    UPDATE email_outbox
+    SET status          = CASE WHEN attempts >= max_attempts THEN 'FAILED' ELSE 'PENDING' END,
+        next_attempt_at = NOW() + make_interval(secs => p_backoff_seconds),
+        last_error      = p_error,
+        locked_at       = NULL,
+        updated_at      = NOW()
+    WHERE email_id = p_email_id
+    RETURNING status INTO v_status;
+
+    RETURN v_status;
+END;
+$$;
+
+
+-- Bulk variant used for fan-out sends. Ids are returned in input order.
+CREATE OR REPLACE FUNCTION e_enqueue_email_batch(
+    p_to_emails    VARCHAR[],
+    p_subjects     VARCHAR[],
+    p_text_bodies  TEXT[],
+    p_html_bodies  TEXT[],
+    p_category     VARCHAR DEFAULT NULL,
+    p_max_attempts INT     DEFAULT 5
+)
+RETURNS TABLE (email_id BIGINT)
+LANGUAGE plpgsql AS $$
+BEGIN
+    RETURN QUERY
+    INSERT INTO email_outbox (to_email, subject, text_body, html_body, category, max_attempts)
+    SELECT m.to_email, m.subject, m.text_body, m.html_body, p_category, p_max_attempts
+    FROM unnest(p_to_emails, p_subjects, p_text_bodies, p_html_bodies)
+         WITH ORDINALITY AS m(to_email, subject, text_body, html_body, ord)
+    ORDER BY m.ord
+    RETURNING email_outbox.email_id;
+END;
+$$;
@@ -100,4 +100,182 @@ begin
         from error_logs el
         where el.error_key = p_error_key;
 end;
-$$;
\ No newline at end of file
+$$;
+
+
+create table if not exists error_log_groups (
+    group_id          serial        primary key,
+    error_key         uuid          not null default gen_random_uuid(),
+    fingerprint       varchar(64)   not null,
+    window_start      timestamptz   not null,
+    exception_type    varchar(255),
+    ref_from          varchar(255),
+    description       text,
+    occurrence_count  int           not null default 0,
+    first_seen        timestamptz   not null default now(),
+    last_seen         timestamptz   not null default now(),
+    last_created_by   uuid,
+    constraint error_log_groups_fingerprint_window_uniq unique (fingerprint, window_start)
+);
+
+create index if not exists idx_error_log_groups_last_seen
+    on error_log_groups (last_seen desc);
+
+create unique index if not exists error_log_groups_error_key_uniq
+    on error_log_groups (error_key);
+
+
+create or replace function upsert_error_log_group (
+    p_fingerprint     varchar,
+    p_window_start    timestamptz,
+    p_exception_type  varchar,
+    p_ref_from        varchar,
+    p_description     text,
+    p_count           int,
+    p_first_seen      timestamptz,
+    p_last_seen       timestamptz,
+    p_created_by      uuid default null
+)
+returns table (
+    group_id   int,
+    error_key  uuid
+)
+language plpgsql
+as $$
+begin
+    return query
+    insert into error_log_groups as g (
+        fingerprint, window_start, exception_type, ref_from, description,
+        occurrence_count, first_seen, last_seen, last_created_by
+    )
+    values (
+        p_fingerprint, p_window_start, p_exception_type, p_ref_from, p_description,
+        p_count, p_first_seen, p_last_seen, p_created_by
+    )
+    on conflict (fingerprint, window_start) do update
+    set occurrence_count = g.occurrence_count + excluded.occurrence_count,
+        first_seen       = least(g.first_seen, excluded.first_seen),
+        last_seen        = greatest(g.last_seen, excluded.last_seen),
+        description      = coalesce(excluded.description, g.description),
+        ref_from         = coalesce(excluded.ref_from, g.ref_from),
+        last_created_by  = coalesce(excluded.last_created_by, g.last_created_by)
+    returning g.group_id, g.error_key;
+
+exception
+    when others then
+        raise warning '[upsert_error_log_group] Failed to upsert group: %', sqlerrm;
+        return;
+end;
+$$;
+
+
+-- error_id and created_at keep the field names of the old per-row
+-- error_logs listing, which the admin page still reads.
+drop function if exists get_error_log_groups(uuid, varchar, timestamptz, timestamptz, int);
+create or replace function get_error_log_groups (
+    p_created_by  uuid         default null,
+    p_ref_from    varchar      default null,
+    p_from        timestamptz  default null,
+    p_to          timestamptz  default now(),
+    p_limit       int          default 100
+)
+returns table (
+    error_key         uuid,
+    fingerprint       varchar,
+    exception_type    varchar,
+    ref_from          varchar,
+    description       text,
+    occurrence_count  bigint,
+    window_count      bigint,
+    first_seen        timestamptz,
+    last_seen         timestamptz,
+    created_by        uuid,
+    error_id          int,
+    created_at        timestamptz
+)
+language plpgsql
+as $$
+begin
+    return query
+        with agg as (
+            select
+                g.fingerprint,
+                sum(g.occurrence_count)  as total_count,
+                count(*)                 as windows,
+                min(g.first_seen)        as first_seen,
+                max(g.last_seen)         as last_seen
+            from error_log_groups g
+            where
+                (p_created_by is null or g.last_created_by = p_created_by)
+                and (p_ref_from is null or g.ref_from ilike '%' || p_ref_from || '%')
+                and (p_from     is null or g.last_seen >= p_from)
+                and (g.first_seen <= p_to)
+            group by g.fingerprint
+        )
+        select
+            latest.error_key,
+            a.fingerprint,
+            latest.exception_type,
+            latest.ref_from,
+            latest.description,
+            a.total_count,
+            a.windows,
+            a.first_seen,
+            a.last_seen,
+            latest.last_created_by,
+            latest.group_id,
+            a.last_seen
+        from agg a
+        join lateral (
+            select g2.group_id, g2.error_key, g2.exception_type, g2.ref_from,
+                   g2.description, g2.last_created_by
+            from error_log_groups g2
+            where g2.fingerprint = a.fingerprint
+            order by g2.window_start desc
+            limit 1
+        ) latest on true
+        order by a.last_seen desc
+        limit p_limit;
+end;
+$$;
+
+
+drop function if exists get_error_log_group_by_key(uuid);
+create or replace function get_error_log_group_by_key (
+    p_error_key uuid
+)
+returns table (
+    error_key         uuid,
+    fingerprint       varchar,
+    window_start      timestamptz,
+    exception_type    varchar,
+    ref_from          varchar,
+    description       text,
+    occurrence_count  int,
+    first_seen        timestamptz,
+    last_seen         timestamptz,
+    created_by        uuid,
+    error_id          int,
+    created_at        timestamptz
+)
+language plpgsql
+as $$
+begin
+    return query
+        select
+            g.error_key,
+            g.fingerprint,
+            g.window_start,
+            g.exception_type,
+            g.ref_from,
+            g.description,
+            g.occurrence_count,
+            g.first_seen,
+            g.last_seen,
+            g.last_created_by,
+            g.group_id,
+            g.last_seen
+        from error_log_groups g
+        where g.error_key = p_error_key;
+end;
+$$;
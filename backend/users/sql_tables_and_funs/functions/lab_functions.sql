@@ -135,6 +135,66 @@ END;
 $$;
 
 
+-- Verified, active labs with their availability summary for the public
+-- directory.
+CREATE OR REPLACE FUNCTION l_list_lab_directory(p_today date DEFAULT CURRENT_DATE)
+RETURNS TABLE(
+    lab_id           uuid,
+    lab_name         varchar,
+    phone_number     varchar,
+    lab_logo         varchar,
+    address_line     text,
+    city             varchar,
+    state            varchar,
+    pincode          varchar,
+    next_slot_id     int,
+    next_slot_date   date,
+    next_start_time  time,
+    free_today       int,
+    free_next_7_days int
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        l.lab_id,
+        l.lab_name,
+        l.phone_number,
+        l.lab_logo,
+        a.address_line,
+        a.city,
+        a.state,
+        a.pincode,
+        nxt.first_free_slot_id,
+        nxt.slot_date,
+        nxt.first_free_time,
+        COALESCE(wk.free_today, 0)::int,
+        COALESCE(wk.free_week, 0)::int
+    FROM labs l
+    JOIN users u ON u.user_id = l.lab_id
+    LEFT JOIN addresses a ON a.user_id = l.lab_id
+    LEFT JOIN LATERAL (
+        SELECT av.first_free_slot_id, av.slot_date, av.first_free_time
+        FROM slot_availability_daily av
+        WHERE av.target_type = 'LAB'
+          AND av.target_id = l.lab_id
+          AND av.slot_date >= p_today
+          AND av.free_slots > 0
+        ORDER BY av.slot_date
+        LIMIT 1
+    ) nxt ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT SUM(av.free_slots) FILTER (WHERE av.slot_date = p_today) AS free_today,
+               SUM(av.free_slots) AS free_week
+        FROM slot_availability_daily av
+        WHERE av.target_type = 'LAB'
+          AND av.target_id = l.lab_id
+          AND av.slot_date BETWEEN p_today AND p_today + 6
+    ) wk ON TRUE
+    WHERE u.is_active
+      AND l.verification_status = 'VERIFIED'
+    ORDER BY l.lab_name;
+$$;
+
+
 CREATE OR REPLACE FUNCTION l_update_lab_profile(
     p_lab_id              uuid,
     p_lab_name            varchar DEFAULT NULL,
@@ -233,6 +293,7 @@ END;
 $$;
 
 
+DROP FUNCTION IF EXISTS l_get_operating_hours(uuid);
 CREATE OR REPLACE FUNCTION l_get_operating_hours(p_lab_id uuid)
 RETURNS TABLE(
     id         int,
@@ -240,12 +301,14 @@ RETURNS TABLE(
     open_time  time,
     close_time time,
     is_closed  boolean,
+    max_bookings int,
     updated_at timestamptz
 )
 LANGUAGE plpgsql AS $$
 BEGIN
     RETURN QUERY
-    SELECT loh.id, loh.day_of_week, loh.open_time, loh.close_time, loh.is_closed, loh.updated_at
+    SELECT loh.id, loh.day_of_week, loh.open_time, loh.close_time, loh.is_closed,
+           loh.max_bookings, loh.updated_at
     FROM lab_operating_hours loh
     WHERE loh.lab_id = p_lab_id
     ORDER BY loh.day_of_week;
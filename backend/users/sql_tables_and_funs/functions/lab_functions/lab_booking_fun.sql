@@ -1,6 +1,10 @@
 -- backend\users\sql_tables_and_funs\functions\lab_functions\lab_booking_fun.sql
 
-CREATE OR REPLACE FUNCTION increment_slot_booked_count(p_slot_id INT)
+DROP FUNCTION IF EXISTS increment_slot_booked_count(INT);
+CREATE OR REPLACE FUNCTION increment_slot_booked_count(
+    p_slot_id    INT,
+    p_patient_id UUID DEFAULT NULL
+)
 RETURNS VOID
 LANGUAGE plpgsql AS $$
 DECLARE
@@ -13,12 +17,9 @@ BEGIN
         s.slot_date,
         s.booked_count,
         s.is_active,
-        COALESCE(oh.max_bookings, 10) AS max_bookings
+        s.capacity AS max_bookings
     INTO v_slot_rec
     FROM lab_test_slots s
-    LEFT JOIN lab_operating_hours oh
-        ON  oh.lab_id      = s.lab_id
-        AND oh.day_of_week = EXTRACT(DOW FROM s.slot_date)::INT
     WHERE s.slot_id = p_slot_id
     FOR UPDATE OF s;
  
@@ -36,7 +37,8 @@ BEGIN
  
     v_max_bookings := v_slot_rec.max_bookings;
  
-    IF v_slot_rec.booked_count >= v_max_bookings THEN
+    -- Seats held at checkout by other patients count against capacity.
+    IF v_slot_rec.booked_count + h_other_holds('LAB', p_slot_id, p_patient_id) >= v_max_bookings THEN
         RAISE EXCEPTION 'Slot % is fully booked (capacity: %).', p_slot_id, v_max_bookings;
     END IF;
  
@@ -147,6 +149,219 @@ $$;
 
 
 
+-- Takes one seat with a single conditional UPDATE (concurrent callers
+-- serialise on the slot row and re-check booked_count, so capacity can never
+-- be exceeded) and creates the booking in the same call.
+CREATE OR REPLACE FUNCTION l_book_lab_slot(
+    p_patient_id        UUID,
+    p_lab_id            UUID,
+    p_slot_id           INT,
+    p_test_id           INT,
+    p_collection_type   VARCHAR(20),
+    p_collection_address JSONB,
+    p_subtotal          NUMERIC(10,2),
+    p_home_collection_charge NUMERIC(10,2),
+    p_discount_amount   NUMERIC(10,2),
+    p_total_amount      NUMERIC(10,2),
+    p_notes             TEXT DEFAULT NULL,
+    p_today             DATE DEFAULT CURRENT_DATE
+)
+RETURNS TABLE (
+    booking_id              UUID,
+    patient_id              UUID,
+    lab_id                  UUID,
+    slot_id                 INT,
+    test_id                 INT,
+    collection_type         VARCHAR(20),
+    collection_address      JSONB,
+    booking_status          VARCHAR(20),
+    subtotal                NUMERIC(10,2),
+    home_collection_charge  NUMERIC(10,2),
+    discount_amount         NUMERIC(10,2),
+    total_amount            NUMERIC(10,2),
+    notes                   TEXT,
+    cancelled_at            TIMESTAMPTZ,
+    cancellation_reason     TEXT,
+    cancelled_by            UUID,
+    created_at              TIMESTAMPTZ,
+    updated_at              TIMESTAMPTZ,
+    test_name               VARCHAR(255),
+    test_code               VARCHAR(30),
+    sample_type             VARCHAR(50),
+    fasting_required        BOOLEAN,
+    slot_date               DATE,
+    start_time              TIME,
+    end_time                TIME,
+    lab_name                VARCHAR(255)
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_lab_id    UUID;
+    v_is_active BOOLEAN;
+    v_slot_date DATE;
+BEGIN
+    UPDATE lab_test_slots s
+    SET booked_count = s.booked_count + 1,
+        updated_at   = NOW()
+    WHERE s.slot_id = p_slot_id
+      AND s.lab_id = p_lab_id
+      AND s.is_active
+      AND s.slot_date >= p_today
+      AND s.booked_count + h_other_holds('LAB', s.slot_id, p_patient_id) < s.capacity;
+
+    IF NOT FOUND THEN
+        SELECT s.lab_id, s.is_active, s.slot_date
+        INTO v_lab_id, v_is_active, v_slot_date
+        FROM lab_test_slots s
+        WHERE s.slot_id = p_slot_id;
+
+        IF NOT FOUND THEN RAISE EXCEPTION 'SLOT_NOT_FOUND'; END IF;
+        IF v_lab_id <> p_lab_id THEN RAISE EXCEPTION 'SLOT_WRONG_LAB'; END IF;
+        IF NOT v_is_active THEN RAISE EXCEPTION 'SLOT_INACTIVE'; END IF;
+        IF v_slot_date < p_today THEN RAISE EXCEPTION 'SLOT_IN_PAST'; END IF;
+        RAISE EXCEPTION 'SLOT_FULL';
+    END IF;
+
+    RETURN QUERY
+    SELECT * FROM l_create_lab_booking(
+        p_patient_id, p_lab_id, p_slot_id, p_test_id,
+        p_collection_type, p_collection_address,
+        p_subtotal, p_home_collection_charge, p_discount_amount, p_total_amount,
+        p_notes
+    );
+END;
+$$;
+
+
+-- Moves a booking to another slot of the same lab in one transaction.
+-- Locks the booking, then both slots in slot_id order; the new seat is
+-- taken with the same capacity condition as l_book_lab_slot. Pass
+-- p_patient_id to restrict the move to the booking's owner, p_lab_id to
+-- the lab that holds it.
+DROP FUNCTION IF EXISTS l_reschedule_lab_booking(UUID, INT, UUID, DATE);
+CREATE OR REPLACE FUNCTION l_reschedule_lab_booking(
+    p_booking_id  UUID,
+    p_new_slot_id INT,
+    p_patient_id  UUID DEFAULT NULL,
+    p_lab_id      UUID DEFAULT NULL,
+    p_today       DATE DEFAULT CURRENT_DATE
+)
+RETURNS TABLE (
+    booking_id              UUID,
+    patient_id              UUID,
+    lab_id                  UUID,
+    slot_id                 INT,
+    test_id                 INT,
+    collection_type         VARCHAR(20),
+    collection_address      JSONB,
+    booking_status          VARCHAR(20),
+    subtotal                NUMERIC(10,2),
+    home_collection_charge  NUMERIC(10,2),
+    discount_amount         NUMERIC(10,2),
+    total_amount            NUMERIC(10,2),
+    notes                   TEXT,
+    cancelled_at            TIMESTAMPTZ,
+    cancellation_reason     TEXT,
+    cancelled_by            UUID,
+    created_at              TIMESTAMPTZ,
+    updated_at              TIMESTAMPTZ,
+    test_name               VARCHAR(255),
+    test_code               VARCHAR(30),
+    sample_type             VARCHAR(50),
+    fasting_required        BOOLEAN,
+    slot_date               DATE,
+    start_time              TIME,
+    end_time                TIME,
+    lab_name                VARCHAR(255)
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_booking   lab_test_slot_bookings%ROWTYPE;
+    v_lab_id    UUID;
+    v_is_active BOOLEAN;
+    v_slot_date DATE;
+BEGIN
+    SELECT b.* INTO v_booking
+    FROM lab_test_slot_bookings b
+    WHERE b.booking_id = p_booking_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN RAISE EXCEPTION 'BOOKING_NOT_FOUND'; END IF;
+    IF p_patient_id IS NOT NULL AND v_booking.patient_id <> p_patient_id THEN
+        RAISE EXCEPTION 'NOT_AUTHORISED';
+    END IF;
+    IF p_lab_id IS NOT NULL AND v_booking.lab_id <> p_lab_id THEN
+        RAISE EXCEPTION 'NOT_AUTHORISED';
+    END IF;
+    IF v_booking.booking_status NOT IN ('BOOKED', 'CONFIRMED') THEN
+        RAISE EXCEPTION 'BOOKING_CLOSED';
+    END IF;
+    IF v_booking.slot_id = p_new_slot_id THEN RAISE EXCEPTION 'SAME_SLOT'; END IF;
+
+    PERFORM 1
+    FROM lab_test_slots s
+    WHERE s.slot_id IN (v_booking.slot_id, p_new_slot_id)
+    ORDER BY s.slot_id
+    FOR UPDATE;
+
+    PERFORM s_lock_availability_days(
+        'LAB',
+        ARRAY[v_booking.lab_id, v_booking.lab_id],
+        ARRAY(SELECT s.slot_date FROM lab_test_slots s
+              WHERE s.slot_id IN (v_booking.slot_id, p_new_slot_id)
+                AND s.lab_id = v_booking.lab_id)
+    );
+
+    UPDATE lab_test_slots s
+    SET booked_count = s.booked_count + 1,
+        updated_at   = NOW()
+    WHERE s.slot_id = p_new_slot_id
+      AND s.lab_id = v_booking.lab_id
+      AND s.is_active
+      AND s.slot_date >= p_today
+      AND s.booked_count + h_other_holds('LAB', s.slot_id, v_booking.patient_id) < s.capacity;
+
+    IF NOT FOUND THEN
+        SELECT s.lab_id, s.is_active, s.slot_date
+        INTO v_lab_id, v_is_active, v_slot_date
+        FROM lab_test_slots s
+        WHERE s.slot_id = p_new_slot_id;
+
+        IF NOT FOUND THEN RAISE EXCEPTION 'SLOT_NOT_FOUND'; END IF;
+        IF v_lab_id <> v_booking.lab_id THEN RAISE EXCEPTION 'SLOT_WRONG_LAB'; END IF;
+        IF NOT v_is_active THEN RAISE EXCEPTION 'SLOT_INACTIVE'; END IF;
+        IF v_slot_date < p_today THEN RAISE EXCEPTION 'SLOT_IN_PAST'; END IF;
+        RAISE EXCEPTION 'SLOT_FULL';
+    END IF;
+
+    UPDATE lab_test_slots s
+    SET booked_count = GREATEST(s.booked_count - 1, 0),
+        updated_at   = NOW()
+    WHERE s.slot_id = v_booking.slot_id;
+
+    UPDATE lab_test_slot_bookings b
+    SET slot_id = p_new_slot_id, updated_at = NOW()
+    WHERE b.booking_id = p_booking_id;
+
+    RETURN QUERY
+    SELECT
+        b.booking_id, b.patient_id, b.lab_id, b.slot_id, b.test_id,
+        b.collection_type, b.collection_address, b.booking_status,
+        b.subtotal, b.home_collection_charge, b.discount_amount, b.total_amount,
+        b.notes, b.cancelled_at, b.cancellation_reason, b.cancelled_by,
+        b.created_at, b.updated_at,
+        t.test_name, t.test_code, t.sample_type, t.fasting_required,
+        s.slot_date, s.start_time, s.end_time,
+        l.lab_name
+    FROM lab_test_slot_bookings b
+    JOIN lab_tests      t ON t.test_id = b.test_id
+    JOIN lab_test_slots s ON s.slot_id = b.slot_id
+    JOIN labs           l ON l.lab_id  = b.lab_id
+    WHERE b.booking_id = p_booking_id;
+END;
+$$;
+
+
 CREATE OR REPLACE FUNCTION l_get_lab_booking(p_booking_id UUID)
 RETURNS TABLE (
     booking_id              UUID,
@@ -247,7 +462,11 @@ LANGUAGE sql STABLE AS $$
 $$;
 
 
-CREATE OR REPLACE FUNCTION l_list_lab_bookings(p_lab_id UUID)
+DROP FUNCTION IF EXISTS l_list_lab_bookings(UUID);
+CREATE OR REPLACE FUNCTION l_list_lab_bookings(
+    p_lab_id UUID,
+    p_since  TIMESTAMPTZ DEFAULT NULL
+)
 RETURNS TABLE (
     booking_id              UUID,
     patient_id              UUID,
@@ -292,6 +511,7 @@ LANGUAGE sql STABLE AS $$
     JOIN lab_test_slots      s ON s.slot_id  = b.slot_id
     JOIN labs                l ON l.lab_id   = b.lab_id
     WHERE b.lab_id = p_lab_id
+      AND (p_since IS NULL OR b.updated_at > p_since)
     ORDER BY b.created_at DESC;
 $$;
 
@@ -149,7 +149,11 @@ $$;
 
 
 
-CREATE OR REPLACE FUNCTION doc_get_patient_prescriptions(p_patient_id UUID)
+DROP FUNCTION IF EXISTS doc_get_patient_prescriptions(UUID);
+CREATE OR REPLACE FUNCTION doc_get_patient_prescriptions(
+    p_patient_id UUID,
+    p_since      TIMESTAMPTZ DEFAULT NULL
+)
 RETURNS TABLE(
     prescription_id     UUID,
     appointment_id      INTEGER,
@@ -157,7 +161,8 @@ RETURNS TABLE(
     doctor_name         VARCHAR,
     slot_date           DATE,
     pdf_path            VARCHAR,
-    created_at          TIMESTAMPTZ
+    created_at          TIMESTAMPTZ,
+    updated_at          TIMESTAMPTZ
 )
 LANGUAGE plpgsql AS $$
 BEGIN
@@ -169,12 +174,119 @@ BEGIN
         d.full_name,
         s.slot_date,
         p.pdf_path,
-        p.created_at
+        p.created_at,
+        p.updated_at
     FROM prescriptions p
     JOIN doctors d ON d.doctor_id = p.doctor_id
     LEFT JOIN doctor_appointments da ON da.appointment_id = p.appointment_id
     LEFT JOIN appointment_slots    s  ON s.slot_id = da.slot_id
     WHERE p.patient_id = p_patient_id
+      AND (p_since IS NULL OR p.updated_at > p_since)
     ORDER BY p.created_at DESC;
 END;
-$$;
\ No newline at end of file
+$$;
+
+
+-- Header, medicine lines and appointment completion in one statement.
+-- Medicines arrive as parallel arrays; sort_order is the array position.
+-- Returns the stored prescription with its medicines as a JSONB array.
+CREATE OR REPLACE FUNCTION doc_create_prescription_with_medicines(
+    p_appointment_id      INTEGER,
+    p_doctor_id           UUID,
+    p_patient_id          UUID,
+    p_prescription_number VARCHAR,
+    p_clinical_notes      TEXT      DEFAULT NULL,
+    p_lab_tests           TEXT      DEFAULT NULL,
+    p_advice              TEXT      DEFAULT NULL,
+    p_follow_up_date      DATE      DEFAULT NULL,
+    p_medicine_names      VARCHAR[] DEFAULT '{}',
+    p_dosages             VARCHAR[] DEFAULT '{}',
+    p_frequencies         VARCHAR[] DEFAULT '{}',
+    p_durations           VARCHAR[] DEFAULT '{}',
+    p_instructions        VARCHAR[] DEFAULT '{}'
+)
+RETURNS TABLE(
+    prescription_id     UUID,
+    appointment_id      INTEGER,
+    doctor_id           UUID,
+    patient_id          UUID,
+    prescription_number VARCHAR,
+    clinical_notes      TEXT,
+    lab_tests           TEXT,
+    advice              TEXT,
+    follow_up_date      DATE,
+    pdf_path            VARCHAR,
+    created_at          TIMESTAMPTZ,
+    medicines           JSONB
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_status VARCHAR;
+    v_id     UUID;
+BEGIN
+    SELECT da.status INTO v_status
+    FROM doctor_appointments da
+    WHERE da.appointment_id = p_appointment_id
+      AND da.doctor_id  = p_doctor_id
+      AND da.patient_id = p_patient_id
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'APPOINTMENT_NOT_FOUND_OR_MISMATCH';
+    END IF;
+    IF v_status IN ('completed', 'cancelled') THEN
+        RAISE EXCEPTION 'APPOINTMENT_ALREADY_CLOSED';
+    END IF;
+
+    IF EXISTS (SELECT 1 FROM prescriptions rx WHERE rx.appointment_id = p_appointment_id) THEN
+        RAISE EXCEPTION 'PRESCRIPTION_ALREADY_EXISTS';
+    END IF;
+
+    INSERT INTO prescriptions (
+        appointment_id, doctor_id, patient_id, prescription_number,
+        clinical_notes, lab_tests, advice, follow_up_date
+    ) VALUES (
+        p_appointment_id, p_doctor_id, p_patient_id, p_prescription_number,
+        p_clinical_notes, p_lab_tests, p_advice, p_follow_up_date
+    )
+    RETURNING prescriptions.prescription_id INTO v_id;
+
+    INSERT INTO prescription_medicines (
+        prescription_id, medicine_name, dosage, frequency,
+        duration, instructions, sort_order
+    )
+    SELECT v_id, m.medicine_name, m.dosage, m.frequency,
+           m.duration, m.instructions, (m.ord - 1)::INTEGER
+    FROM unnest(p_medicine_names, p_dosages, p_frequencies, p_durations, p_instructions)
+         WITH ORDINALITY AS m(medicine_name, dosage, frequency, duration, instructions, ord);
+
+    UPDATE doctor_appointments da
+    SET status = 'completed', updated_at = NOW()
+    WHERE da.appointment_id = p_appointment_id;
+
+    RETURN QUERY
+    SELECT
+        p.prescription_id, p.appointment_id, p.doctor_id, p.patient_id,
+        p.prescription_number, p.clinical_notes, p.lab_tests, p.advice,
+        p.follow_up_date, p.pdf_path, p.created_at,
+        COALESCE(
+            (SELECT jsonb_agg(
+                        jsonb_build_object(
+                            'medicine_id',   pm.medicine_id,
+                            'medicine_name', pm.medicine_name,
+                            'dosage',        pm.dosage,
+                            'frequency',     pm.frequency,
+                            'duration',      pm.duration,
+                            'instructions',  pm.instructions,
+                            'sort_order',    pm.sort_order
+                        )
+                        ORDER BY pm.sort_order, pm.medicine_id
+                    )
+             FROM prescription_medicines pm
+             WHERE pm.prescription_id = v_id),
+            '[]'::jsonb
+        )
+    FROM prescriptions p
+    WHERE p.prescription_id = v_id;
+END;
+$$;
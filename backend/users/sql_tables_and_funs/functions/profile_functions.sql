@@ -0,0 +1,118 @@
+-- Role profiles in one round trip: the same row the d_/l_ profile
+-- functions return, with the nested collections the profile response
+-- needs aggregated as jsonb. Patient and admin profiles are already a
+-- single row and have no bundle.
+
+CREATE OR REPLACE FUNCTION d_get_doctor_profile_bundle(p_doctor_id uuid)
+RETURNS TABLE(
+    doctor_id           uuid,
+    email               varchar,
+    email_verified      boolean,
+    is_active           boolean,
+    two_factor_enabled  boolean,
+    last_login_at       timestamptz,
+    role                varchar,
+
+    full_name           varchar,
+    experience_years    numeric,
+    phone_number        varchar,
+    consultation_fee    numeric,
+    registration_number varchar,
+    profile_image       varchar,
+
+    address_line        text,
+    city                varchar,
+    state               varchar,
+    pincode             varchar,
+
+    gender_id           int,
+    gender_value        varchar,
+
+    verification_status varchar,
+    verification_notes  text,
+    verified_at         timestamptz,
+    verified_by_id      uuid,
+
+    created_at          timestamptz,
+    updated_at          timestamptz,
+
+    qualifications      jsonb,
+    specializations     jsonb,
+    schedule            jsonb
+)
+LANGUAGE plpgsql STABLE AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        d.*,
+        COALESCE(
+            (SELECT jsonb_agg(to_jsonb(q)) FROM d_get_qualifications(p_doctor_id) q),
+            '[]'::jsonb
+        ),
+        COALESCE(
+            (SELECT jsonb_agg(to_jsonb(s)) FROM d_get_specializations(p_doctor_id) s),
+            '[]'::jsonb
+        ),
+        (
+            SELECT to_jsonb(sc) || jsonb_build_object(
+                'working_days',
+                COALESCE(
+                    (
+                        SELECT jsonb_agg(to_jsonb(w) ORDER BY w.day_of_week)
+                        FROM doctor_working_days w
+                        WHERE w.schedule_id = sc.schedule_id
+                    ),
+                    '[]'::jsonb
+                )
+            )
+            FROM d_get_full_schedule(p_doctor_id) sc
+        )
+    FROM d_get_full_doctor_profile(p_doctor_id) d;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION l_get_lab_profile_bundle(p_lab_id uuid)
+RETURNS TABLE(
+    lab_id              uuid,
+    email               varchar,
+    email_verified      boolean,
+    is_active           boolean,
+    two_factor_enabled  boolean,
+    last_login_at       timestamptz,
+    role_id             int,
+    role                varchar,
+
+    lab_name            varchar,
+    license_number      varchar,
+    phone_number        varchar,
+    lab_logo            varchar,
+
+    address_line        text,
+    city                varchar,
+    state               varchar,
+    pincode             varchar,
+
+    verification_status varchar,
+    verification_notes  text,
+    verified_at         timestamptz,
+    verified_by_id      uuid,
+    verified_by_email   varchar,
+
+    created_at          timestamptz,
+    updated_at          timestamptz,
+
+    operating_hours     jsonb
+)
+LANGUAGE plpgsql STABLE AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        l.*,
+        COALESCE(
+            (SELECT jsonb_agg(to_jsonb(h)) FROM l_get_operating_hours(p_lab_id) h),
+            '[]'::jsonb
+        )
+    FROM l_get_full_lab_profile(p_lab_id) l;
+END;
+$$;
@@ -0,0 +1,60 @@
+-- Take one token from every bucket (created full on first use), or from
+-- none when any bucket is empty, and return the longest wait in seconds, 0
+-- when the request is allowed. Refused requests cost nothing, so one
+-- client draining its own bucket cannot lock others out of the shared
+-- ones. Rows are locked in key order so concurrent callers cannot deadlock.
+CREATE OR REPLACE FUNCTION rl_take_tokens(
+    p_keys       varchar[],
+    p_capacities int[],
+    p_refills    float8[]
+)
+RETURNS float8
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_now    timestamptz := clock_timestamp();
+    v_tokens float8;
+    v_wait   float8 := 0;
+    i        int;
+BEGIN
+    FOR i IN
+        SELECT k.i FROM generate_subscripts(p_keys, 1) AS k(i) ORDER BY p_keys[k.i]
+    LOOP
+        INSERT INTO rate_limit_buckets AS b (bucket_key, tokens, updated_at)
+        VALUES (p_keys[i], p_capacities[i], v_now)
+        ON CONFLICT (bucket_key) DO UPDATE
+        SET tokens = LEAST(
+                p_capacities[i],
+                b.tokens + EXTRACT(EPOCH FROM v_now - b.updated_at) * p_refills[i]
+            ),
+            updated_at = v_now
+        RETURNING b.tokens INTO v_tokens;
+
+        IF v_tokens < 1 THEN
+            v_wait := GREATEST(v_wait, (1 - v_tokens) / p_refills[i]);
+        END IF;
+    END LOOP;
+
+    IF v_wait = 0 THEN
+        UPDATE rate_limit_buckets b
+        SET tokens = b.tokens - 1
+        WHERE b.bucket_key = ANY(p_keys);
+    END IF;
+
+    RETURN v_wait;
+END;
+$$;
+
+
+-- Buckets untouched for longer than p_idle have refilled; dropping them
+-- changes nothing.
+CREATE OR REPLACE FUNCTION rl_purge_buckets(p_idle interval)
+RETURNS int
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_count int;
+BEGIN
+    DELETE FROM rate_limit_buckets b WHERE b.updated_at < NOW() - p_idle;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$;
@@ -0,0 +1,188 @@
+-- backend\users\sql_tables_and_funs\functions\reminder_functions.sql
+
+-- Locks the watermark row for p_type (concurrent runners queue here), moves
+-- it to p_to and returns the previous mark and run time. The lock is held
+-- until the caller's transaction ends.
+CREATE OR REPLACE FUNCTION n_advance_reminder_watermark(
+    p_type VARCHAR,
+    p_now  TIMESTAMP,
+    p_to   TIMESTAMP
+)
+RETURNS TABLE (scan_from TIMESTAMP, last_run_at TIMESTAMPTZ)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_scanned_until TIMESTAMP;
+    v_last_run_at   TIMESTAMPTZ;
+BEGIN
+    INSERT INTO reminder_watermarks (reminder_type, scanned_until, last_run_at)
+    VALUES (p_type, p_now, '-infinity')
+    ON CONFLICT (reminder_type) DO NOTHING;
+
+    SELECT w.scanned_until, w.last_run_at
+    INTO v_scanned_until, v_last_run_at
+    FROM reminder_watermarks w
+    WHERE w.reminder_type = p_type
+    FOR UPDATE;
+
+    -- Overlap the next catch-up scan slightly so rows committed while this
+    -- transaction runs are not missed; reminder_log absorbs the duplicates.
+    UPDATE reminder_watermarks w
+    SET scanned_until = GREATEST(w.scanned_until, p_to),
+        last_run_at   = NOW() - INTERVAL '1 minute',
+        updated_at    = NOW()
+    WHERE w.reminder_type = p_type;
+
+    RETURN QUERY SELECT GREATEST(v_scanned_until, p_now), v_last_run_at;
+END;
+$$;
+
+
+-- Claims reminders for confirmed appointments starting within the next
+-- p_lead_hours. The main scan only covers the part of the window beyond the
+-- high-water mark; a catch-up scan picks up appointments booked or moved
+-- behind it since the last run. Each appointment/start time is logged once,
+-- so only the runner whose insert wins gets the row back.
+CREATE OR REPLACE FUNCTION n_claim_appointment_reminders(
+    p_now        TIMESTAMP,
+    p_lead_hours INT DEFAULT 24
+)
+RETURNS TABLE (
+    reminder_id    BIGINT,
+    appointment_id INT,
+    patient_id     UUID,
+    patient_email  VARCHAR,
+    doctor_name    VARCHAR,
+    slot_date      DATE,
+    start_time     TIME,
+    end_time       TIME
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_to        TIMESTAMP := p_now + make_interval(hours => p_lead_hours);
+    v_from      TIMESTAMP;
+    v_last_run  TIMESTAMPTZ;
+BEGIN
+    SELECT w.scan_from, w.last_run_at
+    INTO v_from, v_last_run
+    FROM n_advance_reminder_watermark('APPOINTMENT', p_now, v_to) w;
+
+    RETURN QUERY
+    WITH due AS (
+        SELECT da.appointment_id, da.patient_id, s.slot_date + s.start_time AS due_at
+        FROM appointment_slots s
+        JOIN doctor_appointments da ON da.slot_id = s.slot_id
+        WHERE s.is_booked
+          AND s.slot_date BETWEEN v_from::date AND v_to::date
+          AND s.slot_date + s.start_time >= v_from
+          AND s.slot_date + s.start_time <  v_to
+          AND da.status = 'confirmed'
+        UNION
+        SELECT da.appointment_id, da.patient_id, s.slot_date + s.start_time
+        FROM doctor_appointments da
+        JOIN appointment_slots s ON s.slot_id = da.slot_id
+        WHERE da.updated_at >= v_last_run
+          AND da.status = 'confirmed'
+          AND s.slot_date + s.start_time >= p_now
+          AND s.slot_date + s.start_time <  v_from
+    ),
+    claimed AS (
+        INSERT INTO reminder_log (reminder_type, reference_id, patient_id, due_at)
+        SELECT 'APPOINTMENT', d.appointment_id::text, d.patient_id, d.due_at
+        FROM due d
+        ON CONFLICT ON CONSTRAINT reminder_log_reference_due_uniq DO NOTHING
+        RETURNING reminder_log.reminder_id, reminder_log.reference_id
+    )
+    SELECT
+        c.reminder_id,
+        da.appointment_id,
+        da.patient_id,
+        u.email,
+        doc.full_name,
+        s.slot_date,
+        s.start_time,
+        s.end_time
+    FROM claimed c
+    JOIN doctor_appointments da ON da.appointment_id = c.reference_id::int
+    JOIN appointment_slots s    ON s.slot_id = da.slot_id
+    JOIN doctors doc            ON doc.doctor_id = da.doctor_id
+    JOIN users u                ON u.user_id = da.patient_id
+    ORDER BY s.slot_date, s.start_time;
+END;
+$$;
+
+
+-- Same as above for prescription follow-up dates falling within the window.
+CREATE OR REPLACE FUNCTION n_claim_follow_up_reminders(
+    p_now        TIMESTAMP,
+    p_lead_hours INT DEFAULT 24
+)
+RETURNS TABLE (
+    reminder_id         BIGINT,
+    prescription_id     UUID,
+    prescription_number VARCHAR,
+    patient_id          UUID,
+    patient_email       VARCHAR,
+    doctor_name         VARCHAR,
+    follow_up_date      DATE
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_to        TIMESTAMP := p_now + make_interval(hours => p_lead_hours);
+    v_from      TIMESTAMP;
+    v_last_run  TIMESTAMPTZ;
+BEGIN
+    SELECT w.scan_from, w.last_run_at
+    INTO v_from, v_last_run
+    FROM n_advance_reminder_watermark('FOLLOW_UP', p_now, v_to) w;
+
+    RETURN QUERY
+    WITH due AS (
+        SELECT p.prescription_id, p.patient_id, p.follow_up_date::timestamp AS due_at
+        FROM prescriptions p
+        WHERE p.follow_up_date IS NOT NULL
+          AND p.follow_up_date >= v_from::date
+          AND p.follow_up_date <= v_to::date
+        UNION
+        SELECT p.prescription_id, p.patient_id, p.follow_up_date::timestamp
+        FROM prescriptions p
+        WHERE p.updated_at >= v_last_run
+          AND p.follow_up_date >= p_now::date
+          AND p.follow_up_date <  v_from::date
+    ),
+    claimed AS (
+        INSERT INTO reminder_log (reminder_type, reference_id, patient_id, due_at)
+        SELECT 'FOLLOW_UP', d.prescription_id::text, d.patient_id, d.due_at
+        FROM due d
+        ON CONFLICT ON CONSTRAINT reminder_log_reference_due_uniq DO NOTHING
+        RETURNING reminder_log.reminder_id, reminder_log.reference_id
+    )
+    SELECT
+        c.reminder_id,
+        p.prescription_id,
+        p.prescription_number,
+        p.patient_id,
+        u.email,
+        doc.full_name,
+        p.follow_up_date
+    FROM claimed c
+    JOIN prescriptions p ON p.prescription_id = c.reference_id::uuid
+    JOIN doctors doc     ON doc.doctor_id = p.doctor_id
+    JOIN users u         ON u.user_id = p.patient_id
+    ORDER BY p.follow_up_date;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION n_attach_reminder_emails(
+    p_reminder_ids BIGINT[],
+    p_email_ids    BIGINT[]
+)
+RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE reminder_log r
+    SET email_id = x.email_id
+    FROM unnest(p_reminder_ids, p_email_ids) AS x(reminder_id, email_id)
+    WHERE r.reminder_id = x.reminder_id;
+END;
+$$;
@@ -269,4 +269,29 @@ BEGIN
 
     RETURN FORMAT('Role %s synced with %s permissions', p_role_id, array_length(p_permission_ids, 1));
 END;
-$$ LANGUAGE plpgsql;
\ No newline at end of file
+$$ LANGUAGE plpgsql;
+
+-- Whole role/permission matrix in one read: every permission with the
+-- names of the roles that hold it. Loaded once per process by
+-- services/permission_matrix.py.
+CREATE OR REPLACE FUNCTION r_get_permission_matrix()
+RETURNS TABLE (
+    permission_id INT,
+    module        VARCHAR(50),
+    action        VARCHAR(50),
+    roles         VARCHAR(30)[]
+) AS $$
+    SELECT
+        p.permission_id,
+        p.module,
+        p.action,
+        COALESCE(
+            ARRAY_AGG(r.role ORDER BY r.role) FILTER (WHERE r.role IS NOT NULL),
+            '{}'
+        )
+    FROM permissions p
+    LEFT JOIN role_permissions rp ON rp.permission_id = p.permission_id
+    LEFT JOIN user_roles       r  ON r.role_id = rp.role_id
+    GROUP BY p.permission_id, p.module, p.action
+    ORDER BY p.permission_id;
+$$ LANGUAGE sql STABLE;
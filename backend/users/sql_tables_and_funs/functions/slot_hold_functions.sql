@@ -0,0 +1,133 @@
+-- backend\users\sql_tables_and_funs\functions\slot_hold_functions.sql
+
+-- Places (or refreshes) p_patient_id's hold on a slot. Concurrent holds on
+-- the same slot serialise on a transaction-scoped advisory lock, so the slot
+-- row itself is never locked. For DOCTOR slots the amount is the doctor's
+-- consultation fee; for LAB slots it is passed in by the caller.
+CREATE OR REPLACE FUNCTION h_place_slot_hold(
+    p_slot_type   VARCHAR,
+    p_slot_id     INT,
+    p_patient_id  UUID,
+    p_payload     JSONB,
+    p_amount      NUMERIC,
+    p_ttl_seconds INT,
+    p_today       DATE DEFAULT CURRENT_DATE
+)
+RETURNS TABLE (
+    hold_id    UUID,
+    slot_type  VARCHAR,
+    slot_id    INT,
+    amount     NUMERIC,
+    expires_at TIMESTAMPTZ
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_held       INT;
+    v_amount     NUMERIC := p_amount;
+    v_slot_date  DATE;
+    v_is_booked  BOOLEAN;
+    v_is_blocked BOOLEAN;
+    v_is_active  BOOLEAN;
+    v_booked     INT;
+    v_capacity   INT;
+BEGIN
+    PERFORM pg_advisory_xact_lock(hashtext('slot_hold:' || p_slot_type), p_slot_id);
+
+    DELETE FROM slot_holds h
+    WHERE h.slot_type = p_slot_type
+      AND h.slot_id = p_slot_id
+      AND (h.expires_at <= NOW() OR h.patient_id = p_patient_id);
+
+    SELECT COUNT(*) INTO v_held
+    FROM slot_holds h
+    WHERE h.slot_type = p_slot_type
+      AND h.slot_id = p_slot_id;
+
+    IF p_slot_type = 'DOCTOR' THEN
+        SELECT s.is_booked, s.is_blocked, s.slot_date, COALESCE(p_amount, d.consultation_fee)
+        INTO v_is_booked, v_is_blocked, v_slot_date, v_amount
+        FROM appointment_slots s
+        JOIN doctor_schedules ds ON ds.schedule_id = s.schedule_id
+        JOIN doctors d           ON d.doctor_id = ds.doctor_id
+        WHERE s.slot_id = p_slot_id;
+
+        IF NOT FOUND THEN RAISE EXCEPTION 'SLOT_NOT_FOUND'; END IF;
+        IF v_is_booked  THEN RAISE EXCEPTION 'SLOT_ALREADY_BOOKED'; END IF;
+        IF v_is_blocked THEN RAISE EXCEPTION 'SLOT_BLOCKED'; END IF;
+        IF v_slot_date < p_today THEN RAISE EXCEPTION 'SLOT_IN_PAST'; END IF;
+        IF v_held > 0 THEN RAISE EXCEPTION 'SLOT_HELD'; END IF;
+    ELSE
+        SELECT s.is_active, s.slot_date, s.booked_count, s.capacity
+        INTO v_is_active, v_slot_date, v_booked, v_capacity
+        FROM lab_test_slots s
+        WHERE s.slot_id = p_slot_id;
+
+        IF NOT FOUND THEN RAISE EXCEPTION 'SLOT_NOT_FOUND'; END IF;
+        IF NOT v_is_active THEN RAISE EXCEPTION 'SLOT_BLOCKED'; END IF;
+        IF v_slot_date < p_today THEN RAISE EXCEPTION 'SLOT_IN_PAST'; END IF;
+        IF v_booked + v_held >= v_capacity THEN RAISE EXCEPTION 'SLOT_FULL'; END IF;
+    END IF;
+
+    RETURN QUERY
+    INSERT INTO slot_holds (slot_type, slot_id, patient_id, payload, amount, expires_at)
+    VALUES (
+        p_slot_type, p_slot_id, p_patient_id, COALESCE(p_payload, '{}'::jsonb),
+        v_amount, NOW() + make_interval(secs => p_ttl_seconds)
+    )
+    RETURNING slot_holds.hold_id, slot_holds.slot_type, slot_holds.slot_id,
+              slot_holds.amount, slot_holds.expires_at;
+END;
+$$;
+
+
+-- Returns the hold whether or not it has expired; is_active tells which.
+CREATE OR REPLACE FUNCTION h_get_slot_hold(p_hold_id UUID)
+RETURNS TABLE (
+    hold_id    UUID,
+    slot_type  VARCHAR,
+    slot_id    INT,
+    patient_id UUID,
+    payload    JSONB,
+    amount     NUMERIC,
+    expires_at TIMESTAMPTZ,
+    is_active  BOOLEAN
+)
+LANGUAGE plpgsql AS $$
+BEGIN
+    RETURN QUERY
+    SELECT h.hold_id, h.slot_type, h.slot_id, h.patient_id, h.payload, h.amount,
+           h.expires_at, h.expires_at > NOW()
+    FROM slot_holds h
+    WHERE h.hold_id = p_hold_id;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION h_release_slot_hold(p_hold_id UUID, p_patient_id UUID)
+RETURNS BOOLEAN
+LANGUAGE plpgsql AS $$
+BEGIN
+    DELETE FROM slot_holds
+    WHERE hold_id = p_hold_id
+      AND patient_id = p_patient_id;
+
+    RETURN FOUND;
+END;
+$$;
+
+
+-- Number of live holds on a slot placed by anyone other than p_patient_id.
+CREATE OR REPLACE FUNCTION h_other_holds(
+    p_slot_type  VARCHAR,
+    p_slot_id    INT,
+    p_patient_id UUID
+)
+RETURNS INT
+LANGUAGE sql STABLE AS $$
+    SELECT COUNT(*)::INT
+    FROM slot_holds h
+    WHERE h.slot_type = p_slot_type
+      AND h.slot_id = p_slot_id
+      AND h.expires_at > NOW()
+      AND h.patient_id IS DISTINCT FROM p_patient_id;
+$$;
@@ -0,0 +1,72 @@
+-- backend\users\sql_tables_and_funs\functions\sync_functions.sql
+
+-- Row trigger: TG_ARGV is (entity, id column, owner column, ...). One
+-- tombstone is written for every non-null owner of the deleted row.
+CREATE OR REPLACE FUNCTION t_record_tombstone()
+RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_row   jsonb := to_jsonb(OLD);
+    v_owner text;
+BEGIN
+    FOREACH v_owner IN ARRAY TG_ARGV[2:] LOOP
+        IF v_row ->> v_owner IS NOT NULL THEN
+            INSERT INTO sync_tombstones (entity, entity_id, owner_id)
+            VALUES (TG_ARGV[0], v_row ->> TG_ARGV[1], (v_row ->> v_owner)::uuid);
+        END IF;
+    END LOOP;
+    RETURN OLD;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_doctor_appointments_tombstone ON doctor_appointments;
+CREATE TRIGGER trg_doctor_appointments_tombstone
+    AFTER DELETE ON doctor_appointments
+    FOR EACH ROW
+    EXECUTE FUNCTION t_record_tombstone('APPOINTMENT', 'appointment_id', 'patient_id', 'doctor_id');
+
+DROP TRIGGER IF EXISTS trg_lab_bookings_tombstone ON lab_test_slot_bookings;
+CREATE TRIGGER trg_lab_bookings_tombstone
+    AFTER DELETE ON lab_test_slot_bookings
+    FOR EACH ROW
+    EXECUTE FUNCTION t_record_tombstone('LAB_BOOKING', 'booking_id', 'lab_id', 'patient_id');
+
+DROP TRIGGER IF EXISTS trg_prescriptions_tombstone ON prescriptions;
+CREATE TRIGGER trg_prescriptions_tombstone
+    AFTER DELETE ON prescriptions
+    FOR EACH ROW
+    EXECUTE FUNCTION t_record_tombstone('PRESCRIPTION', 'prescription_id', 'patient_id', 'doctor_id');
+
+
+CREATE OR REPLACE FUNCTION t_get_tombstones(
+    p_entity   varchar,
+    p_owner_id uuid,
+    p_since    timestamptz
+)
+RETURNS TABLE(
+    entity_id  text,
+    deleted_at timestamptz
+)
+LANGUAGE sql STABLE AS $$
+    SELECT t.entity_id, MAX(t.deleted_at)
+    FROM sync_tombstones t
+    WHERE t.entity = p_entity
+      AND t.owner_id = p_owner_id
+      AND t.deleted_at > p_since
+    GROUP BY t.entity_id;
+$$;
+
+
+-- Tokens older than the retention window get a full reload instead, so
+-- tombstones past it are never read again.
+CREATE OR REPLACE FUNCTION t_purge_tombstones(p_before timestamptz)
+RETURNS int
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_count int;
+BEGIN
+    DELETE FROM sync_tombstones t WHERE t.deleted_at < p_before;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$;
@@ -0,0 +1,151 @@
+-- backend\users\sql_tables_and_funs\functions\timeline_functions.sql
+
+-- One page of a patient's history, newest first, across appointments,
+-- prescriptions, lab bookings, lab reports and payments. Pages are keyed
+-- on (event_time, kind, event_id): pass the last row's values to get the
+-- next page. Each branch takes at most p_limit rows from its own index
+-- before the merge, so the sort only ever sees 5 * p_limit rows.
+CREATE OR REPLACE FUNCTION p_get_patient_timeline(
+    p_patient_id uuid,
+    p_after_time timestamptz DEFAULT NULL,
+    p_after_kind text        DEFAULT NULL,
+    p_after_id   text        DEFAULT NULL,
+    p_limit      int         DEFAULT 20,
+    p_kinds      text[]      DEFAULT NULL
+)
+RETURNS TABLE(
+    event_time timestamptz,
+    kind       text,
+    event_id   text,
+    title      text,
+    status     text,
+    details    jsonb
+)
+LANGUAGE sql STABLE AS $$
+    SELECT t.* FROM (
+        (
+            SELECT da.created_at, 'APPOINTMENT'::text, da.appointment_id::text,
+                   d.full_name::text, da.status::text,
+                   jsonb_build_object(
+                       'appointment_id',   da.appointment_id,
+                       'doctor_id',        da.doctor_id,
+                       'doctor_name',      d.full_name,
+                       'slot_date',        s.slot_date,
+                       'start_time',       s.start_time,
+                       'end_time',         s.end_time,
+                       'appointment_type', da.appointment_type,
+                       'reason',           da.reason
+                   )
+            FROM doctor_appointments da
+            JOIN doctors d ON d.doctor_id = da.doctor_id
+            LEFT JOIN appointment_slots s ON s.slot_id = da.slot_id
+            WHERE da.patient_id = p_patient_id
+              AND (p_kinds IS NULL OR 'APPOINTMENT' = ANY(p_kinds))
+              AND (p_after_time IS NULL
+                   OR (da.created_at <= p_after_time
+                       AND (da.created_at, 'APPOINTMENT', da.appointment_id::text)
+                           < (p_after_time, p_after_kind, p_after_id)))
+            ORDER BY da.created_at DESC, da.appointment_id::text DESC
+            LIMIT p_limit
+        )
+        UNION ALL
+        (
+            SELECT rx.created_at, 'PRESCRIPTION'::text, rx.prescription_id::text,
+                   rx.prescription_number::text, NULL::text,
+                   jsonb_build_object(
+                       'prescription_id',     rx.prescription_id,
+                       'prescription_number', rx.prescription_number,
+                       'appointment_id',      rx.appointment_id,
+                       'doctor_id',           rx.doctor_id,
+                       'doctor_name',         d.full_name,
+                       'follow_up_date',      rx.follow_up_date,
+                       'has_pdf',             rx.pdf_path IS NOT NULL
+                   )
+            FROM prescriptions rx
+            JOIN doctors d ON d.doctor_id = rx.doctor_id
+            WHERE rx.patient_id = p_patient_id
+              AND (p_kinds IS NULL OR 'PRESCRIPTION' = ANY(p_kinds))
+              AND (p_after_time IS NULL
+                   OR (rx.created_at <= p_after_time
+                       AND (rx.created_at, 'PRESCRIPTION', rx.prescription_id::text)
+                           < (p_after_time, p_after_kind, p_after_id)))
+            ORDER BY rx.created_at DESC, rx.prescription_id::text DESC
+            LIMIT p_limit
+        )
+        UNION ALL
+        (
+            SELECT b.created_at, 'LAB_BOOKING'::text, b.booking_id::text,
+                   t.test_name::text, b.booking_status::text,
+                   jsonb_build_object(
+                       'booking_id',      b.booking_id,
+                       'lab_id',          b.lab_id,
+                       'lab_name',        l.lab_name,
+                       'test_id',         b.test_id,
+                       'test_name',       t.test_name,
+                       'slot_date',       ls.slot_date,
+                       'start_time',      ls.start_time,
+                       'collection_type', b.collection_type,
+                       'total_amount',    b.total_amount
+                   )
+            FROM lab_test_slot_bookings b
+            JOIN labs l           ON l.lab_id = b.lab_id
+            JOIN lab_tests t      ON t.test_id = b.test_id
+            JOIN lab_test_slots ls ON ls.slot_id = b.slot_id
+            WHERE b.patient_id = p_patient_id
+              AND (p_kinds IS NULL OR 'LAB_BOOKING' = ANY(p_kinds))
+              AND (p_after_time IS NULL
+                   OR (b.created_at <= p_after_time
+                       AND (b.created_at, 'LAB_BOOKING', b.booking_id::text)
+                           < (p_after_time, p_after_kind, p_after_id)))
+            ORDER BY b.created_at DESC, b.booking_id::text DESC
+            LIMIT p_limit
+        )
+        UNION ALL
+        (
+            SELECT r.uploaded_at, 'LAB_REPORT'::text, r.result_id::text,
+                   t.test_name::text, NULL::text,
+                   jsonb_build_object(
+                       'result_id',       r.result_id,
+                       'booking_id',      r.booking_id,
+                       'test_name',       t.test_name,
+                       'report_type',     r.report_type,
+                       'report_file_url', r.report_file_url
+                   )
+            FROM lab_test_slot_bookings b
+            JOIN lab_test_reports r ON r.booking_id = b.booking_id
+            JOIN lab_tests t        ON t.test_id = b.test_id
+            WHERE b.patient_id = p_patient_id
+              AND (p_kinds IS NULL OR 'LAB_REPORT' = ANY(p_kinds))
+              AND (p_after_time IS NULL
+                   OR (r.uploaded_at <= p_after_time
+                       AND (r.uploaded_at, 'LAB_REPORT', r.result_id::text)
+                           < (p_after_time, p_after_kind, p_after_id)))
+            ORDER BY r.uploaded_at DESC, r.result_id::text DESC
+            LIMIT p_limit
+        )
+        UNION ALL
+        (
+            SELECT pay.created_at, 'PAYMENT'::text, pay.payment_id::text,
+                   pay.payment_for::text, pay.status::text,
+                   jsonb_build_object(
+                       'payment_id',     pay.payment_id,
+                       'payment_for',    pay.payment_for,
+                       'reference_id',   pay.reference_id,
+                       'amount',         pay.amount,
+                       'currency',       pay.currency,
+                       'failure_reason', pay.failure_reason
+                   )
+            FROM payments pay
+            WHERE pay.patient_id = p_patient_id
+              AND (p_kinds IS NULL OR 'PAYMENT' = ANY(p_kinds))
+              AND (p_after_time IS NULL
+                   OR (pay.created_at <= p_after_time
+                       AND (pay.created_at, 'PAYMENT', pay.payment_id::text)
+                           < (p_after_time, p_after_kind, p_after_id)))
+            ORDER BY pay.created_at DESC, pay.payment_id::text DESC
+            LIMIT p_limit
+        )
+    ) AS t(event_time, kind, event_id, title, status, details)
+    ORDER BY t.event_time DESC, t.kind DESC, t.event_id DESC
+    LIMIT p_limit;
+$$;
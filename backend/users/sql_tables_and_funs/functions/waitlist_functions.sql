@@ -0,0 +1,220 @@
+-- backend\users\sql_tables_and_funs\functions\waitlist_functions.sql
+
+-- Returns no row when the patient already has a live entry for the target.
+CREATE OR REPLACE FUNCTION w_join_waitlist(
+    p_target_type VARCHAR,
+    p_target_id   UUID,
+    p_patient_id  UUID,
+    p_date_from   DATE,
+    p_date_to     DATE,
+    p_payload     JSONB,
+    p_amount      NUMERIC
+)
+RETURNS SETOF waitlist_entries
+LANGUAGE sql AS $$
+    INSERT INTO waitlist_entries
+        (target_type, target_id, patient_id, date_from, date_to, payload, amount)
+    VALUES
+        (p_target_type, p_target_id, p_patient_id, p_date_from, p_date_to,
+         COALESCE(p_payload, '{}'::jsonb), p_amount)
+    ON CONFLICT (patient_id, target_type, target_id)
+        WHERE status IN ('WAITING', 'OFFERED')
+    DO NOTHING
+    RETURNING *;
+$$;
+
+
+-- Drops a live entry; an outstanding offer's hold is released with it and
+-- the offered slot is returned so it can go to the next patient. Returns no
+-- row when the entry is not the patient's or no longer live.
+CREATE OR REPLACE FUNCTION w_leave_waitlist(p_entry_id UUID, p_patient_id UUID)
+RETURNS TABLE (slot_type VARCHAR, offered_slot_id INT)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_target_type VARCHAR;
+    v_hold_id     UUID;
+    v_slot_id     INT;
+BEGIN
+    UPDATE waitlist_entries w
+    SET status = 'CANCELLED', updated_at = NOW()
+    WHERE w.entry_id = p_entry_id
+      AND w.patient_id = p_patient_id
+      AND w.status IN ('WAITING', 'OFFERED')
+    RETURNING w.target_type, w.hold_id, w.offered_slot_id
+    INTO v_target_type, v_hold_id, v_slot_id;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    IF v_hold_id IS NOT NULL THEN
+        DELETE FROM slot_holds h WHERE h.hold_id = v_hold_id;
+    END IF;
+
+    slot_type := v_target_type;
+    offered_slot_id := v_slot_id;
+    RETURN NEXT;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION w_list_patient_waitlist(p_patient_id UUID)
+RETURNS TABLE (
+    entry_id         UUID,
+    target_type      VARCHAR,
+    target_id        UUID,
+    target_name      VARCHAR,
+    date_from        DATE,
+    date_to          DATE,
+    status           VARCHAR,
+    hold_id          UUID,
+    offered_slot_id  INT,
+    offer_expires_at TIMESTAMPTZ,
+    created_at       TIMESTAMPTZ
+)
+LANGUAGE sql STABLE AS $$
+    SELECT w.entry_id, w.target_type, w.target_id,
+           COALESCE(d.full_name, l.lab_name)::VARCHAR,
+           w.date_from, w.date_to, w.status, w.hold_id, w.offered_slot_id,
+           w.offer_expires_at, w.created_at
+    FROM waitlist_entries w
+    LEFT JOIN doctors d ON w.target_type = 'DOCTOR' AND d.doctor_id = w.target_id
+    LEFT JOIN labs l    ON w.target_type = 'LAB' AND l.lab_id = w.target_id
+    WHERE w.patient_id = p_patient_id
+    ORDER BY w.created_at DESC;
+$$;
+
+
+-- Offers a freed slot to the next patient in line by placing a hold for
+-- them. Entries locked by a concurrent offer are skipped, so simultaneous
+-- cancellations for the same doctor/lab go to different patients. Returns
+-- no row when nobody is waiting or the slot is no longer free.
+CREATE OR REPLACE FUNCTION w_offer_freed_slot(
+    p_slot_type   VARCHAR,
+    p_slot_id     INT,
+    p_ttl_seconds INT,
+    p_today       DATE DEFAULT CURRENT_DATE
+)
+RETURNS TABLE (
+    entry_id      UUID,
+    patient_id    UUID,
+    patient_email VARCHAR,
+    target_name   VARCHAR,
+    hold_id       UUID,
+    slot_id       INT,
+    slot_date     DATE,
+    start_time    TIME,
+    end_time      TIME,
+    amount        NUMERIC,
+    expires_at    TIMESTAMPTZ
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_target_id   UUID;
+    v_target_name VARCHAR;
+    v_slot_date   DATE;
+    v_start_time  TIME;
+    v_end_time    TIME;
+    v_entry       waitlist_entries%ROWTYPE;
+    v_hold_id     UUID;
+    v_amount      NUMERIC;
+    v_expires_at  TIMESTAMPTZ;
+BEGIN
+    IF p_slot_type = 'DOCTOR' THEN
+        SELECT ds.doctor_id, d.full_name, s.slot_date, s.start_time, s.end_time
+        INTO v_target_id, v_target_name, v_slot_date, v_start_time, v_end_time
+        FROM appointment_slots s
+        JOIN doctor_schedules ds ON ds.schedule_id = s.schedule_id
+        JOIN doctors d           ON d.doctor_id = ds.doctor_id
+        WHERE s.slot_id = p_slot_id
+          AND NOT s.is_blocked;
+    ELSE
+        SELECT s.lab_id, l.lab_name, s.slot_date, s.start_time, s.end_time
+        INTO v_target_id, v_target_name, v_slot_date, v_start_time, v_end_time
+        FROM lab_test_slots s
+        JOIN labs l ON l.lab_id = s.lab_id
+        WHERE s.slot_id = p_slot_id;
+    END IF;
+
+    IF NOT FOUND OR v_slot_date < p_today THEN
+        RETURN;
+    END IF;
+
+    SELECT w.* INTO v_entry
+    FROM waitlist_entries w
+    WHERE w.target_type = p_slot_type
+      AND w.target_id = v_target_id
+      AND w.status = 'WAITING'
+      AND w.date_from <= v_slot_date
+      AND w.date_to >= v_slot_date
+    ORDER BY w.created_at
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED;
+
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    BEGIN
+        SELECT h.hold_id, h.amount, h.expires_at
+        INTO v_hold_id, v_amount, v_expires_at
+        FROM h_place_slot_hold(
+            p_slot_type, p_slot_id, v_entry.patient_id,
+            v_entry.payload, v_entry.amount, p_ttl_seconds, p_today
+        ) h;
+    EXCEPTION WHEN raise_exception THEN
+        -- Someone else holds or has taken the slot meanwhile.
+        RETURN;
+    END;
+
+    UPDATE waitlist_entries w
+    SET status           = 'OFFERED',
+        hold_id          = v_hold_id,
+        offered_slot_id  = p_slot_id,
+        offer_expires_at = v_expires_at,
+        updated_at       = NOW()
+    WHERE w.entry_id = v_entry.entry_id;
+
+    RETURN QUERY
+    SELECT v_entry.entry_id, v_entry.patient_id, u.email, v_target_name,
+           v_hold_id, p_slot_id, v_slot_date, v_start_time, v_end_time,
+           v_amount, v_expires_at
+    FROM users u
+    WHERE u.user_id = v_entry.patient_id;
+END;
+$$;
+
+
+CREATE OR REPLACE FUNCTION w_mark_offer_fulfilled(p_hold_id UUID)
+RETURNS VOID
+LANGUAGE sql AS $$
+    UPDATE waitlist_entries
+    SET status = 'FULFILLED', updated_at = NOW()
+    WHERE hold_id = p_hold_id
+      AND status = 'OFFERED';
+$$;
+
+
+-- Lapses offers whose hold ran out and entries whose date range has passed.
+-- Returns the slots of the lapsed offers so they can be offered again.
+CREATE OR REPLACE FUNCTION w_expire_waitlist(p_today DATE DEFAULT CURRENT_DATE)
+RETURNS TABLE (slot_type VARCHAR, slot_id INT)
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE waitlist_entries w
+    SET status = 'EXPIRED', updated_at = NOW()
+    WHERE w.status = 'WAITING'
+      AND w.date_to < p_today;
+
+    RETURN QUERY
+    WITH lapsed AS (
+        UPDATE waitlist_entries w
+        SET status = 'EXPIRED', updated_at = NOW()
+        WHERE w.status = 'OFFERED'
+          AND w.offer_expires_at <= NOW()
+        RETURNING w.target_type, w.offered_slot_id
+    )
+    SELECT DISTINCT lapsed.target_type, lapsed.offered_slot_id
+    FROM lapsed;
+END;
+$$;
@@ -0,0 +1,794 @@
+import hashlib
+import hmac
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from pathlib import Path
+from decimal import Decimal
+from unittest import mock
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from django.utils import timezone as dj_timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from users.database_queries import doctor_queries as dq
+from users.database_queries import rate_limit_queries as rlq
+from users.database_queries import user_queries as uq
+from users.middleware.exceptions import (
+    AuthenticationException,
+    ConflictException,
+    NotFoundException,
+    PermissionException,
+    ServiceUnavailableException,
+    ValidationException,
+)
+from users.models import UserRole
+from users.renderers import FastJSONRenderer
+from users.services import agenda_service, json_codec, oauth_service, rate_limiter
+from users.services import sync_service, timeline_service
+from users.services.appointment_service import AppointmentService
+from users.services.lab_booking_service import LabBookingService
+from users.services.oauth_service import OAuthService
+from users.services.payment_service import PaymentService
+from users.services.waitlist_service import WaitlistService
+from users.views.auth_views import LogoutView
+from users.views.doctor_view import DoctorListView
+from users.views.payment_views import RazorpayWebhookView
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    data = {
+        "aware": datetime(2026, 4, 17, 9, 30, 12, 345678, tzinfo=timezone.utc),
+        "naive": datetime(2026, 4, 17, 9, 30),
+        "day": date(2026, 4, 17),
+        "at": time(9, 30, 0, 250000),
+        "fee": Decimal("499.50"),
+        "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        "text": "Dr. \u00dcmit\u2028next line",
+        "rows": [{"n": 1, "ok": True, "none": None}, (1, 2)],
+    }
+
+    def test_matches_stock_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+    def test_matches_stock_renderer_without_orjson(self):
+        with mock.patch.object(json_codec, "orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+            )
+
+    def test_codec_backends_agree(self):
+        with_orjson = json_codec.dumps(self.data)
+        with mock.patch.object(json_codec, "orjson", None):
+            self.assertEqual(json_codec.dumps(self.data), with_orjson)
+
+
+class _FakePayments:
+    """Stands in for payment_service._execute over one payments row. The
+    conditional claim is applied atomically, as Postgres applies it."""
+
+    def __init__(self, row):
+        self.row = row
+        self.lock = threading.Lock()
+
+    def execute(self, sql, params=None, fetch="none"):
+        with self.lock:
+            if sql.lstrip().startswith("SELECT"):
+                return dict(self.row)
+            if "status <> 'SUCCESS'" in sql:
+                if self.row["status"] == "SUCCESS":
+                    return None
+                self.row.update(status="SUCCESS", transaction_id=params[0])
+                return dict(self.row)
+        return None
+
+
+@override_settings(RAZORPAY_KEY_SECRET="test-secret")
+class PaymentCaptureRaceTests(SimpleTestCase):
+    def test_verify_and_webhook_fulfil_once(self):
+        patient_id = str(uuid.uuid4())
+        payments = _FakePayments(
+            {
+                "payment_id": uuid.uuid4(),
+                "order_id": "order_1",
+                "patient_id": patient_id,
+                "payment_for": "SLOT_HOLD",
+                "reference_id": "42",
+                "amount": Decimal("500.00"),
+                "status": "PENDING",
+            }
+        )
+        signature = hmac.new(
+            b"test-secret", b"order_1|pay_1", hashlib.sha256
+        ).hexdigest()
+        verify_data = {
+            "razorpay_order_id": "order_1",
+            "razorpay_payment_id": "pay_1",
+            "razorpay_signature": signature,
+        }
+        webhook_payload = {
+            "payload": {"payment": {"entity": {"id": "pay_1", "order_id": "order_1"}}}
+        }
+        start = threading.Barrier(2)
+        errors = []
+
+        def verify():
+            start.wait()
+            try:
+                PaymentService.verify_payment(verify_data, patient_id)
+            except ValidationException as e:
+                errors.append(e)
+
+        def webhook():
+            start.wait()
+            RazorpayWebhookView()._handle_captured(webhook_payload)
+
+        with mock.patch(
+            "users.services.payment_service._execute", side_effect=payments.execute
+        ), mock.patch.object(
+            PaymentService, "fulfil", return_value=("APPOINTMENT", "7")
+        ) as fulfil:
+            threads = [threading.Thread(target=verify), threading.Thread(target=webhook)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(fulfil.call_count, 1)
+        self.assertEqual(payments.row["status"], "SUCCESS")
+        self.assertLessEqual(len(errors), 1)
+
+
+class CursorTests(SimpleTestCase):
+    def test_agenda_cursor_round_trip(self):
+        row = {
+            "slot_date": date(2026, 4, 17),
+            "start_time": time(9, 30),
+            "appointment_id": 12,
+        }
+        cursor = agenda_service._encode_cursor(row)
+
+        # Same bytes as before the shared codec, so issued cursors still work.
+        self.assertEqual(cursor, "MjAyNi0wNC0xN3wwOTozMDowMHwxMg")
+        self.assertEqual(
+            agenda_service._decode_cursor(cursor), (date(2026, 4, 17), time(9, 30), 12)
+        )
+
+    def test_timeline_cursor_round_trip(self):
+        moment = datetime(2026, 4, 17, 9, 30, tzinfo=timezone.utc)
+        row = {"event_time": moment, "kind": "LAB", "event_id": "a|b"}
+        cursor = timeline_service._encode_cursor(row)
+
+        self.assertEqual(timeline_service._decode_cursor(cursor), (moment, "LAB", "a|b"))
+
+    def test_sync_token_round_trip(self):
+        moment = datetime(2026, 4, 17, 9, 30, tzinfo=timezone.utc)
+
+        self.assertEqual(
+            sync_service._decode_token(sync_service._encode_token(moment)), moment
+        )
+
+    def test_malformed_tokens_are_validation_errors(self):
+        for decode, token in (
+            (agenda_service._decode_cursor, "not base64!"),
+            (agenda_service._decode_cursor, "MjAyNi0wNC0xNw"),
+            (timeline_service._decode_cursor, "eHx5"),
+            (sync_service._decode_token, "eHx5"),
+        ):
+            with self.subTest(token=token), self.assertRaises(ValidationException):
+                decode(token)
+
+
+class PaymentFulfilTests(SimpleTestCase):
+    def test_missing_hold_records_failure(self):
+        payment = {
+            "payment_id": uuid.uuid4(),
+            "patient_id": str(uuid.uuid4()),
+            "payment_for": "SLOT_HOLD",
+            "reference_id": "42",
+        }
+        with mock.patch(
+            "users.services.payment_service._execute"
+        ) as execute, mock.patch(
+            "users.services.slot_hold_service.SlotHoldService.get_hold_for_patient",
+            side_effect=NotFoundException("Hold not found."),
+        ):
+            with self.assertRaises(ConflictException):
+                PaymentService.fulfil(payment)
+
+        sql, params = execute.call_args.args
+        self.assertIn("failure_reason", sql)
+        self.assertEqual(params[1], str(payment["payment_id"]))
+
+
+class RescheduleTests(SimpleTestCase):
+    def test_appointment_errors_map_to_app_exceptions(self):
+        cases = {
+            "APPOINTMENT_NOT_FOUND": NotFoundException,
+            "NOT_AUTHORISED": PermissionException,
+            "APPOINTMENT_CLOSED": ValidationException,
+            "SLOT_ALREADY_BOOKED": ConflictException,
+        }
+        for code, exc_class in cases.items():
+            with self.subTest(code=code), mock.patch(
+                "users.services.appointment_service.dq.reschedule_appointment",
+                side_effect=DatabaseError(code),
+            ):
+                with self.assertRaises(exc_class):
+                    AppointmentService.reschedule_appointment(1, 2, str(uuid.uuid4()))
+
+    def test_lab_booking_scoped_by_role(self):
+        user_id = str(uuid.uuid4())
+        path = "users.services.lab_booking_service.bq.reschedule_lab_booking"
+        for role, scope in (
+            (UserRole.PATIENT, {"patient_id": user_id}),
+            (UserRole.LAB, {"lab_id": user_id}),
+            (UserRole.ADMIN, {}),
+        ):
+            with self.subTest(role=role), mock.patch(path, return_value={}) as call:
+                LabBookingService.reschedule_booking("b1", 5, user_id, role)
+                kwargs = call.call_args.kwargs
+                kwargs.pop("today")
+                self.assertEqual(kwargs, scope)
+
+    def test_lab_booking_refused_for_other_roles(self):
+        path = "users.services.lab_booking_service.bq.reschedule_lab_booking"
+        for role in (UserRole.DOCTOR, UserRole.STAFF, None):
+            with self.subTest(role=role), mock.patch(path) as call:
+                with self.assertRaises(PermissionException):
+                    LabBookingService.reschedule_booking("b1", 5, str(uuid.uuid4()), role)
+                call.assert_not_called()
+
+
+class DoctorDirectoryTests(SimpleTestCase):
+    def test_specializations_come_from_the_directory_query(self):
+        doctor = {
+            "doctor_id": uuid.uuid4(),
+            "full_name": "Dr. Test",
+            "email": "doc@example.com",
+            "phone_number": "9999999999",
+            "consultation_fee": Decimal("500.00"),
+            "experience_years": Decimal("5"),
+            "registration_number": "REG-1",
+            "is_active": True,
+            "verification_status": "VERIFIED",
+            "verification_notes": None,
+            "verified_at": None,
+            "created_at": None,
+            "updated_at": None,
+            "gender": "Female",
+            "free_today": 2,
+            "free_next_7_days": 9,
+            "specializations": [
+                {"specialization_id": 1, "specialization_name": "Cardiology",
+                 "is_primary": True},
+            ],
+        }
+        request = APIRequestFactory().get("/doctors/")
+        with mock.patch(
+            "users.views.doctor_view.dq.get_doctor_directory", return_value=[doctor]
+        ), mock.patch(
+            "users.views.doctor_view.dq.get_doctor_specializations"
+        ) as per_doctor:
+            response = DoctorListView.as_view()(request)
+
+        per_doctor.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["data"][0]["specializations"], doctor["specializations"]
+        )
+
+
+_SQL_DIR = Path(__file__).resolve().parent / "sql_tables_and_funs"
+
+# Just the columns the slot hold and waitlist functions read from the
+# core tables, so those functions can run against a bare test database.
+_WAITLIST_FIXTURE_DDL = """
+CREATE TABLE IF NOT EXISTS users (user_id UUID PRIMARY KEY, email VARCHAR(255));
+CREATE TABLE IF NOT EXISTS doctors (
+    doctor_id UUID PRIMARY KEY, full_name VARCHAR(255), consultation_fee NUMERIC(10,2)
+);
+CREATE TABLE IF NOT EXISTS doctor_schedules (schedule_id SERIAL PRIMARY KEY, doctor_id UUID);
+CREATE TABLE IF NOT EXISTS appointment_slots (
+    slot_id SERIAL PRIMARY KEY, schedule_id INT, slot_date DATE,
+    start_time TIME, end_time TIME,
+    is_booked BOOLEAN NOT NULL DEFAULT FALSE, is_blocked BOOLEAN NOT NULL DEFAULT FALSE,
+    blocked_exception_id INT
+);
+CREATE TABLE IF NOT EXISTS labs (lab_id UUID PRIMARY KEY, lab_name VARCHAR(255));
+CREATE TABLE IF NOT EXISTS lab_test_slots (
+    slot_id SERIAL PRIMARY KEY, lab_id UUID, slot_date DATE,
+    start_time TIME, end_time TIME, booked_count INT NOT NULL DEFAULT 0,
+    capacity INT NOT NULL DEFAULT 1, is_active BOOLEAN NOT NULL DEFAULT TRUE
+);
+CREATE TABLE IF NOT EXISTS schedule_exceptions (
+    exception_id SERIAL PRIMARY KEY, doctor_id UUID,
+    start_date DATE NOT NULL, end_date DATE NOT NULL, start_time TIME, end_time TIME,
+    reason TEXT, created_by UUID, created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+"""
+
+
+class _WaitlistFixtureMixin:
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with connection.cursor() as cursor:
+            cursor.execute(_WAITLIST_FIXTURE_DDL)
+            for name in (
+                "Tables/slot_hold_tables.sql",
+                "Tables/waitlist_tables.sql",
+                "functions/slot_hold_functions.sql",
+                "functions/waitlist_functions.sql",
+            ):
+                cursor.execute((_SQL_DIR / name).read_text())
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "TRUNCATE waitlist_entries, slot_holds, appointment_slots, "
+                "schedule_exceptions, doctor_schedules, doctors, users RESTART IDENTITY"
+            )
+        self.doctor_id = str(uuid.uuid4())
+        self.slot_date = dj_timezone.localdate() + timedelta(days=1)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO doctors VALUES (%s, 'Dr. Test', 500)", [self.doctor_id]
+            )
+            cursor.execute(
+                "INSERT INTO doctor_schedules (doctor_id) VALUES (%s)", [self.doctor_id]
+            )
+            for i in range(3):
+                patient_id = str(uuid.uuid4())
+                cursor.execute(
+                    "INSERT INTO users VALUES (%s, %s)", [patient_id, f"p{i}@example.com"]
+                )
+                cursor.execute(
+                    "INSERT INTO waitlist_entries "
+                    "(target_type, target_id, patient_id, date_from, date_to, created_at) "
+                    "VALUES ('DOCTOR', %s, %s, %s, %s, NOW() + make_interval(secs => %s))",
+                    [self.doctor_id, patient_id, self.slot_date, self.slot_date, i],
+                )
+
+    def _add_slot(self, start_hour, booked=False):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO appointment_slots "
+                "(schedule_id, slot_date, start_time, end_time, is_booked) "
+                "VALUES (1, %s, %s, %s, %s) RETURNING slot_id",
+                [self.slot_date, time(start_hour), time(start_hour, 30), booked],
+            )
+            return cursor.fetchone()[0]
+
+
+class WaitlistOfferConcurrencyTests(_WaitlistFixtureMixin, TransactionTestCase):
+    """Runs w_offer_freed_slot from several connections at once."""
+
+    def _offer_concurrently(self, slot_ids):
+        start = threading.Barrier(len(slot_ids))
+        offers = []
+
+        def offer(slot_id):
+            try:
+                start.wait()
+                offers.append(WaitlistService.offer_slot("DOCTOR", slot_id))
+            finally:
+                connection.close()
+
+        with mock.patch(
+            "users.services.email_service.EmailService.send_waitlist_offer"
+        ):
+            threads = [threading.Thread(target=offer, args=(s,)) for s in slot_ids]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        return [o for o in offers if o]
+
+    def _offered_entries(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT patient_id, offered_slot_id FROM waitlist_entries "
+                "WHERE status = 'OFFERED'"
+            )
+            return cursor.fetchall()
+
+    def test_one_slot_offered_to_exactly_one_entry(self):
+        slot_id = self._add_slot(9)
+
+        offers = self._offer_concurrently([slot_id] * 4)
+
+        self.assertEqual(len(offers), 1)
+        self.assertEqual(len(self._offered_entries()), 1)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM slot_holds WHERE slot_id = %s", [slot_id])
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_simultaneous_frees_go_to_different_patients(self):
+        slot_ids = [self._add_slot(9), self._add_slot(10)]
+
+        offers = self._offer_concurrently(slot_ids)
+
+        entries = self._offered_entries()
+        self.assertEqual(len(offers), 2)
+        self.assertEqual(len({patient for patient, _ in entries}), 2)
+        self.assertEqual(sorted(slot for _, slot in entries), sorted(slot_ids))
+
+
+class SlotReleaseTests(_WaitlistFixtureMixin, TransactionTestCase):
+    """A freed slot stays blocked while an exception still covers it."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with connection.cursor() as cursor:
+            cursor.execute((_SQL_DIR / "Tables/availability_tables.sql").read_text())
+            cursor.execute(
+                (_SQL_DIR / "functions/availability_functions.sql").read_text()
+            )
+            # Only the slot release and exception functions run here; skip
+            # validating the SQL functions over tables this fixture lacks.
+            cursor.execute("SET check_function_bodies = off")
+            cursor.execute((_SQL_DIR / "functions/doctor_functions.sql").read_text())
+            cursor.execute("RESET check_function_bodies")
+
+    def setUp(self):
+        super().setUp()
+        with connection.cursor() as cursor:
+            cursor.execute("TRUNCATE slot_availability_daily")
+
+    def _add_leave(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO schedule_exceptions (doctor_id, start_date, end_date) "
+                "VALUES (%s, %s, %s) RETURNING exception_id",
+                [self.doctor_id, self.slot_date, self.slot_date],
+            )
+            return cursor.fetchone()[0]
+
+    def _free_slots(self, slot_date):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT free_slots FROM slot_availability_daily "
+                "WHERE target_id = %s AND slot_date = %s",
+                [self.doctor_id, slot_date],
+            )
+            row = cursor.fetchone()
+            return row[0] if row else None
+
+    def _slot_state(self, slot_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT is_booked, is_blocked, blocked_exception_id "
+                "FROM appointment_slots WHERE slot_id = %s",
+                [slot_id],
+            )
+            return cursor.fetchone()
+
+    def test_release_during_leave_reblocks_slot(self):
+        slot_id = self._add_slot(9, booked=True)
+        exception_id = self._add_leave()
+
+        self.assertFalse(dq.release_slot(slot_id))
+        self.assertEqual(self._slot_state(slot_id), (False, True, exception_id))
+
+    def test_release_outside_leave_frees_slot(self):
+        slot_id = self._add_slot(9, booked=True)
+
+        self.assertTrue(dq.release_slot(slot_id))
+        self.assertEqual(self._slot_state(slot_id), (False, False, None))
+
+    def test_deleting_exception_unblocks_every_day(self):
+        next_day = self.slot_date + timedelta(days=1)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO schedule_exceptions (doctor_id, start_date, end_date) "
+                "VALUES (%s, %s, %s) RETURNING exception_id",
+                [self.doctor_id, self.slot_date, next_day],
+            )
+            exception_id = cursor.fetchone()[0]
+            cursor.execute(
+                "INSERT INTO appointment_slots (schedule_id, slot_date, start_time, "
+                "end_time, is_blocked, blocked_exception_id) "
+                "VALUES (1, %s, '09:00', '09:30', TRUE, %s), "
+                "(1, %s, '09:00', '09:30', TRUE, %s)",
+                [self.slot_date, exception_id, next_day, exception_id],
+            )
+            self.assertEqual(self._free_slots(self.slot_date), 0)
+
+            cursor.execute(
+                "SELECT * FROM d_delete_schedule_exception(%s)", [exception_id]
+            )
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+        self.assertEqual(self._free_slots(self.slot_date), 1)
+        self.assertEqual(self._free_slots(next_day), 1)
+
+    def test_blocked_slot_is_not_offered(self):
+        slot_id = self._add_slot(9, booked=True)
+        self._add_leave()
+        dq.release_slot(slot_id)
+
+        with mock.patch(
+            "users.services.email_service.EmailService.send_waitlist_offer"
+        ) as send:
+            self.assertIsNone(WaitlistService.offer_slot("DOCTOR", slot_id))
+        send.assert_not_called()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM slot_holds")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_cancel_skips_offer_for_blocked_slot(self):
+        appointment = {
+            "status": "scheduled",
+            "patient_id": self.doctor_id,
+            "doctor_id": self.doctor_id,
+            "slot_id": 7,
+        }
+        with mock.patch.multiple(
+            "users.services.appointment_service.dq",
+            lock_appointment_for_update=mock.Mock(return_value=appointment),
+            update_appointment=mock.DEFAULT,
+            release_slot=mock.Mock(return_value=False),
+            get_appointment_by_id=mock.DEFAULT,
+        ), mock.patch.object(WaitlistService, "offer_slot") as offer:
+            AppointmentService.cancel_appointment(1, self.doctor_id)
+        offer.assert_not_called()
+
+
+class LogoutTests(SimpleTestCase):
+    def test_revoke_failure_still_logs_out(self):
+        request = APIRequestFactory().post("/auth/logout/")
+        request.COOKIES["refresh_token"] = "token"
+        force_authenticate(request, user=mock.Mock(is_authenticated=True))
+        with mock.patch(
+            "users.views.auth_views.revoke_refresh_token",
+            side_effect=DatabaseError("connection lost"),
+        ):
+            response = LogoutView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies["refresh_token"].value, "")
+
+
+# The further columns auth_rotate_refresh_token reads, added on top of
+# _WAITLIST_FIXTURE_DDL since both fixtures share the test database.
+_AUTH_FIXTURE_DDL = """
+ALTER TABLE users
+    ADD COLUMN IF NOT EXISTS email_verified BOOLEAN,
+    ADD COLUMN IF NOT EXISTS is_active BOOLEAN,
+    ADD COLUMN IF NOT EXISTS oauth_provider VARCHAR(50),
+    ADD COLUMN IF NOT EXISTS oauth_provider_id VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS two_factor_enabled BOOLEAN,
+    ADD COLUMN IF NOT EXISTS failed_login_attempts INT,
+    ADD COLUMN IF NOT EXISTS lockout_until TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS created_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS last_login_at TIMESTAMPTZ,
+    ADD COLUMN IF NOT EXISTS role_id INT;
+CREATE TABLE IF NOT EXISTS user_roles (role_id INT PRIMARY KEY, role VARCHAR(50));
+CREATE TABLE IF NOT EXISTS patients (patient_id UUID PRIMARY KEY);
+ALTER TABLE patients ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+ALTER TABLE doctors ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+ALTER TABLE labs ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ;
+"""
+
+
+class RefreshReuseGraceTests(TransactionTestCase):
+    """Re-presenting a just-rotated refresh token inside the grace window."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with connection.cursor() as cursor:
+            cursor.execute(_WAITLIST_FIXTURE_DDL)
+            cursor.execute(_AUTH_FIXTURE_DDL)
+            cursor.execute((_SQL_DIR / "Tables/refresh_token_tables.sql").read_text())
+            cursor.execute("SET check_function_bodies = off")
+            cursor.execute((_SQL_DIR / "functions/auth_functions.sql").read_text())
+            cursor.execute("RESET check_function_bodies")
+
+    def setUp(self):
+        self.user_id = str(uuid.uuid4())
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "TRUNCATE refresh_token_denylist, refresh_token_revoked_families, "
+                "users, user_roles"
+            )
+            cursor.execute("INSERT INTO user_roles VALUES (1, 'PATIENT')")
+            cursor.execute(
+                "INSERT INTO users (user_id, email, is_active, role_id) "
+                "VALUES (%s, 'p@example.com', TRUE, 1)",
+                [self.user_id],
+            )
+        self.jti = str(uuid.uuid4())
+        self.family_id = str(uuid.uuid4())
+
+    def _rotate(self, grace_seconds=10):
+        now = dj_timezone.now()
+        row = uq.rotate_refresh_token(
+            self.jti, self.family_id, self.user_id,
+            now + timedelta(days=7), now + timedelta(days=7), grace_seconds,
+        )
+        return row["rotation_status"]
+
+    def _family_revoked(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM refresh_token_revoked_families "
+                "WHERE family_id = %s",
+                [self.family_id],
+            )
+            return cursor.fetchone()[0] == 1
+
+    def test_reuse_within_grace_keeps_family(self):
+        self.assertEqual(self._rotate(), "OK")
+        self.assertEqual(self._rotate(), "OK")
+        self.assertFalse(self._family_revoked())
+
+    def test_reuse_after_grace_revokes_family(self):
+        self.assertEqual(self._rotate(), "OK")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "UPDATE refresh_token_denylist "
+                "SET consumed_at = NOW() - INTERVAL '1 minute'"
+            )
+
+        self.assertEqual(self._rotate(), "REUSED")
+        self.assertTrue(self._family_revoked())
+
+    def test_no_grace_revokes_on_first_reuse(self):
+        self.assertEqual(self._rotate(grace_seconds=0), "OK")
+        self.assertEqual(self._rotate(grace_seconds=0), "REUSED")
+        self.assertTrue(self._family_revoked())
+
+
+def _rsa_key():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return key, public_pem.decode()
+
+
+class GoogleTokenVerificationTests(SimpleTestCase):
+    """Local verification against a stub certificate set; Google is never
+    contacted."""
+
+    client_id = "client-1.apps.googleusercontent.com"
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.key, cls.public_pem = _rsa_key()
+        cls.other_key, _ = _rsa_key()
+
+    def setUp(self):
+        for patcher in (
+            mock.patch.object(oauth_service, "_certs", None),
+            mock.patch.object(oauth_service, "_breaker", oauth_service._CircuitBreaker()),
+            mock.patch.object(OAuthService, "GOOGLE_CLIENT_ID", self.client_id),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        fetch = mock.patch.object(
+            oauth_service, "_fetch_certs", side_effect=self._fetch_certs
+        )
+        self.fetch = fetch.start()
+        self.addCleanup(fetch.stop)
+        self.certs = {"kid-1": self.public_pem}
+
+    def _fetch_certs(self):
+        now = oauth_service.time.monotonic()
+        return dict(self.certs), now + 300, now
+
+    def _token(self, kid="kid-1", key=None, **claims):
+        now = int(datetime.now(timezone.utc).timestamp())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": self.client_id,
+            "sub": "google-user-1",
+            "email": "user@example.com",
+            "iat": now,
+            "exp": now + 3600,
+            **claims,
+        }
+        return jwt.encode(
+            payload, key or self.key, algorithm="RS256", headers={"kid": kid}
+        )
+
+    def test_valid_token(self):
+        idinfo = OAuthService.verify_google_token(self._token())
+
+        self.assertEqual(idinfo["sub"], "google-user-1")
+        self.assertEqual(self.fetch.call_count, 1)
+
+    def test_wrong_audience(self):
+        with self.assertRaises(AuthenticationException):
+            OAuthService.verify_google_token(self._token(aud="someone-else"))
+
+    def test_expired_token(self):
+        now = int(datetime.now(timezone.utc).timestamp())
+        with self.assertRaises(AuthenticationException):
+            OAuthService.verify_google_token(
+                self._token(iat=now - 7200, exp=now - 3600)
+            )
+
+    def test_bad_signature(self):
+        with self.assertRaises(AuthenticationException):
+            OAuthService.verify_google_token(self._token(key=self.other_key))
+
+    def test_unknown_kid_refetches_certs(self):
+        now = oauth_service.time.monotonic()
+        stale_fetch = now - oauth_service._MIN_FORCED_REFRESH_SECONDS - 1
+        oauth_service._certs = ({"kid-0": self.public_pem}, now + 300, stale_fetch)
+
+        idinfo = OAuthService.verify_google_token(self._token())
+
+        self.assertEqual(idinfo["sub"], "google-user-1")
+        self.assertEqual(self.fetch.call_count, 1)
+        self.assertIn("kid-1", oauth_service._certs[0])
+
+    def test_missing_client_id_fails_closed(self):
+        with mock.patch.object(OAuthService, "GOOGLE_CLIENT_ID", None):
+            with self.assertRaises(ServiceUnavailableException):
+                OAuthService.verify_google_token(self._token())
+        self.fetch.assert_not_called()
+
+
+@override_settings(
+    RATE_LIMIT_BACKEND="local",
+    AUTH_RATE_LIMITS={"login": {"ip": "2/min", "email": "10/min", "route": "3/min"}},
+)
+class RateLimiterTests(SimpleTestCase):
+    def setUp(self):
+        rate_limiter._local.clear()
+        self.addCleanup(rate_limiter._local.clear)
+
+    def test_refused_request_costs_no_shared_tokens(self):
+        for _ in range(10):
+            rate_limiter.check("login", ip="10.0.0.1", email="a@example.com")
+
+        # The route bucket holds 3: two went to the first IP, one is left.
+        self.assertEqual(rate_limiter.check("login", ip="10.0.0.2"), 0)
+        self.assertGreater(rate_limiter.check("login", ip="10.0.0.3"), 0)
+
+    @override_settings(RATE_LIMIT_BACKEND="postgres")
+    def test_shared_refusal_refunds_local_tokens(self):
+        with mock.patch.object(rate_limiter, "_take_shared", return_value=5.0):
+            for _ in range(10):
+                self.assertEqual(rate_limiter.check("login", ip="10.0.0.1"), 5.0)
+        with mock.patch.object(rate_limiter, "_take_shared", return_value=0.0):
+            self.assertEqual(rate_limiter.check("login", ip="10.0.0.1"), 0)
+
+
+class SharedRateLimitTests(TransactionTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with connection.cursor() as cursor:
+            cursor.execute((_SQL_DIR / "Tables/rate_limit_tables.sql").read_text())
+            cursor.execute((_SQL_DIR / "functions/rate_limit_functions.sql").read_text())
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("TRUNCATE rate_limit_buckets")
+
+    def _take(self, ip):
+        return rlq.take_tokens(["login:route", f"login:ip:{ip}"], [3, 1], [0.001, 0.001])
+
+    def test_refused_request_costs_no_shared_tokens(self):
+        self.assertEqual(self._take("a"), 0)
+        for _ in range(5):
+            self.assertGreater(self._take("a"), 0)
+
+        self.assertEqual(self._take("b"), 0)
+        self.assertEqual(self._take("c"), 0)
+        self.assertGreater(self._take("d"), 0)
@@ -0,0 +1,23 @@
+# backend\users\throttles.py
+from rest_framework.throttling import BaseThrottle
+
+from users.helpers.request_helpers import get_client_ip
+from users.middleware.exceptions import RateLimitException
+from users.services import rate_limiter
+
+
+class AuthRateThrottle(BaseThrottle):
+    """Token buckets per route, client IP and submitted email, named by the
+    view's ``throttle_scope``. Runs before the view body, so a refused
+    request never reaches bcrypt or the users table."""
+
+    def allow_request(self, request, view):
+        email = request.data.get("email") if hasattr(request.data, "get") else None
+        wait = rate_limiter.check(
+            view.throttle_scope,
+            ip=get_client_ip(request),
+            email=email if isinstance(email, str) else None,
+        )
+        if wait:
+            raise RateLimitException(retry_after=wait)
+        return True
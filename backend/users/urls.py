@@ -1,7 +1,7 @@
 # backend/users/urls.py
 
 from django.urls import path
-from .views.admin_dashboard_views import PendingApprovalsCountView
+from .views.admin_dashboard_views import PendingApprovalsCountView, QueryMemoStatsView
 from .views.admin_user_views import (
     AdminPatientListView,
     AdminDoctorListView,
@@ -58,8 +58,17 @@ from .views.settings_views import (
     SettingsVerificationTypesView,
     SettingsUserRolesView,
 )
-from .views.patients_view import PatientRegistrationView, PatientProfileView
-from .views.lab_view import LabRegistrationView, LabProfileView, LabOperatingHoursView
+from .views.patients_view import (
+    PatientRegistrationView,
+    PatientProfileView,
+    PatientTimelineView,
+)
+from .views.lab_view import (
+    LabRegistrationView,
+    LabProfileView,
+    LabOperatingHoursView,
+    LabDirectoryView,
+)
 from .views.lab_service_view import (
     LabTestCategoryListView,
     LabTestCategoryDetailView,
@@ -74,11 +83,13 @@ from .views.lab_test_booking import (
     LabBookingListCreateView,
     LabBookingDetailView,
     LabBookingCancelView,
+    LabBookingRescheduleView,
     LabBookingCompleteView,
     LabOwnBookingsView,
     LabBookingReportListView,
     LabSlotListView,
     LabSlotGenerateView,
+    LabSlotCapacityView,
 )
 from .views.doctor_view import (
     DoctorRegistrationView,
@@ -89,7 +100,9 @@ from .views.doctor_view import (
     GenerateSlotsView,
     BookAppointmentView,
     MyAppointmentsView,
+    DoctorAgendaView,
     CancelAppointmentView,
+    RescheduleAppointmentView,
 )
 
 from .views.payment_views import (
@@ -99,6 +112,21 @@ from .views.payment_views import (
     PaymentHistoryView,
     RazorpayWebhookView,
 )
+from .views.slot_hold_views import (
+    DoctorSlotHoldView,
+    LabSlotHoldView,
+    SlotHoldReleaseView,
+)
+from .views.schedule_exception_views import (
+    ScheduleExceptionDetailView,
+    ScheduleExceptionListCreateView,
+)
+from .views.waitlist_views import (
+    DoctorWaitlistView,
+    LabWaitlistView,
+    MyWaitlistView,
+    WaitlistEntryView,
+)
 from .views.prescription_view import (
     PrescribeAppointmentView,
     AppointmentPrescriptionView,
@@ -198,6 +226,11 @@ urlpatterns = [
         PendingApprovalsCountView.as_view(),
         name="admin-pending-approvals-count",
     ),
+    path(
+        "users/admin/query-memo-stats/",
+        QueryMemoStatsView.as_view(),
+        name="admin-query-memo-stats",
+    ),
     path(
         "users/admin/recent-activity/",
         AuditLogsView.as_view(),
@@ -284,9 +317,11 @@ urlpatterns = [
         "patients/register/", PatientRegistrationView.as_view(), name="patient-register"
     ),
     path("patients/profile/", PatientProfileView.as_view(), name="patient-profile"),
+    path("patients/timeline/", PatientTimelineView.as_view(), name="patient-timeline"),
     # ── Labs ──────────────────────────────────────────────────────────────────
     path("labs/register/", LabRegistrationView.as_view(), name="lab-register"),
     path("labs/profile/", LabProfileView.as_view(), name="lab-profile"),
+    path("labs/list/", LabDirectoryView.as_view(), name="lab-directory"),
     path(
         "labs/operating-hours/",
         LabOperatingHoursView.as_view(),
@@ -326,6 +361,11 @@ urlpatterns = [
         LabBookingCancelView.as_view(),
         name="lab-booking-cancel",
     ),
+    path(
+        "labs/bookings/<uuid:booking_id>/reschedule/",
+        LabBookingRescheduleView.as_view(),
+        name="lab-booking-reschedule",
+    ),
     path(
         "labs/bookings/<uuid:booking_id>/complete/",
         LabBookingCompleteView.as_view(),
@@ -343,6 +383,11 @@ urlpatterns = [
     path(
         "labs/slots/generate/", LabSlotGenerateView.as_view(), name="lab-slots-generate"
     ),
+    path(
+        "labs/slots/<int:slot_id>/capacity/",
+        LabSlotCapacityView.as_view(),
+        name="lab-slot-capacity",
+    ),
     # ─────────────────────────────────────────────────────────────────────────
     path("doctors/register/", DoctorRegistrationView.as_view(), name="doctor-register"),
     path("doctors/profile/", DoctorProfileView.as_view(), name="doctor-profile"),
@@ -352,6 +397,16 @@ urlpatterns = [
         GenerateSlotsView.as_view(),
         name="doctor-slots-generate",
     ),
+    path(
+        "doctors/schedule-exceptions/",
+        ScheduleExceptionListCreateView.as_view(),
+        name="doctor-schedule-exceptions",
+    ),
+    path(
+        "doctors/schedule-exceptions/<int:exception_id>/",
+        ScheduleExceptionDetailView.as_view(),
+        name="doctor-schedule-exception-detail",
+    ),
     path(
         "doctors/appointments/book/",
         BookAppointmentView.as_view(),
@@ -362,11 +417,21 @@ urlpatterns = [
         MyAppointmentsView.as_view(),
         name="doctor-appointment-list",
     ),
+    path(
+        "doctors/agenda/",
+        DoctorAgendaView.as_view(),
+        name="doctor-agenda",
+    ),
     path(
         "doctors/appointments/<int:appointment_id>/cancel/",
         CancelAppointmentView.as_view(),
         name="doctor-appointment-cancel",
     ),
+    path(
+        "doctors/appointments/<int:appointment_id>/reschedule/",
+        RescheduleAppointmentView.as_view(),
+        name="doctor-appointment-reschedule",
+    ),
     # ── Doctors — dynamic paths ───────────────────────────────────────────────
     path("doctors/<uuid:user_id>/", DoctorDetailView.as_view(), name="doctor-detail"),
     path(
@@ -374,6 +439,23 @@ urlpatterns = [
         AvailableSlotsView.as_view(),
         name="doctor-slots",
     ),
+    # ── Checkout holds ───────────────────────────────────────────────────────
+    path("holds/doctor-slot/", DoctorSlotHoldView.as_view(), name="hold-doctor-slot"),
+    path("holds/lab-slot/", LabSlotHoldView.as_view(), name="hold-lab-slot"),
+    path(
+        "holds/<uuid:hold_id>/",
+        SlotHoldReleaseView.as_view(),
+        name="hold-release",
+    ),
+    # ── Waitlist ─────────────────────────────────────────────────────────────
+    path("waitlist/", MyWaitlistView.as_view(), name="waitlist-mine"),
+    path("waitlist/doctor/", DoctorWaitlistView.as_view(), name="waitlist-doctor"),
+    path("waitlist/lab/", LabWaitlistView.as_view(), name="waitlist-lab"),
+    path(
+        "waitlist/<uuid:entry_id>/",
+        WaitlistEntryView.as_view(),
+        name="waitlist-entry",
+    ),
     path("payments/create-order/", CreateOrderView.as_view(),    name="payment-create-order"),
     path("payments/verify/",       VerifyPaymentView.as_view(),  name="payment-verify"),
     path("payments/refund/",       RefundPaymentView.as_view(),  name="payment-refund"),
@@ -3,6 +3,8 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
+from ..database_queries import request_memo
+from ..permissions import IsSuperAdmin
 from ..services import AdminService
 from ..services.success_response import send_success_msg
 
@@ -13,3 +15,11 @@ class PendingApprovalsCountView(generics.GenericAPIView):
     def get(self, request):
         return send_success_msg(AdminService.get_pending_approvals_count())
 
+
+class QueryMemoStatsView(generics.GenericAPIView):
+    """Queries saved by the request memo, per endpoint, for this process."""
+
+    permission_classes = [IsAuthenticated, IsSuperAdmin]
+
+    def get(self, request):
+        return send_success_msg(request_memo.stats())
@@ -3,6 +3,8 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
+from users.permissions import HasModulePermission
+
 from users.middleware.exceptions import (
     NotFoundException,
 )
@@ -25,7 +27,8 @@ from users.services.audit_logs import insert_audit_log
 
 
 class AdminPatientListView(generics.GenericAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasModulePermission]
+    required_permission = "patient:view"
     pagination_class = None
     serializer_class = PatientListSerializer
 
@@ -36,7 +39,8 @@ class AdminPatientListView(generics.GenericAPIView):
 
 
 class AdminDoctorListView(generics.GenericAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasModulePermission]
+    required_permission = "doctor:view"
     pagination_class = None
     serializer_class = DoctorListSerializer
 
@@ -50,7 +54,8 @@ class AdminDoctorListView(generics.GenericAPIView):
 
 
 class AdminLabListView(generics.GenericAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasModulePermission]
+    required_permission = "lab:view"
     serializer_class = LabListSerializer
 
     def get(self, request):
@@ -60,7 +65,8 @@ class AdminLabListView(generics.GenericAPIView):
 
 
 class AdminTogglePatientStatusView(generics.GenericAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasModulePermission]
+    required_permission = "patient:toggle_status"
     serializer_class = PatientProfileSerializer
 
     def patch(self, request, user_id):
@@ -104,7 +110,8 @@ class AdminTogglePatientStatusView(generics.GenericAPIView):
 
 
 class AdminToggleDoctorStatusView(generics.GenericAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasModulePermission]
+    required_permission = "doctor:toggle_status"
     serializer_class = DoctorProfileSerializer
 
     def patch(self, request, user_id):
@@ -148,7 +155,8 @@ class AdminToggleDoctorStatusView(generics.GenericAPIView):
 
 
 class AdminToggleLabStatusView(generics.GenericAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasModulePermission]
+    required_permission = "lab:toggle_status"
     serializer_class = LabProfileSerializer
 
     def patch(self, request, user_id):
@@ -3,6 +3,8 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
+from users.permissions import HasModulePermission
+
 from users.middleware.exceptions import (
     ValidationException,
     NotFoundException,
@@ -15,7 +17,8 @@ from ..services.success_response import send_success_msg
 
 
 class AdminVerifyDoctorView(generics.GenericAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasModulePermission]
+    required_permission = "doctor:verify"
 
     def patch(self, request, user_id):
         if not dq.get_doctor_by_user_id(user_id):
@@ -45,7 +48,8 @@ class AdminVerifyDoctorView(generics.GenericAPIView):
 
 
 class AdminVerifyLabView(generics.GenericAPIView):
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, HasModulePermission]
+    required_permission = "lab:verify"
 
     def patch(self, request, user_id):
         from ..serializers.lab_serializers import LabProfileSerializer
@@ -10,13 +10,13 @@ from users.middleware.exceptions import (
     TokenExpiredException,
     PermissionException,
 )
-from ..services import AuthService, EmailService, password_service
+from ..services import AuthService, EmailService, password_service, permission_matrix
 from ..helpers import (
     set_auth_response_with_tokens,
     get_profile_data_by_role,
     set_refresh_token_cookie,
 )
-from ..jwt_auth import decode_refresh_token, rotate_refresh_token, UserWrapper
+from ..jwt_auth import revoke_refresh_token, rotate_refresh_token, UserWrapper
 from ..serializers.user_serializers import (
     LoginSerializer,
     LogoutSerializer,
@@ -25,11 +25,14 @@ from ..serializers.user_serializers import (
 from ..database_queries import user_queries as uq
 from ..database_queries import audit_queries as aq
 from ..services.success_response import send_success_msg
+from ..throttles import AuthRateThrottle
 
 
 class LoginView(generics.GenericAPIView):
     authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "login"
     serializer_class = LoginSerializer
 
     def post(self, request):
@@ -39,28 +42,7 @@ class LoginView(generics.GenericAPIView):
         email = serializer.validated_data["email"]
         password = serializer.validated_data["password"]
 
-        user = uq.get_user_by_email(email)
-        if not user:
-            raise PermissionException("Invalid credentials.")
-
-        is_locked, lock_msg = AuthService.check_account_lockout(user)
-        if is_locked:
-            raise PermissionException(lock_msg)
-
-        is_active, active_msg = AuthService.check_account_status(user)
-        if not is_active:
-            raise PermissionException(active_msg)
-
-        if not password_service.verify_password(password, user.get("password", "")):
-            _, msg = AuthService.handle_failed_login(user)
-            raise PermissionException(msg)
-
-        AuthService.handle_successful_login(user["user_id"])
-        user = uq.get_user_by_id(user["user_id"])
-        print(f"\nUser : {user}\n")
-        user_permission = uq.get_user_permission_by_id(user["role_id"])
-        print("\nuser_permission :\n")
-        print(user_permission)
+        user, user_permission = AuthService.login(email, password)
         response_dict, refresh_token = set_auth_response_with_tokens(
             user, "Login successful.", user_permission
         )
@@ -79,8 +61,9 @@ class LogoutView(generics.GenericAPIView):
         if not raw_token:
             return response
         try:
-            payload = decode_refresh_token(raw_token)
-            aq.insert_auth_audit(payload["user_id"], "LOGOUT", "SUCCESS")
+            payload = revoke_refresh_token(raw_token)
+            if payload:
+                aq.insert_auth_audit(payload["user_id"], "LOGOUT", "SUCCESS")
         except Exception:
             pass
         response.delete_cookie("refresh_token")
@@ -90,6 +73,8 @@ class LogoutView(generics.GenericAPIView):
 class RefreshTokenView(generics.GenericAPIView):
     authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "refresh"
 
     def post(self, request: HttpRequest):
         raw_token = request.COOKIES.get("refresh_token")
@@ -97,7 +82,9 @@ class RefreshTokenView(generics.GenericAPIView):
             raise TokenExpiredException("Refresh token is required.")
 
         user_dict, access_token, new_refresh_token = rotate_refresh_token(raw_token)
-        profile_data = get_profile_data_by_role(UserWrapper(user_dict))
+        profile_data = get_profile_data_by_role(
+            UserWrapper(user_dict), version=user_dict.pop("profile_version", None)
+        )
 
         response = Response(
             {
@@ -156,7 +143,7 @@ class GoogleAuthView(generics.GenericAPIView):
         AuthService.handle_successful_login(
             user["user_id"],
         )
-        user_permission = uq.get_user_permission_by_id(user["role_id"])
+        user_permission = permission_matrix.permissions_for_role(user["role"])
 
         response_dict, rt = set_auth_response_with_tokens(
             user, "Google login successful.", user_permission
@@ -182,6 +169,8 @@ class VerifyEmailView(generics.GenericAPIView):
 class ResendVerificationEmailView(generics.GenericAPIView):
     authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "resend_verification"
 
     def post(self, request):
         email = request.data.get("email")
@@ -223,6 +212,8 @@ class ReAuthVerifyView(generics.GenericAPIView):
 class ForgotPasswordView(generics.GenericAPIView):
     authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = [AuthRateThrottle]
+    throttle_scope = "forgot_password"
 
     def post(self, request):
         email = request.data.get("email")
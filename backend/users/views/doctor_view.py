@@ -1,8 +1,11 @@
 # backend\users\views\doctor_view.py
 
+from functools import partial
+
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.utils import timezone
 
 from users.middleware.exceptions import (
     PermissionException,
@@ -18,11 +21,16 @@ from ..serializers.doctor_serializers import (
     DoctorProfileUpdateSerializer,
     DoctorListSerializer,
     BookAppointmentSerializer,
+    RescheduleAppointmentSerializer,
     DoctorAppointmentSerializer,
+    AgendaQuerySerializer,
+    AgendaAppointmentSerializer,
     AppointmentSlotSerializer,
 )
 from ..services.profile_service import DoctorProfileService
 from ..services.appointment_service import AppointmentService
+from ..services.agenda_service import AgendaService
+from ..services.sync_service import SyncService, APPOINTMENT
 from ..database_queries import doctor_queries as dq
 from ..services.success_response import send_success_msg
 
@@ -115,11 +123,7 @@ class DoctorListView(generics.GenericAPIView):
     serializer_class = DoctorListSerializer
 
     def get(self, request):
-        doctors = dq.get_verified_active_doctors()
-        for doc in doctors:
-            doc["specializations"] = dq.get_doctor_specializations(
-                str(doc["doctor_id"])
-            )
+        doctors = dq.get_doctor_directory(timezone.localdate())
         serializer = self.get_serializer(data=doctors, many=True)
         serializer.is_valid(raise_exception=True)
         return send_success_msg(serializer.validated_data)
@@ -227,6 +231,29 @@ class CancelAppointmentView(generics.GenericAPIView):
         )
 
 
+class RescheduleAppointmentView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = RescheduleAppointmentSerializer
+
+    def patch(self, request, appointment_id):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        appointment = AppointmentService.reschedule_appointment(
+            appointment_id=appointment_id,
+            new_slot_id=serializer.validated_data["slot_id"],
+            user_id=str(request.user.user_id),
+        )
+
+        from users.services.email_service import EmailService
+        EmailService.send_doctor_appointment_rescheduled(str(appointment["patient_id"]), appointment)
+
+        return send_success_msg(
+            DoctorAppointmentSerializer(appointment).data,
+            message="Appointment rescheduled successfully.",
+        )
+
+
 class MyAppointmentsView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
@@ -235,11 +262,48 @@ class MyAppointmentsView(generics.GenericAPIView):
         user_id = str(request.user.user_id)
 
         if role == UserRole.PATIENT:
-            appointments = dq.get_patient_appointments(user_id)
-            # print(appointments)
+            fetch = partial(dq.get_patient_appointments, user_id)
         elif role == UserRole.DOCTOR:
-            appointments = dq.get_doctor_appointments(user_id)
+            fetch = partial(dq.get_doctor_appointments, user_id)
         else:
             raise PermissionException("Access denied.")
 
-        return send_success_msg(DoctorAppointmentSerializer(appointments, many=True).data)
+        sync = SyncService.delta(
+            APPOINTMENT, user_id, request.query_params.get("since"), fetch
+        )
+        return send_success_msg(
+            DoctorAppointmentSerializer(sync["rows"], many=True).data,
+            deleted=sync["deleted"],
+            sync_token=sync["sync_token"],
+            reset=sync["reset"],
+        )
+
+
+class DoctorAgendaView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = AgendaQuerySerializer
+
+    def get(self, request):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        doctor_id = AgendaService.resolve_doctor(
+            str(request.user.user_id),
+            getattr(request.user, "role", None),
+            params.get("doctor_id"),
+        )
+        date_from, date_to = AgendaService.window(params["view"], params.get("date"))
+
+        etag = AgendaService.etag(doctor_id, date_from, date_to, params)
+        if etag in request.headers.get("If-None-Match", ""):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            agenda = AgendaService.get_agenda(doctor_id, date_from, date_to, params)
+            agenda["results"] = AgendaAppointmentSerializer(
+                agenda["results"], many=True
+            ).data
+            response = send_success_msg(agenda)
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
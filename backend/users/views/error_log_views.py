@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from users.middleware.exceptions import AppException
 from users.database_queries.error_logs_queries import get_error_logs, get_error_log_by_key
+from users.services.error_aggregator import error_aggregator
 
 class ErrorLogsView(APIView):
     def get(self, request):
@@ -14,6 +15,7 @@ class ErrorLogsView(APIView):
         created_by = request.query_params.get("created_by", None)
         from_date = request.query_params.get("from_date", None)
 
+        error_aggregator.flush()
         logs = get_error_logs(created_by, ref_from, from_date, limit)
         return Response({"success": True, "data": logs}, status=status.HTTP_200_OK)
 
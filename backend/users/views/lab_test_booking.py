@@ -15,15 +15,18 @@ from users.middleware.exceptions import (
 )
 from users.models import UserRole
 from users.services.lab_booking_service import LabBookingService
+from users.services.sync_service import SyncService, LAB_BOOKING
 import users.database_queries.lab_booking_queries as bq
 
 from ..serializers.lab_booking_serializers import (
     BookingDetailSerializer,
     CancelBookingSerializer,
     CompleteBookingSerializer,
+    RescheduleBookingSerializer,
     CreateBookingSerializer,
     LabReportSerializer,
     LabSlotSerializer,
+    SlotCapacitySerializer,
 )
 
 logger = logging.getLogger(__name__)
@@ -133,6 +136,33 @@ class LabBookingCancelView(generics.GenericAPIView):
         )
 
 
+class LabBookingRescheduleView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = RescheduleBookingSerializer
+
+    def post(self, request, booking_id):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        booking = LabBookingService.reschedule_booking(
+            booking_id=str(booking_id),
+            new_slot_id=serializer.validated_data["slot_id"],
+            requesting_user_id=str(request.user.user_id),
+            requesting_user_role=getattr(request.user, "role", None),
+        )
+
+        from users.services.email_service import EmailService
+        EmailService.send_lab_booking_rescheduled(str(booking["patient_id"]), booking)
+
+        return Response(
+            {
+                "success": True,
+                "data": BookingDetailSerializer(booking).data,
+                "message": "Booking rescheduled successfully.",
+            }
+        )
+
+
 class LabBookingCompleteView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CompleteBookingSerializer
@@ -171,7 +201,14 @@ class LabOwnBookingsView(generics.GenericAPIView):
     def get(self, request):
         _ensure_lab_or_admin(request.user)
 
-        bookings = bq.list_lab_bookings(str(request.user.user_id))
+        lab_id = str(request.user.user_id)
+        sync = SyncService.delta(
+            LAB_BOOKING,
+            lab_id,
+            request.query_params.get("since"),
+            lambda since: bq.list_lab_bookings(lab_id, since),
+        )
+        bookings = sync["rows"]
         for b in bookings:
             patient = PatientProfileService.get_patient_profile(b["patient_id"])
             b["patient"] = patient
@@ -181,6 +218,9 @@ class LabOwnBookingsView(generics.GenericAPIView):
                 "success": True,
                 "data": BookingDetailSerializer(bookings, many=True).data,
                 "total_count": len(bookings),
+                "deleted": sync["deleted"],
+                "sync_token": sync["sync_token"],
+                "reset": sync["reset"],
             }
         )
 
@@ -293,4 +333,30 @@ class LabSlotGenerateView(generics.GenericAPIView):
                     "message": "An unexpected error occurred while generating slots.",
                 },
                 status=500,
-            )
\ No newline at end of file
+            )
+
+class LabSlotCapacityView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = SlotCapacitySerializer
+
+    def patch(self, request, slot_id):
+        if getattr(request.user, "role", None) != UserRole.LAB:
+            raise PermissionException("Only labs can change slot capacity.")
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        slot = bq.set_slot_capacity(
+            str(request.user.user_id), slot_id, serializer.validated_data["capacity"]
+        )
+        if not slot:
+            raise ValidationException(
+                "Slot not found, or it already has more bookings than the new capacity."
+            )
+        return Response(
+            {
+                "success": True,
+                "data": LabSlotSerializer(slot).data,
+                "message": "Slot capacity updated.",
+            }
+        )
@@ -4,6 +4,7 @@ import json
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from django.utils import timezone
 
 from users.middleware.exceptions import (
     PermissionException,
@@ -18,6 +19,7 @@ from ..serializers.lab_serializers import (
     LabProfileSerializer,
     LabProfileUpdateSerializer,
     LabOperatingHourSerializer,
+    LabDirectorySerializer,
 )
 import users.database_queries.lab_queries as lq
 
@@ -149,3 +151,13 @@ class LabOperatingHoursView(generics.GenericAPIView):
             LabOperatingHourSerializer(hours, many=True).data,
             message="Operating hours updated and slots regenerated successfully.",
         )
+
+
+class LabDirectoryView(generics.GenericAPIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    pagination_class = None
+
+    def get(self, request):
+        labs = lq.get_lab_directory(timezone.localdate())
+        return send_success_msg(LabDirectorySerializer(labs, many=True).data)
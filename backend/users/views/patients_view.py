@@ -13,8 +13,10 @@ from ..serializers.patient_serializers import (
     PatientRegistrationSerializer,
     PatientProfileSerializer,
     PatientProfileUpdateSerializer,
+    TimelineQuerySerializer,
 )
 from ..services.profile_service import PatientProfileService
+from ..services.timeline_service import TimelineService
 from ..services.success_response import send_success_msg
 
 
@@ -91,3 +93,20 @@ class PatientProfileView(generics.GenericAPIView):
             patient, serializer, request=request
         )
         return send_success_msg(updated_data, message="Profile updated successfully.")
+
+
+class PatientTimelineView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = TimelineQuerySerializer
+
+    def get(self, request):
+        if getattr(request.user, "role", None) != UserRole.PATIENT:
+            raise PermissionException("Only patients can access this.")
+
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        timeline = TimelineService.get_timeline(
+            str(request.user.user_id), serializer.validated_data
+        )
+        return send_success_msg(timeline)
@@ -11,8 +11,7 @@ from rest_framework import generics, status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 
-from users.middleware.exceptions import PermissionException
-from users.models import UserRole
+from users.helpers import ensure_patient
 from users.services.success_response import send_success_msg
 from users.services.payment_service import PaymentService, _execute
 
@@ -24,17 +23,12 @@ from ..serializers.payment_serializers import (
 )
 
 
-def _ensure_patient(request) -> None:
-    if getattr(request.user, "role", None) != UserRole.PATIENT:
-        raise PermissionException("Access denied. Patient role required.")
-
-
 class CreateOrderView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = CreateOrderSerializer
 
     def post(self, request):
-        _ensure_patient(request)
+        ensure_patient(request)
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -55,7 +49,7 @@ class VerifyPaymentView(generics.GenericAPIView):
     serializer_class = VerifyPaymentSerializer
 
     def post(self, request):
-        _ensure_patient(request)
+        ensure_patient(request)
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -75,7 +69,7 @@ class RefundPaymentView(generics.GenericAPIView):
     serializer_class = RefundPaymentSerializer
 
     def post(self, request):
-        _ensure_patient(request)
+        ensure_patient(request)
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -95,7 +89,7 @@ class PaymentHistoryView(generics.GenericAPIView):
     serializer_class = PaymentHistoryQuerySerializer
 
     def get(self, request):
-        _ensure_patient(request)
+        ensure_patient(request)
 
         serializer = self.get_serializer(data=request.query_params)
         serializer.is_valid(raise_exception=True)
@@ -152,44 +146,11 @@ class RazorpayWebhookView(generics.GenericAPIView):
 
     def _handle_captured(self, payload):
         p = payload["payload"]["payment"]["entity"]
-        order_id = p.get("order_id")
-        payment = _execute(
-            "SELECT * FROM payments WHERE order_id = %s",
-            [order_id],
-            fetch="one",
-        )
-        if not payment or payment["status"] == "SUCCESS":
+        payment = PaymentService.claim_success(p.get("order_id"), p["id"])
+        if not payment:
             return
 
-        _execute(
-            """
-            UPDATE payments
-               SET status         = 'SUCCESS',
-                   transaction_id = %s,
-                   updated_at     = NOW()
-             WHERE order_id = %s
-            """,
-            [p["id"], order_id],
-        )
-
-        if payment["payment_for"] == "APPOINTMENT":
-            _execute(
-                """
-                UPDATE doctor_appointments
-                   SET status = 'confirmed', updated_at = NOW()
-                 WHERE appointment_id = %s
-                """,
-                [payment["reference_id"]],
-            )
-        else:
-            _execute(
-                """
-                UPDATE lab_test_slot_bookings
-                   SET booking_status = 'BOOKED', updated_at = NOW()
-                 WHERE booking_id = %s
-                """,
-                [payment["reference_id"]],
-            )
+        PaymentService.fulfil(payment)
 
     def _handle_failed(self, payload):
         p = payload["payload"]["payment"]["entity"]
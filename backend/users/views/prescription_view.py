@@ -1,4 +1,5 @@
 # backend/users/views/prescription_view.py
+from django.db import DatabaseError
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -10,6 +11,7 @@ from users.middleware.exceptions import (
 )
 from users.models import UserRole
 from users.services.success_response import send_success_msg
+from users.services.sync_service import SyncService, PRESCRIPTION
 import users.database_queries.doctor_queries as dq
 import users.database_queries.prescription_queries as pq
 from users.services.prescription_service import (
@@ -22,6 +24,13 @@ from users.serializers.prescription_serializers import (
     PatientPrescriptionListSerializer,
 )
 
+# Raised by doc_create_prescription_with_medicines when another request
+# completed the appointment between the view's checks and the insert.
+_CREATE_ERRORS = {
+    "PRESCRIPTION_ALREADY_EXISTS": "A prescription already exists for this appointment.",
+    "APPOINTMENT_ALREADY_CLOSED": "Appointment already completed or cancelled.",
+}
+
 
 class PrescribeAppointmentView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
@@ -50,56 +59,38 @@ class PrescribeAppointmentView(generics.GenericAPIView):
         doctor  = dq.get_full_doctor_profile(doctor_user_id)
         patient = _get_patient_profile(str(appointment["patient_id"]))
 
-        presc_number = generate_prescription_number()
-        prescription_id = pq.create_prescription(
-            appointment_id  = appointment_id,
-            doctor_id       = doctor_user_id,
-            patient_id      = str(appointment["patient_id"]),
-            prescription_number = presc_number,
-            clinical_notes  = data.get("clinical_notes") or None,
-            lab_tests       = data.get("lab_tests")      or None,
-            advice          = data.get("advice")         or None,
-            follow_up_date  = data.get("follow_up_date"),
-        )
-
-        medicines_input = data.get("medicines", [])
-        for idx, med in enumerate(medicines_input):
-            pq.add_prescription_medicine(
-                prescription_id = prescription_id,
-                medicine_name   = med["medicine_name"],
-                dosage          = med.get("dosage")       or None,
-                frequency       = med.get("frequency")    or None,
-                duration        = med.get("duration")     or None,
-                instructions    = med.get("instructions") or None,
-                sort_order      = idx,
+        try:
+            full_prescription = pq.create_prescription_with_medicines(
+                appointment_id  = appointment_id,
+                doctor_id       = doctor_user_id,
+                patient_id      = str(appointment["patient_id"]),
+                prescription_number = generate_prescription_number(),
+                medicines       = data.get("medicines", []),
+                clinical_notes  = data.get("clinical_notes") or None,
+                lab_tests       = data.get("lab_tests")      or None,
+                advice          = data.get("advice")         or None,
+                follow_up_date  = data.get("follow_up_date"),
             )
-
-        medicines_saved = pq.get_prescription_medicines(prescription_id)
-        prescription_row = {
-            "prescription_id":     prescription_id,
-            "prescription_number": presc_number,
-            "clinical_notes":      data.get("clinical_notes"),
-            "lab_tests":           data.get("lab_tests"),
-            "advice":              data.get("advice"),
-            "follow_up_date":      data.get("follow_up_date"),
-        }
+        except DatabaseError as e:
+            for code, message in _CREATE_ERRORS.items():
+                if code in str(e):
+                    raise ValidationException(message) from e
+            raise
+        prescription_id = str(full_prescription["prescription_id"])
 
         try:
             _abs, rel_path = generate_prescription_pdf(
-                prescription = prescription_row,
+                prescription = full_prescription,
                 doctor       = doctor,
                 patient      = patient,
-                medicines    = medicines_saved,
+                medicines    = full_prescription["medicines"],
                 appointment  = appointment,
             )
             pq.update_prescription_pdf(prescription_id, rel_path)
+            full_prescription["pdf_path"] = rel_path
         except Exception as exc:
-            rel_path = None
             print(f"[PrescriptionPDF] generation failed: {exc}")
 
-        full_prescription = pq.get_prescription_by_appointment(appointment_id)
-        full_prescription["medicines"] = pq.get_prescription_medicines(prescription_id)
-
         from users.services.email_service import EmailService
         EmailService.send_prescription_completed(str(appointment["patient_id"]), full_prescription)
 
@@ -153,11 +144,22 @@ class MyPrescriptionsView(generics.GenericAPIView):
         if getattr(request.user, "role", None) != UserRole.PATIENT:
             raise PermissionException("Only patients can access this.")
 
-        prescriptions = pq.get_patient_prescriptions(str(request.user.user_id))
+        patient_id = str(request.user.user_id)
+        sync = SyncService.delta(
+            PRESCRIPTION,
+            patient_id,
+            request.query_params.get("since"),
+            lambda since: pq.get_patient_prescriptions(patient_id, since),
+        )
         out = PatientPrescriptionListSerializer(
-            prescriptions, many=True, context={"request": request}
+            sync["rows"], many=True, context={"request": request}
         ).data
-        return send_success_msg(out)
+        return send_success_msg(
+            out,
+            deleted=sync["deleted"],
+            sync_token=sync["sync_token"],
+            reset=sync["reset"],
+        )
 
 
 
@@ -0,0 +1,59 @@
+# backend\users\views\schedule_exception_views.py
+
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+
+from users.services.schedule_exception_service import ScheduleExceptionService
+from users.services.success_response import send_success_msg
+
+from ..serializers.doctor_serializers import (
+    ScheduleConflictSerializer,
+    ScheduleExceptionSerializer,
+    ScheduleExceptionWriteSerializer,
+)
+
+
+class ScheduleExceptionListCreateView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = ScheduleExceptionWriteSerializer
+
+    def get(self, request):
+        exceptions = ScheduleExceptionService.list_exceptions(
+            str(request.user.user_id), getattr(request.user, "role", None)
+        )
+        return send_success_msg(ScheduleExceptionSerializer(exceptions, many=True).data)
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        exception = ScheduleExceptionService.create_exception(
+            str(request.user.user_id),
+            getattr(request.user, "role", None),
+            serializer.validated_data,
+        )
+        conflicts = exception["conflicts"]
+        data = ScheduleExceptionSerializer(exception).data
+        data["blocked_slots"] = exception["blocked_slots"]
+        data["conflicts"] = ScheduleConflictSerializer(conflicts, many=True).data
+
+        message = f"Blocked {exception['blocked_slots']} slot(s)."
+        if conflicts:
+            message += (
+                f" {len(conflicts)} booked appointment(s) fall in this period "
+                "and were not changed."
+            )
+        return send_success_msg(data, message=message, http_status=status.HTTP_201_CREATED)
+
+
+class ScheduleExceptionDetailView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, exception_id):
+        unblocked = ScheduleExceptionService.delete_exception(
+            exception_id, str(request.user.user_id), getattr(request.user, "role", None)
+        )
+        return send_success_msg(
+            {"unblocked_slots": unblocked},
+            message=f"Exception removed; {unblocked} slot(s) are bookable again.",
+        )
@@ -0,0 +1,65 @@
+# backend\users\views\slot_hold_views.py
+
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+
+from users.helpers import ensure_patient
+from users.services.slot_hold_service import SlotHoldService
+from users.services.success_response import send_success_msg
+
+from ..serializers.doctor_serializers import BookAppointmentSerializer
+from ..serializers.lab_booking_serializers import CreateBookingSerializer
+from ..serializers.slot_hold_serializers import SlotHoldSerializer
+
+
+class DoctorSlotHoldView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = BookAppointmentSerializer
+
+    def post(self, request):
+        ensure_patient(request)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        hold = SlotHoldService.place_doctor_hold(
+            patient_user_id=str(request.user.user_id),
+            slot_id=serializer.validated_data["slot_id"],
+            reason=serializer.validated_data.get("reason", ""),
+            appointment_type=serializer.validated_data.get(
+                "appointment_type", "in_person"
+            ),
+        )
+        return send_success_msg(
+            SlotHoldSerializer(hold).data,
+            message="Slot held. Complete payment before the hold expires.",
+            http_status=status.HTTP_201_CREATED,
+        )
+
+
+class LabSlotHoldView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = CreateBookingSerializer
+
+    def post(self, request):
+        ensure_patient(request)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        hold = SlotHoldService.place_lab_hold(
+            str(request.user.user_id), serializer.validated_data
+        )
+        return send_success_msg(
+            SlotHoldSerializer(hold).data,
+            message="Slot held. Complete payment before the hold expires.",
+            http_status=status.HTTP_201_CREATED,
+        )
+
+
+class SlotHoldReleaseView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, hold_id):
+        SlotHoldService.release_hold(str(hold_id), str(request.user.user_id))
+        return send_success_msg(None, message="Hold released.")
@@ -0,0 +1,71 @@
+# backend\users\views\waitlist_views.py
+
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+
+from users.helpers import ensure_patient
+from users.services.success_response import send_success_msg
+from users.services.waitlist_service import WaitlistService
+
+from ..serializers.waitlist_serializers import (
+    DoctorWaitlistSerializer,
+    LabWaitlistSerializer,
+    WaitlistEntrySerializer,
+)
+
+
+class MyWaitlistView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        ensure_patient(request)
+        entries = WaitlistService.list_for_patient(str(request.user.user_id))
+        return send_success_msg(WaitlistEntrySerializer(entries, many=True).data)
+
+
+class DoctorWaitlistView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = DoctorWaitlistSerializer
+
+    def post(self, request):
+        ensure_patient(request)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        entry = WaitlistService.join_doctor_waitlist(
+            str(request.user.user_id), serializer.validated_data
+        )
+        return send_success_msg(
+            WaitlistEntrySerializer(entry).data,
+            message="You are on the waitlist. We will email you when a slot opens up.",
+            http_status=status.HTTP_201_CREATED,
+        )
+
+
+class LabWaitlistView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = LabWaitlistSerializer
+
+    def post(self, request):
+        ensure_patient(request)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        entry = WaitlistService.join_lab_waitlist(
+            str(request.user.user_id), serializer.validated_data
+        )
+        return send_success_msg(
+            WaitlistEntrySerializer(entry).data,
+            message="You are on the waitlist. We will email you when a slot opens up.",
+            http_status=status.HTTP_201_CREATED,
+        )
+
+
+class WaitlistEntryView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def delete(self, request, entry_id):
+        WaitlistService.leave_waitlist(str(entry_id), str(request.user.user_id))
+        return send_success_msg(None, message="Removed from the waitlist.")